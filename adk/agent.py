@@ -1,6 +1,10 @@
-import datetime
-from google.adk.agents import LlmAgent, SequentialAgent, ParallelAgent
+import json
+from google.adk.agents import LlmAgent
 from google.genai.types import GenerateContentConfig
+from .assembler import ReportAssembler, SUMMARY_STATE_KEY
+from .deadlines import DeadlineParallelAgent, DeadlineSequentialAgent, MISSING_DOMAINS_STATE_KEY
+from .schemas import read_output
+from . import scheduler
 from .subagents import (
     team_agent,
     market_agent,
@@ -11,8 +15,9 @@ from .subagents import (
 )
 
 # STEP 1: A Parallel Agent to run all research-enabled specialist analyses simultaneously.
-# Each agent conducts its own independent research and analysis.
-parallel_research_analysis = ParallelAgent(
+# Each agent conducts its own independent research and analysis within a time budget;
+# slow agents are hedged and the stage moves on without any that miss the deadline.
+parallel_research_analysis = DeadlineParallelAgent(
     name="parallel_research_analysis",
     description="Runs all research-enabled specialist agents in parallel to gather independent analysis reports.",
     sub_agents=[
@@ -25,73 +30,30 @@ parallel_research_analysis = ParallelAgent(
     ],
 )
 
-# STEP 2: A Final Synthesizer Agent to assemble the complete report.
-# This agent takes the outputs from all parallel agents and builds the final JSON.
-final_synthesizer = LlmAgent(
-    name="final_report_synthesizer",
-    model="gemini-2.5-pro",
-    description="Synthesizes individual research-backed analysis reports into a single, comprehensive JSON output.",
-    instruction=f"""
-        You are "Resolutes ADK", the final synthesizer. Your job is to assemble the individual JSON reports from 6 research-enabled specialist agents into one comprehensive final report.
-
-        **AVAILABLE DATA:**
-        You have access to the outputs from the following research-enabled agents. The data is available in state keys corresponding to the agent names.
-
-        1. `team_agent`: Provides research-backed `team_analysis`
-        2. `market_agent`: Provides research-backed `market_analysis`
-        3. `product_agent`: Provides research-backed `product_analysis`
-        4. `traction_agent`: Provides research-backed `traction_analysis`
-        5. `finance_agent`: Provides research-backed `financial_analysis`
-        6. `competitor_agent`: Provides research-backed `competitive_analysis`
+SUMMARY_STATIC_INSTRUCTION = """
+        You are "Resolutes ADK", the investment synthesizer. Six research-enabled specialist agents have already produced JSON reports on the startup: team, market, product, traction, finance and competitor analysis. Their reports follow these instructions.
 
         **YOUR TASK:**
-        1.  **Combine Data**: Take the JSON output from each of the 7 agents.
-        2.  **Generate Summaries**: Based on the combined data, create the `investment_summary` and `executive_summary` sections.
-        3.  **Build Final JSON**: Assemble everything into the final, large JSON structure below. Ensure every field is present.
+        Based on all six reports, write ONLY the `investment_summary` and `executive_summary` sections. Do NOT repeat or copy the specialist reports; they are merged into the final report separately.
 
-        **FINAL OUTPUT JSON STRUCTURE:**
+        **OUTPUT JSON STRUCTURE:**
         ```json
-        {{
-          "analysis_metadata": {{
-            "company_name": "string (extract from agent data)",
-            "analysis_date": "{datetime.date.today().isoformat()}",
-            "analysis_type": "comprehensive_research_backed",
-            "confidence_level": "High",
-            "data_sources": ["team_agent", "market_agent", "product_agent", "traction_agent", "finance_agent", "competitor_agent"]
-          }},
-          "team_analysis": {{
-            // **INSERT COMPLETE JSON FROM `team_agent` HERE**
-          }},
-          "market_analysis": {{
-            // **INSERT COMPLETE JSON FROM `market_agent` HERE**
-          }},
-          "product_analysis": {{
-            // **INSERT COMPLETE JSON FROM `product_agent` HERE**
-          }},
-          "traction_analysis": {{
-            // **INSERT COMPLETE JSON FROM `traction_agent` HERE**
-          }},
-          "financial_analysis": {{
-            // **INSERT COMPLETE JSON FROM `finance_agent` HERE**
-          }},
-          "competitive_analysis": {{
-            // **INSERT COMPLETE JSON FROM `competitor_agent` HERE**
-          }},
-          "investment_summary": {{
+        {
+          "investment_summary": {
             "overall_score": "number (1-10, your synthesis)",
             "investment_recommendation": "Strong Buy|Buy|Hold|Pass (your synthesis)",
             "key_strengths": ["string (your synthesis)"],
             "key_risks": ["string (your synthesis)"],
             "critical_next_steps": ["string (your synthesis)"],
-            "comparable_valuations": {{
+            "comparable_valuations": {
               "estimated_valuation_range": "string (your synthesis)",
               "valuation_methodology": "string (your synthesis)",
               "peer_multiples": "string (your synthesis)"
-            }},
+            },
             "investment_thesis": "string (2-3 sentences, your synthesis)",
             "due_diligence_priorities": ["string (your synthesis)"]
-          }},
-          "executive_summary": {{
+          },
+          "executive_summary": {
             "business_model_summary": "string (your synthesis)",
             "market_opportunity": "string (your synthesis)",
             "competitive_position": "string (your synthesis)",
@@ -99,22 +61,74 @@ final_synthesizer = LlmAgent(
             "team_assessment": "string (your synthesis)",
             "investment_highlights": ["string (your synthesis)"],
             "risk_factors": ["string (your synthesis)"]
-          }}
-        }}
+          }
+        }
         ```
-    """,
+    """
+
+
+REPORT_TITLES = {
+    "team": "TEAM ANALYSIS",
+    "market": "MARKET ANALYSIS",
+    "product": "PRODUCT ANALYSIS",
+    "traction": "TRACTION ANALYSIS",
+    "finance": "FINANCIAL ANALYSIS",
+    "competitor": "COMPETITIVE ANALYSIS",
+}
+
+
+def summary_instruction(context):
+    """
+    Builds the dynamic part of the synthesizer's prompt from the specialists'
+    validated state slots, serialized compactly, instead of replaying their
+    full conversation.
+    """
+    missing_domains = context.state.get(MISSING_DOMAINS_STATE_KEY) or {}
+    reports = {}
+    for domain in REPORT_TITLES:
+        output = read_output(context.state, domain)
+        if domain in missing_domains:
+            reports[domain] = "Not available: research did not complete. Treat this domain as unverified and list it among the due diligence priorities."
+        else:
+            reports[domain] = json.dumps(output, separators=(",", ":")) if output else "Not available"
+    return "\n\n".join(
+        f"**{title}:** {reports[domain]}" for domain, title in REPORT_TITLES.items()
+    )
+
+
+# STEP 2: A Summary Synthesizer that writes only the parts that need judgement.
+# The specialist reports themselves are never re-generated by a model.
+summary_synthesizer = LlmAgent(
+    name="investment_summary_synthesizer",
+    model="gemini-2.5-pro",
+    description="Writes the investment and executive summaries from the research-backed specialist reports.",
+    static_instruction=SUMMARY_STATIC_INSTRUCTION,
+    instruction=summary_instruction,
+    include_contents="none",
+    output_key=SUMMARY_STATE_KEY,
+    before_model_callback=scheduler.before_model_callback("gemini-2.5-pro"),
+    after_model_callback=scheduler.after_model_callback("gemini-2.5-pro"),
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.5-pro"),
     generate_content_config=GenerateContentConfig(
         temperature=0.2, response_mime_type="application/json"
     ),
 )
 
+# STEP 3: Assemble the final report in code from the specialist outputs and summaries.
+final_synthesizer = ReportAssembler(
+    name="final_report_synthesizer",
+    description="Assembles the specialist reports and the investment summaries into the final JSON report.",
+)
+
 
-# The Root Agent is now a Sequential pipeline with research-enabled specialists.
-root_agent = SequentialAgent(
+# The Root Agent is a Sequential pipeline: parallel research, summaries, then deterministic assembly.
+# The run has an overall deadline; if the summaries miss it, the report is assembled without them.
+root_agent = DeadlineSequentialAgent(
     name="research_backed_analysis_pipeline",
     description="A sequential pipeline that runs parallel research-enabled analyses and then synthesizes results into a final investment report.",
     sub_agents=[
         parallel_research_analysis,
+        summary_synthesizer,
         final_synthesizer,
     ],
-)
\ No newline at end of file
+)
@@ -0,0 +1,73 @@
+"""
+Deterministic assembly of the final investment report.
+
+The six specialist reports are copied into the final JSON in code instead of
+asking an LLM to reproduce them token by token; only the investment and
+executive summaries are model-generated. The specialists' outputs are read
+from their validated state slots (see schemas.py).
+"""
+import json
+import datetime
+from typing import AsyncGenerator
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+from .deadlines import MISSING_DOMAINS_STATE_KEY, SKIPPED_STAGES_STATE_KEY
+from .parsing import parse_json_output
+from .research_cache import startup_name_from
+from .schemas import OUTPUT_KEYS, SECTION_BY_DOMAIN, read_output, unavailable_section
+
+SUMMARY_STATE_KEY = "synthesis_summaries"
+
+
+class ReportAssembler(BaseAgent):
+    """Builds the final report JSON from the specialists' outputs and the LLM summaries."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        outputs = {domain: read_output(state, domain) for domain in SECTION_BY_DOMAIN}
+        summaries = parse_json_output(ctx.session.state.get(SUMMARY_STATE_KEY)) or {}
+        missing_domains = state.get(MISSING_DOMAINS_STATE_KEY) or {}
+        skipped_stages = state.get(SKIPPED_STAGES_STATE_KEY) or {}
+
+        report = {
+            "analysis_metadata": {
+                "company_name": _company_name(ctx, outputs),
+                "analysis_date": datetime.date.today().isoformat(),
+                "analysis_type": "comprehensive_research_backed",
+                "confidence_level": "Medium" if missing_domains or skipped_stages else "High",
+                "data_sources": [OUTPUT_KEYS[domain] for domain in OUTPUT_KEYS if domain not in missing_domains],
+                "missing_domains": sorted(missing_domains),
+                "skipped_stages": sorted(skipped_stages),
+            },
+        }
+        for domain, section in SECTION_BY_DOMAIN.items():
+            if domain in missing_domains:
+                report[section] = unavailable_section(missing_domains[domain])
+            else:
+                report[section] = outputs[domain]
+        if not summaries and skipped_stages:
+            reason = "; ".join(f"{stage} {why}" for stage, why in skipped_stages.items())
+            summaries = {
+                "investment_summary": unavailable_section(reason),
+                "executive_summary": unavailable_section(reason),
+            }
+        report["investment_summary"] = summaries.get("investment_summary", {})
+        report["executive_summary"] = summaries.get("executive_summary", {})
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=json.dumps(report))]),
+        )
+
+
+def _company_name(ctx, outputs):
+    company_name = outputs["competitor"].get("company_name")
+    if company_name and company_name != "string":
+        return company_name
+    return startup_name_from(ctx.session.state, ctx.user_content) or "Unknown"
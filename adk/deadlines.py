@@ -0,0 +1,243 @@
+"""
+Deadline-bounded parallel research.
+
+ParallelAgent waits for every specialist, so one hung google_search call holds
+back the whole report. DeadlineParallelAgent gives each specialist its own
+time budget and the research stage an overall deadline:
+
+- An attempt still running after ``hedge_after_seconds`` gets a duplicate
+  (hedged) attempt; whichever finishes first wins and the other is cancelled.
+- A failed attempt is retried while the specialist's budget allows.
+- When the deadline passes, unfinished specialists are cancelled and listed
+  in the ``missing_domains`` state key, so the summary synthesizer and the
+  report assembler go ahead with what completed.
+
+Each attempt's events are buffered and only the winning attempt's events are
+emitted. The specialists make a single grounded model call (google_search runs
+server-side), so an attempt does not need its own events in the session. Each
+attempt also works on its own copy of the session state: callbacks write to
+state directly, so a losing hedge could otherwise overwrite the winner's slot.
+Its writes are also recorded in its events' state deltas, so the winner's
+reach the session when its events are emitted and the losers' are dropped.
+
+DeadlineSequentialAgent bounds the whole pipeline the same way. Every stage
+but the last runs within what is left of the run deadline and is cancelled
+when it passes; stages that were cut off are listed in the ``skipped_stages``
+state key. The last stage, the deterministic report assembler, always runs,
+so a run that hits the deadline still returns a report.
+"""
+import os
+import copy
+import asyncio
+from typing import AsyncGenerator
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.utils.context_utils import Aclosing
+from .schemas import OUTPUT_KEYS
+
+AGENT_TIMEOUT_SECONDS = float(os.getenv("ADK_AGENT_TIMEOUT_SECONDS", "300"))
+HEDGE_AFTER_SECONDS = float(os.getenv("ADK_HEDGE_AFTER_SECONDS", "150"))
+RESEARCH_DEADLINE_SECONDS = float(os.getenv("ADK_RESEARCH_DEADLINE_SECONDS", "360"))
+MAX_ATTEMPTS = int(os.getenv("ADK_AGENT_MAX_ATTEMPTS", "2"))
+RUN_DEADLINE_SECONDS = float(os.getenv("ADK_RUN_DEADLINE_SECONDS", "600"))
+
+MISSING_DOMAINS_STATE_KEY = "missing_domains"
+SKIPPED_STAGES_STATE_KEY = "skipped_stages"
+
+_DOMAIN_BY_OUTPUT_KEY = {key: domain for domain, key in OUTPUT_KEYS.items()}
+
+
+class DeadlineParallelAgent(BaseAgent):
+    """Runs the specialists in parallel with per-agent budgets, hedging and a stage deadline."""
+
+    agent_timeout_seconds: float = AGENT_TIMEOUT_SECONDS
+    hedge_after_seconds: float = HEDGE_AFTER_SECONDS
+    deadline_seconds: float = RESEARCH_DEADLINE_SECONDS
+    max_attempts: int = MAX_ATTEMPTS
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds
+        tasks = {
+            asyncio.create_task(self._run_with_budget(sub_agent, ctx)): sub_agent
+            for sub_agent in self.sub_agents
+        }
+        missing = {}
+
+        try:
+            pending = set(tasks)
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    events, reason = task.result()
+                    if events is None:
+                        missing[_domain_of(tasks[task])] = reason
+                        continue
+                    for event in events:
+                        yield event
+
+            for task in pending:
+                sub_agent = tasks[task]
+                print(f"{sub_agent.name} missed the {self.deadline_seconds:.0f}s research deadline")
+                missing[_domain_of(sub_agent)] = f"did not finish within the {self.deadline_seconds:.0f}s research deadline"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        state_delta = {MISSING_DOMAINS_STATE_KEY: missing}
+        for domain in missing:
+            # Attempts never write to the session, but a slot may hold a stale value
+            state_delta[OUTPUT_KEYS[domain]] = {}
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_with_budget(self, sub_agent, ctx):
+        """
+        Runs one specialist within its budget, hedging slow attempts and
+        retrying failed ones.
+
+        Returns:
+            tuple: (events of the winning attempt, None), or (None, reason)
+            if no attempt succeeded in time.
+        """
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        give_up_at = started_at + self.agent_timeout_seconds
+        sub_agent_ctx = ctx.model_copy()
+        branch_suffix = f"{self.name}.{sub_agent.name}"
+        sub_agent_ctx.branch = f"{ctx.branch}.{branch_suffix}" if ctx.branch else branch_suffix
+
+        attempts = set()
+        attempts_started = 0
+        last_error = None
+
+        def start_attempt():
+            nonlocal attempts_started
+            attempts_started += 1
+            attempts.add(asyncio.create_task(_collect_events(sub_agent, _isolated_context(sub_agent_ctx))))
+
+        start_attempt()
+        try:
+            while attempts:
+                now = loop.time()
+                if now >= give_up_at:
+                    break
+                wait_for = give_up_at - now
+                can_hedge = self.hedge_after_seconds > 0 and attempts_started < self.max_attempts
+                hedge_at = started_at + self.hedge_after_seconds
+                if can_hedge and hedge_at > now:
+                    wait_for = min(wait_for, hedge_at - now)
+
+                done, attempts = await asyncio.wait(attempts, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), None
+                    last_error = task.exception()
+                    print(f"{sub_agent.name} attempt failed: {last_error}")
+
+                if done and not attempts and attempts_started < self.max_attempts:
+                    print(f"Retrying {sub_agent.name}")
+                    start_attempt()
+                elif not done and can_hedge and loop.time() >= hedge_at:
+                    print(f"{sub_agent.name} still running after {self.hedge_after_seconds:.0f}s; starting a hedged attempt")
+                    start_attempt()
+        finally:
+            for task in attempts:
+                task.cancel()
+
+        if last_error is not None and not attempts:
+            return None, f"failed: {last_error}"
+        print(f"{sub_agent.name} timed out after {self.agent_timeout_seconds:.0f}s")
+        return None, f"timed out after {self.agent_timeout_seconds:.0f}s"
+
+
+class DeadlineSequentialAgent(BaseAgent):
+    """Runs stages in order within a run-level deadline; the last stage always runs."""
+
+    deadline_seconds: float = RUN_DEADLINE_SECONDS
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds
+        skipped = {}
+
+        for sub_agent in self.sub_agents[:-1]:
+            if loop.time() >= deadline:
+                skipped[sub_agent.name] = f"was not started before the {self.deadline_seconds:.0f}s run deadline"
+                continue
+
+            queue = asyncio.Queue()
+            task = asyncio.create_task(_forward_events(sub_agent, ctx, queue))
+            try:
+                while True:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=max(0, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        print(f"{sub_agent.name} missed the {self.deadline_seconds:.0f}s run deadline")
+                        skipped[sub_agent.name] = f"did not finish within the {self.deadline_seconds:.0f}s run deadline"
+                        break
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                task.cancel()
+
+        if skipped:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={SKIPPED_STAGES_STATE_KEY: skipped}),
+            )
+        async with Aclosing(self.sub_agents[-1].run_async(ctx)) as agen:
+            async for event in agen:
+                yield event
+
+
+def _isolated_context(ctx):
+    """Returns a copy of ctx whose session state and agent states belong to one attempt."""
+    session = ctx.session.model_copy(update={"state": copy.deepcopy(ctx.session.state)})
+    return ctx.model_copy(update={
+        "session": session,
+        "agent_states": copy.deepcopy(ctx.agent_states),
+        "end_of_agents": dict(ctx.end_of_agents),
+    })
+
+
+async def _forward_events(agent, ctx, queue):
+    """Runs an agent and puts its events on queue, then None, or the exception it raised."""
+    try:
+        async with Aclosing(agent.run_async(ctx)) as agen:
+            async for event in agen:
+                await queue.put(event)
+    except Exception as e:
+        await queue.put(e)
+        return
+    await queue.put(None)
+
+
+async def _collect_events(agent, ctx):
+    """Runs an agent to completion and returns its events."""
+    events = []
+    async with Aclosing(agent.run_async(ctx)) as agen:
+        async for event in agen:
+            events.append(event)
+    return events
+
+
+def _domain_of(sub_agent):
+    return _DOMAIN_BY_OUTPUT_KEY.get(sub_agent.output_key, sub_agent.name)
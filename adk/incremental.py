@@ -0,0 +1,49 @@
+"""
+Incremental re-analysis support.
+
+A run may carry two state keys:
+
+- ``refresh_domains``: the specialist domains to research again, e.g.
+  ``["finance", "traction"]`` after a new funding round.
+- ``stored_analysis``: the report sections of the previous analysis.
+
+Specialists outside ``refresh_domains`` answer with their stored section
+instead of running, so only the stale domains cost model calls before the
+report is re-synthesized.
+"""
+import json
+from google.genai import types
+from .schemas import SECTION_BY_DOMAIN, record_output, is_unavailable
+
+
+def is_incremental(callback_context):
+    """Returns True when the run only refreshes some domains."""
+    return callback_context.state.get("refresh_domains") is not None
+
+
+def should_refresh(callback_context, domain):
+    """Returns True if this run must research the domain from scratch."""
+    return is_incremental(callback_context) and domain in callback_context.state.get("refresh_domains")
+
+
+def before_agent_callback(domain):
+    """
+    Builds a before_agent_callback that replays the stored section for domains
+    that are not being refreshed.
+    """
+    def callback(callback_context):
+        if not is_incremental(callback_context) or should_refresh(callback_context, domain):
+            return None
+
+        stored_analysis = callback_context.state.get("stored_analysis") or {}
+        output = stored_analysis.get(SECTION_BY_DOMAIN[domain])
+        if not isinstance(output, dict) or not output or is_unavailable(output):
+            # Nothing stored for this domain (or only the placeholder of a run
+            # that missed it); let the cache or the agent answer
+            return None
+
+        print(f"Reusing stored {domain} analysis for incremental run")
+        record_output(callback_context.state, domain, output)
+        return types.Content(role="model", parts=[types.Part(text=json.dumps(output))])
+
+    return callback
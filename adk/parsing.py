@@ -0,0 +1,20 @@
+import json
+
+
+def parse_json_output(text):
+    """
+    Parses an agent's JSON answer, tolerating markdown fences and surrounding prose.
+
+    Returns:
+        dict, or None if no JSON object can be recovered.
+    """
+    if not text:
+        return None
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        output, _ = json.JSONDecoder().raw_decode(text[start:])
+    except json.JSONDecodeError:
+        return None
+    return output if isinstance(output, dict) else None
@@ -0,0 +1,15 @@
+"""
+Dynamic parts of the agents' prompts.
+
+The agents' long, unchanging instructions are passed as ``static_instruction``,
+which ADK sends verbatim as the system instruction. That keeps the start of
+every request byte-identical across runs, so the model can serve it from its
+prefix cache. Anything that changes per run (such as today's date) comes from
+these instruction providers, which ADK sends after the static prefix.
+"""
+import datetime
+
+
+def current_date_instruction(context):
+    """Tells a specialist today's date, to use as its analysis_date."""
+    return f"Current date: {datetime.date.today().isoformat()}. Use it as the analysis_date."
@@ -0,0 +1,169 @@
+"""
+Cache of specialist research results, keyed by startup and agent domain.
+
+Each specialist's parsed JSON output is stored after a successful run. On the
+next run for the same startup, a fresh cached result is returned from
+before_agent_callback, which skips the agent (and its google_search calls)
+entirely. Freshness is configured per domain because market sizing changes far
+more slowly than traction numbers.
+"""
+import os
+import re
+import json
+import time
+import threading
+from google.genai import types
+from . import incremental
+from .parsing import parse_json_output
+from .schemas import record_output
+
+CACHE_ENABLED = os.getenv("RESEARCH_CACHE_ENABLED", "1") != "0"
+
+# Hours a cached result stays fresh; override with RESEARCH_CACHE_TTL_HOURS_<DOMAIN>
+DEFAULT_TTL_HOURS = {
+    "team": 72,
+    "market": 168,
+    "product": 72,
+    "traction": 12,
+    "finance": 24,
+    "competitor": 168,
+}
+
+_COLLECTION = "research_cache"
+_STARTUP_PATTERN = re.compile(r"Research and analyze startup:\s*(.+)")
+
+_memory_cache = {}
+_collection = None
+_collection_lock = threading.Lock()
+
+
+def ttl_seconds(domain):
+    """Returns how long a cached result for the domain stays fresh."""
+    hours = os.getenv(f"RESEARCH_CACHE_TTL_HOURS_{domain.upper()}", DEFAULT_TTL_HOURS.get(domain, 24))
+    return float(hours) * 3600
+
+
+def startup_name_from_context(callback_context):
+    """
+    Resolves the startup being analyzed from session state, falling back to the
+    first line of the user's prompt.
+    """
+    return startup_name_from(callback_context.state, callback_context.user_content)
+
+
+def startup_name_from(state, user_content):
+    """Resolves the startup name from a state mapping and the user's message."""
+    startup_name = state.get("startup_name")
+    if startup_name:
+        return startup_name
+
+    if user_content and user_content.parts:
+        text = "".join(part.text or "" for part in user_content.parts)
+        match = _STARTUP_PATTERN.search(text)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def get_cached_output(startup_name, domain):
+    """Returns the cached output for a startup and domain if it is still fresh."""
+    key = _cache_key(startup_name, domain)
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            entry = collection.find_one({"_id": key})
+        except Exception as e:
+            print(f"Research cache lookup failed: {e}")
+            entry = None
+    else:
+        entry = _memory_cache.get(key)
+
+    if not entry or time.time() - entry["stored_at"] > ttl_seconds(domain):
+        return None
+    return entry["output"]
+
+
+def store_output(startup_name, domain, output):
+    """Saves a specialist's parsed output for later runs."""
+    entry = {
+        "_id": _cache_key(startup_name, domain),
+        "startup_name": startup_name,
+        "domain": domain,
+        "output": output,
+        "stored_at": time.time(),
+    }
+    collection = _get_collection()
+    if collection is None:
+        _memory_cache[entry["_id"]] = entry
+        return
+    try:
+        collection.replace_one({"_id": entry["_id"]}, entry, upsert=True)
+    except Exception as e:
+        print(f"Research cache write failed: {e}")
+
+
+def before_agent_callback(domain):
+    """
+    Builds a before_agent_callback that answers from the cache when a fresh
+    result exists, unless the run sets force_refresh in its state or
+    explicitly refreshes this domain.
+    """
+    def callback(callback_context):
+        if not CACHE_ENABLED or callback_context.state.get("force_refresh"):
+            return None
+        if incremental.should_refresh(callback_context, domain):
+            return None
+        startup_name = startup_name_from_context(callback_context)
+        if not startup_name:
+            return None
+
+        output = get_cached_output(startup_name, domain)
+        if output is None:
+            return None
+
+        print(f"Research cache hit for {startup_name} ({domain})")
+        record_output(callback_context.state, domain, output)
+        return types.Content(role="model", parts=[types.Part(text=json.dumps(output))])
+
+    return callback
+
+
+def after_model_callback(domain):
+    """Builds an after_model_callback that caches the agent's final JSON answer."""
+    def callback(callback_context, llm_response):
+        if not CACHE_ENABLED or llm_response.partial or not llm_response.content:
+            return None
+        parts = llm_response.content.parts or []
+        if any(part.function_call for part in parts):
+            return None
+
+        output = parse_json_output("".join(part.text or "" for part in parts))
+        startup_name = startup_name_from_context(callback_context)
+        if output is not None and startup_name:
+            store_output(startup_name, domain, output)
+        return None
+
+    return callback
+
+
+def _cache_key(startup_name, domain):
+    normalized = " ".join(startup_name.lower().split())
+    return f"{normalized}:{domain}"
+
+
+def _get_collection():
+    """Returns the MongoDB collection, or None to use the in-process cache."""
+    global _collection
+    uri = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
+    if not uri:
+        return None
+
+    if _collection is None:
+        with _collection_lock:
+            if _collection is None:
+                from pymongo import MongoClient
+                from pymongo.server_api import ServerApi
+
+                client = MongoClient(uri, server_api=ServerApi('1'))
+                _collection = client["resolutes"][_COLLECTION]
+    return _collection
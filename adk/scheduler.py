@@ -0,0 +1,162 @@
+"""
+Rate-aware scheduling of Gemini calls across every run in the ADK server.
+
+Each model gets a token bucket sized to its requests-per-minute quota. Every
+model call waits in a per-model queue for a token: interactive runs are
+served before batch runs, and a queue that is already full rejects new calls
+instead of growing without bound. A 429 / RESOURCE_EXHAUSTED error halves the
+model's rate and empties its bucket; each successful call then grows the rate
+back toward the quota (AIMD), so throughput settles just under the ceiling
+instead of cascading into error storms.
+
+google_search grounding runs inside the model call, so it is covered by the
+model's bucket. A run selects its class with the ``priority`` state key.
+"""
+import os
+import re
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_RANKS = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 1}
+
+# Requests per minute per model; override with ADK_RPM_<MODEL>, e.g. ADK_RPM_GEMINI_2_5_PRO
+DEFAULT_RPM = {
+    "gemini-2.0-flash-exp": 60,
+    "gemini-2.5-pro": 20,
+}
+FALLBACK_RPM = 30
+
+BURST_SECONDS = float(os.getenv("ADK_RATE_BURST_SECONDS", "5"))
+MAX_QUEUED_CALLS = int(os.getenv("ADK_MAX_QUEUED_MODEL_CALLS", "64"))
+MIN_RATE_FRACTION = 0.1
+RECOVERY_FRACTION = 0.05
+
+
+class SchedulerQueueFull(RuntimeError):
+    """Raised when a model's queue is full and the call is rejected."""
+
+
+class ModelScheduler:
+    """Token bucket with a priority queue and AIMD throttling for one model."""
+
+    def __init__(self, model, requests_per_minute):
+        self.model = model
+        self.max_rate = requests_per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = max(1.0, self.max_rate * BURST_SECONDS)
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    async def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """
+        Waits until the call may go out.
+
+        Raises:
+            SchedulerQueueFull: If too many calls are already waiting.
+        """
+        entry = (PRIORITY_RANKS.get(priority, 0), next(self._sequence))
+        with self._lock:
+            if len(self._waiters) >= MAX_QUEUED_CALLS:
+                raise SchedulerQueueFull(f"{self.model} has {len(self._waiters)} calls queued; try again later")
+            heapq.heappush(self._waiters, entry)
+
+        try:
+            while True:
+                with self._lock:
+                    self._refill()
+                    if self._waiters[0] == entry and self.tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self.tokens -= 1
+                        return
+                    # The head waits for its next token; the rest poll behind it
+                    delay = (1 - self.tokens) / self.rate if self._waiters[0] == entry else 0.05
+                await asyncio.sleep(max(delay, 0.01))
+        except BaseException:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            raise
+
+    def on_success(self):
+        """Additively grows the rate back toward the quota."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FRACTION)
+
+    def on_rate_limited(self):
+        """Halves the rate and drops any burst allowance after a 429."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+        print(f"{self.model} rate limited; throttling to {self.rate * 60:.1f} requests/minute")
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def requests_per_minute(model):
+    """Returns the configured requests-per-minute quota for a model."""
+    env_name = "ADK_RPM_" + re.sub(r"[^A-Z0-9]", "_", model.upper())
+    return float(os.getenv(env_name, DEFAULT_RPM.get(model, FALLBACK_RPM)))
+
+
+def get_scheduler(model):
+    """Returns the process-wide scheduler for a model."""
+    with _schedulers_lock:
+        if model not in _schedulers:
+            _schedulers[model] = ModelScheduler(model, requests_per_minute(model))
+        return _schedulers[model]
+
+
+def is_rate_limit_error(error):
+    """Returns True if a model error is a quota / rate limit rejection."""
+    if getattr(error, "code", None) == 429:
+        return True
+    message = str(error)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message
+
+
+def before_model_callback(model):
+    """Builds a before_model_callback that waits for the model's rate limit."""
+    async def callback(callback_context, llm_request):
+        priority = callback_context.state.get("priority", PRIORITY_INTERACTIVE)
+        await get_scheduler(model).acquire(priority)
+        return None
+
+    return callback
+
+
+def after_model_callback(model):
+    """Builds an after_model_callback that lets the model's rate recover."""
+    def callback(callback_context, llm_response):
+        if not llm_response.partial and llm_response.error_code is None:
+            get_scheduler(model).on_success()
+        return None
+
+    return callback
+
+
+def on_model_error_callback(model):
+    """Builds an on_model_error_callback that throttles the model after a 429."""
+    def callback(callback_context, llm_request, error):
+        if is_rate_limit_error(error):
+            get_scheduler(model).on_rate_limited()
+        # Let the error propagate; DeadlineParallelAgent retries the attempt
+        return None
+
+    return callback
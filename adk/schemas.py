@@ -0,0 +1,130 @@
+"""
+Structured state contract between the specialists and the downstream stages.
+
+Every specialist writes its answer to a named state slot (its ``output_key``).
+Whatever path produced the answer (a fresh run, the research cache or a stored
+analysis), the slot ends up holding the parsed JSON object rather than raw
+model text, and ``<slot>_validation`` records whether the object matched the
+specialist's schema. The summary synthesizer and the report assembler read
+these compact objects instead of re-reading the conversation.
+"""
+from .parsing import parse_json_output
+
+# Specialist domain -> state slot holding its parsed output
+OUTPUT_KEYS = {
+    "team": "team_agent",
+    "market": "market_agent",
+    "product": "product_agent",
+    "traction": "traction_agent",
+    "finance": "finance_agent",
+    "competitor": "competitor_agent",
+}
+
+# Specialist domain -> section of the final report it produces
+SECTION_BY_DOMAIN = {
+    "team": "team_analysis",
+    "market": "market_analysis",
+    "product": "product_analysis",
+    "traction": "traction_analysis",
+    "finance": "financial_analysis",
+    "competitor": "competitive_analysis",
+}
+
+# Top-level keys each specialist's JSON schema requires
+REQUIRED_KEYS = {
+    "team": ["team_summary", "founding_team", "leadership_team", "team_analysis", "team_assessment", "risk_factors", "strengths"],
+    "market": ["market_summary", "market_size", "competitive_landscape", "market_opportunity", "risks_and_challenges"],
+    "product": ["product_summary", "product_overview", "core_features", "technical_assessment", "risks_and_challenges"],
+    "traction": ["traction_summary", "growth_metrics", "market_validation", "traction_assessment", "risks_and_challenges"],
+    "finance": ["finance_summary", "funding_history", "business_model", "financial_health", "risks_and_challenges"],
+    "competitor": ["company_name", "sector", "competitors", "competitive_summary"],
+}
+
+
+def unavailable_section(reason):
+    """Returns the placeholder the report holds for a section that could not be produced."""
+    return {"status": "unavailable", "reason": reason}
+
+
+def is_unavailable(section):
+    """Returns True if a report section is a placeholder rather than an analysis."""
+    return isinstance(section, dict) and section.get("status") == "unavailable"
+
+
+def validate_output(domain, output):
+    """
+    Checks a specialist's output against its schema.
+
+    Returns:
+        list[str]: Required top-level keys that are missing; empty when valid.
+    """
+    if not isinstance(output, dict):
+        return list(REQUIRED_KEYS[domain])
+    return [key for key in REQUIRED_KEYS[domain] if key not in output]
+
+
+def record_output(state, domain, output):
+    """
+    Stores a specialist's parsed output and its validation result in state.
+
+    Args:
+        state: The callback context's state.
+        domain (str): The specialist domain.
+        output: Parsed JSON object, raw model text, or None.
+
+    Returns:
+        dict: The parsed output ({} if it could not be parsed).
+    """
+    if isinstance(output, str):
+        output = parse_json_output(output)
+    if not isinstance(output, dict):
+        output = {}
+
+    missing_keys = validate_output(domain, output)
+    if missing_keys:
+        print(f"{domain} output is missing schema keys: {', '.join(missing_keys)}")
+
+    key = OUTPUT_KEYS[domain]
+    state[key] = output
+    state[f"{key}_validation"] = {"valid": not missing_keys, "missing_keys": missing_keys}
+    return output
+
+
+def read_output(state, domain):
+    """Returns the parsed output stored for a domain, or {} if there is none."""
+    output = state.get(OUTPUT_KEYS[domain])
+    if isinstance(output, str):
+        # Answers replayed from a before_agent_callback are saved to output_key
+        # as raw text after the callback runs, and after_agent_callback is skipped
+        output = parse_json_output(output)
+    return output if isinstance(output, dict) else {}
+
+
+def after_model_callback(domain):
+    """
+    Builds an after_model_callback that records the parsed final answer as soon
+    as the model returns it, before its event reaches the session (attempts
+    run by DeadlineParallelAgent are only appended once they win).
+    """
+    def callback(callback_context, llm_response):
+        if llm_response.partial or not llm_response.content:
+            return None
+        parts = llm_response.content.parts or []
+        if any(part.function_call for part in parts):
+            return None
+        record_output(callback_context.state, domain, "".join(part.text or "" for part in parts))
+        return None
+
+    return callback
+
+
+def after_agent_callback(domain):
+    """
+    Builds an after_agent_callback that replaces the raw text written by
+    output_key with the parsed, validated JSON object.
+    """
+    def callback(callback_context):
+        record_output(callback_context.state, domain, callback_context.state.get(OUTPUT_KEYS[domain]))
+        return None
+
+    return callback
@@ -1,12 +1,13 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 from google.genai.types import GenerateContentConfig
+from .. import incremental, research_cache, scheduler, schemas
 
 competitor_agent = LlmAgent(
     name="competitor_agent",
     model="gemini-2.0-flash-exp",
     description="Analyzes competitive landscape and generates structured competitor comparisons",
-    instruction="""
+    static_instruction="""
                 You are "Resolutes Competitor Analyst", an expert business research agent specializing in competitive intelligence and market positioning analysis.
                 
                 **Your Mission:**
@@ -96,6 +97,19 @@ competitor_agent = LlmAgent(
                 Always deliver structured, evidence-based competitive analysis that helps investors understand market positioning and competitive dynamics.
                 """,
     tools=[google_search],
+    before_agent_callback=[
+        incremental.before_agent_callback("competitor"),
+        research_cache.before_agent_callback("competitor"),
+    ],
+    before_model_callback=scheduler.before_model_callback("gemini-2.0-flash-exp"),
+    after_model_callback=[
+        scheduler.after_model_callback("gemini-2.0-flash-exp"),
+        research_cache.after_model_callback("competitor"),
+        schemas.after_model_callback("competitor"),
+    ],
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.0-flash-exp"),
+    after_agent_callback=schemas.after_agent_callback("competitor"),
+    output_key=schemas.OUTPUT_KEYS["competitor"],
     generate_content_config=GenerateContentConfig(
         temperature=0.2,
         response_mime_type="application/json"
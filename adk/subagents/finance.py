@@ -1,13 +1,13 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 from google.genai.types import GenerateContentConfig
-import datetime
+from .. import incremental, prompts, research_cache, scheduler, schemas
 
 finance_agent = LlmAgent(
     name="finance_research_agent",
     model="gemini-2.0-flash-exp",
     description="Research-enabled financial analysis specialist that evaluates funding history, financial health, business model, and investment attractiveness through web research.",
-    instruction=f"""
+    static_instruction="""
         You are a financial analysis expert with comprehensive web research capabilities. Your mission is to research and evaluate the financial status, funding history, business model, and investment attractiveness for a given startup.
 
         **RESEARCH & ANALYSIS WORKFLOW:**
@@ -41,18 +41,18 @@ finance_agent = LlmAgent(
         Always return your analysis in this exact JSON format:
 
         ```json
-        {{
-          "finance_summary": {{
-            "analysis_date": "{datetime.date.today().isoformat()}",
+        {
+          "finance_summary": {
+            "analysis_date": "YYYY-MM-DD (the current date)",
             "confidence_level": "High|Medium|Low",
             "data_sources_count": "number",
             "research_depth": "comprehensive|moderate|limited"
-          }},
-          "funding_history": {{
+          },
+          "funding_history": {
             "total_funding_raised": "string",
             "number_of_rounds": "number",
             "funding_rounds": [
-              {{
+              {
                 "round_type": "Pre-Seed|Seed|Series A|Series B|Series C|Bridge|Other",
                 "amount_raised": "string",
                 "date": "string",
@@ -60,45 +60,45 @@ finance_agent = LlmAgent(
                 "participating_investors": ["string"],
                 "valuation": "string",
                 "use_of_funds": "string"
-              }}
+              }
             ],
             "latest_valuation": "string",
             "funding_trajectory": "Upward|Flat|Declining"
-          }},
-          "investor_analysis": {{
+          },
+          "investor_analysis": {
             "lead_investors": [
-              {{
+              {
                 "investor_name": "string",
                 "investor_type": "VC|Angel|Strategic|Corporate|Government",
                 "reputation": "Top Tier|Mid Tier|Emerging|Unknown",
                 "portfolio_relevance": "High|Medium|Low",
                 "check_size_typical": "string"
-              }}
+              }
             ],
             "investor_quality": "Excellent|Good|Average|Concerning",
             "strategic_value_add": "High|Medium|Low",
             "board_composition": ["string"]
-          }},
-          "business_model": {{
+          },
+          "business_model": {
             "revenue_model": "string",
             "monetization_strategy": ["string"],
             "revenue_streams": [
-              {{
+              {
                 "stream_name": "string",
                 "contribution_percentage": "string",
                 "growth_rate": "string",
                 "scalability": "High|Medium|Low"
-              }}
+              }
             ],
             "pricing_model": "Subscription|Transaction|Freemium|Enterprise|Advertising|Other",
-            "unit_economics": {{
+            "unit_economics": {
               "customer_acquisition_cost": "string",
               "customer_lifetime_value": "string",
               "gross_margin": "string",
               "payback_period": "string"
-            }}
-          }},
-          "financial_performance": {{
+            }
+          },
+          "financial_performance": {
             "revenue_disclosed": "boolean",
             "revenue_estimate": "string",
             "revenue_growth_rate": "string",
@@ -106,54 +106,54 @@ finance_agent = LlmAgent(
             "burn_rate": "string",
             "runway_estimate": "string",
             "financial_milestones": ["string"]
-          }},
-          "market_position": {{
+          },
+          "market_position": {
             "market_cap_estimate": "string",
             "revenue_multiple": "string",
             "comparable_valuations": [
-              {{
+              {
                 "company": "string",
                 "valuation": "string",
                 "revenue_multiple": "string"
-              }}
+              }
             ],
             "valuation_justification": "Overvalued|Fairly Valued|Undervalued"
-          }},
-          "financial_health": {{
+          },
+          "financial_health": {
             "cash_position_estimate": "Strong|Adequate|Concerning",
             "debt_obligations": "Low|Medium|High",
             "working_capital": "Positive|Neutral|Negative",
             "financial_controls": "Strong|Adequate|Weak",
             "audit_status": "Big 4|Regional|Unaudited"
-          }},
-          "investment_attractiveness": {{
+          },
+          "investment_attractiveness": {
             "growth_potential": "High|Medium|Low",
             "scalability_assessment": "Highly Scalable|Scalable|Limited",
             "exit_potential": "High|Medium|Low",
             "risk_level": "Low|Medium|High",
             "investment_stage_alignment": "Early|Growth|Late",
             "follow_on_potential": "High|Medium|Low"
-          }},
-          "funding_outlook": {{
+          },
+          "funding_outlook": {
             "next_funding_timeline": "string",
             "funding_need_estimate": "string",
             "funding_use_cases": ["string"],
             "fundraising_challenges": ["string"],
             "investor_sentiment": "Positive|Neutral|Cautious"
-          }},
-          "risks_and_challenges": {{
+          },
+          "risks_and_challenges": {
             "financial_risks": ["string"],
             "market_risks": ["string"],
             "execution_risks": ["string"],
             "funding_risks": ["string"]
-          }},
-          "opportunities": {{
+          },
+          "opportunities": {
             "revenue_opportunities": ["string"],
             "cost_optimization": ["string"],
             "strategic_partnerships": ["string"],
             "exit_opportunities": ["string"]
-          }}
-        }}
+          }
+        }
         ```
 
         **RESEARCH GUIDELINES:**
@@ -171,10 +171,23 @@ finance_agent = LlmAgent(
         - Assess investment risks and opportunities
         - Identify key financial success factors and challenges
 
-        Current date: {datetime.date.today().isoformat()}
         Provide comprehensive, research-backed financial analysis in the specified JSON format.
     """,
+    instruction=prompts.current_date_instruction,
     tools=[google_search],
+    before_agent_callback=[
+        incremental.before_agent_callback("finance"),
+        research_cache.before_agent_callback("finance"),
+    ],
+    before_model_callback=scheduler.before_model_callback("gemini-2.0-flash-exp"),
+    after_model_callback=[
+        scheduler.after_model_callback("gemini-2.0-flash-exp"),
+        research_cache.after_model_callback("finance"),
+        schemas.after_model_callback("finance"),
+    ],
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.0-flash-exp"),
+    after_agent_callback=schemas.after_agent_callback("finance"),
+    output_key=schemas.OUTPUT_KEYS["finance"],
     generate_content_config=GenerateContentConfig(
         temperature=0.2,
         response_mime_type="application/json"
@@ -1,13 +1,13 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 from google.genai.types import GenerateContentConfig
-import datetime
+from .. import incremental, prompts, research_cache, scheduler, schemas
 
 market_agent = LlmAgent(
     name="market_research_agent",
     model="gemini-2.0-flash-exp",
     description="Research-enabled market analysis specialist that evaluates market opportunities, size, competition, and dynamics through comprehensive web research.",
-    instruction=f"""
+    static_instruction="""
         You are a market analysis expert with comprehensive web research capabilities. Your mission is to research and evaluate the target market, competitive landscape, and market dynamics for a given startup.
 
         **RESEARCH & ANALYSIS WORKFLOW:**
@@ -41,91 +41,91 @@ market_agent = LlmAgent(
         Always return your analysis in this exact JSON format:
 
         ```json
-        {{
-          "market_summary": {{
-            "analysis_date": "{datetime.date.today().isoformat()}",
+        {
+          "market_summary": {
+            "analysis_date": "YYYY-MM-DD (the current date)",
             "confidence_level": "High|Medium|Low",
             "data_sources_count": "number",
             "research_depth": "comprehensive|moderate|limited"
-          }},
-          "market_size": {{
+          },
+          "market_size": {
             "total_addressable_market": "string with value and source",
             "serviceable_addressable_market": "string with value and source",
             "serviceable_obtainable_market": "string with value and source",
             "market_growth_rate": "string with percentage and timeframe",
             "market_maturity": "Emerging|Growing|Mature|Declining"
-          }},
-          "target_segments": {{
-            "primary_segment": {{
+          },
+          "target_segments": {
+            "primary_segment": {
               "description": "string",
               "size": "string",
               "characteristics": ["string"],
               "pain_points": ["string"]
-            }},
+            },
             "secondary_segments": [
-              {{
+              {
                 "description": "string",
                 "size": "string",
                 "characteristics": ["string"]
-              }}
+              }
             ],
             "customer_acquisition_cost": "string",
             "customer_lifetime_value": "string"
-          }},
-          "competitive_landscape": {{
+          },
+          "competitive_landscape": {
             "direct_competitors": [
-              {{
+              {
                 "name": "string",
                 "market_share": "string",
                 "strengths": ["string"],
                 "weaknesses": ["string"],
                 "funding_status": "string"
-              }}
+              }
             ],
             "indirect_competitors": [
-              {{
+              {
                 "name": "string",
                 "category": "string",
                 "threat_level": "High|Medium|Low"
-              }}
+              }
             ],
             "competitive_intensity": "High|Medium|Low",
             "barriers_to_entry": ["string"]
-          }},
-          "market_dynamics": {{
+          },
+          "market_dynamics": {
             "key_trends": ["string"],
             "growth_drivers": ["string"],
             "market_challenges": ["string"],
             "technology_adoption": "Early|Mainstream|Late",
             "regulatory_environment": "Favorable|Neutral|Restrictive"
-          }},
-          "customer_analysis": {{
+          },
+          "customer_analysis": {
             "customer_behavior": ["string"],
             "purchase_decision_factors": ["string"],
             "adoption_timeline": "string",
             "price_sensitivity": "High|Medium|Low",
             "switching_costs": "High|Medium|Low"
-          }},
-          "market_opportunity": {{
+          },
+          "market_opportunity": {
             "market_timing": "Excellent|Good|Too Early|Too Late",
             "growth_potential": "High|Medium|Low",
             "competitive_advantage_potential": "Strong|Moderate|Weak",
             "customer_demand_validation": "Strong|Moderate|Weak",
             "market_accessibility": "Easy|Moderate|Difficult"
-          }},
-          "risks_and_challenges": {{
+          },
+          "risks_and_challenges": {
             "market_risks": ["string"],
             "competitive_threats": ["string"],
             "regulatory_risks": ["string"],
             "technology_risks": ["string"]
-          }},
-          "opportunities": {{
+          },
+          "opportunities": {
             "market_gaps": ["string"],
             "emerging_trends": ["string"],
             "underserved_segments": ["string"],
             "partnership_opportunities": ["string"]
-          }}
-        }}
+          }
+        }
         ```
 
         **RESEARCH GUIDELINES:**
@@ -143,10 +143,23 @@ market_agent = LlmAgent(
         - Assess scalability and growth potential
         - Identify key success factors and barriers
 
-        Current date: {datetime.date.today().isoformat()}
         Provide comprehensive, research-backed market analysis in the specified JSON format.
     """,
+    instruction=prompts.current_date_instruction,
     tools=[google_search],
+    before_agent_callback=[
+        incremental.before_agent_callback("market"),
+        research_cache.before_agent_callback("market"),
+    ],
+    before_model_callback=scheduler.before_model_callback("gemini-2.0-flash-exp"),
+    after_model_callback=[
+        scheduler.after_model_callback("gemini-2.0-flash-exp"),
+        research_cache.after_model_callback("market"),
+        schemas.after_model_callback("market"),
+    ],
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.0-flash-exp"),
+    after_agent_callback=schemas.after_agent_callback("market"),
+    output_key=schemas.OUTPUT_KEYS["market"],
     generate_content_config=GenerateContentConfig(
         temperature=0.2,
         response_mime_type="application/json"
@@ -1,13 +1,13 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 from google.genai.types import GenerateContentConfig
-import datetime
+from .. import incremental, prompts, research_cache, scheduler, schemas
 
 product_agent = LlmAgent(
     name="product_research_agent",
     model="gemini-2.0-flash-exp",
     description="Research-enabled product analysis specialist that evaluates product development, technology stack, user experience, and competitive positioning through web research.",
-    instruction=f"""
+    static_instruction="""
         You are a product analysis expert with comprehensive web research capabilities. Your mission is to research and evaluate the product strategy, development approach, technology choices, and user experience for a given startup.
 
         **RESEARCH & ANALYSIS WORKFLOW:**
@@ -41,35 +41,35 @@ product_agent = LlmAgent(
         Always return your analysis in this exact JSON format:
 
         ```json
-        {{
-          "product_summary": {{
-            "analysis_date": "{datetime.date.today().isoformat()}",
+        {
+          "product_summary": {
+            "analysis_date": "YYYY-MM-DD (the current date)",
             "confidence_level": "High|Medium|Low",
             "data_sources_count": "number",
             "research_depth": "comprehensive|moderate|limited"
-          }},
-          "product_overview": {{
+          },
+          "product_overview": {
             "product_name": "string",
             "product_category": "string",
             "primary_value_proposition": "string",
             "target_users": ["string"],
             "launch_date": "string",
             "current_version": "string"
-          }},
-          "core_features": {{
+          },
+          "core_features": {
             "key_features": [
-              {{
+              {
                 "feature_name": "string",
                 "description": "string",
                 "user_value": "string",
                 "competitive_advantage": "Strong|Moderate|Weak"
-              }}
+              }
             ],
             "feature_completeness": "Complete|Mostly Complete|Basic|MVP",
             "unique_differentiators": ["string"],
             "missing_features": ["string"]
-          }},
-          "technology_stack": {{
+          },
+          "technology_stack": {
             "frontend_technologies": ["string"],
             "backend_technologies": ["string"],
             "database_systems": ["string"],
@@ -77,68 +77,68 @@ product_agent = LlmAgent(
             "apis_and_integrations": ["string"],
             "mobile_platforms": ["string"],
             "architecture_approach": "Monolith|Microservices|Serverless|Hybrid"
-          }},
-          "user_experience": {{
+          },
+          "user_experience": {
             "interface_quality": "Excellent|Good|Average|Poor",
             "usability_rating": "Excellent|Good|Average|Poor",
             "onboarding_experience": "Smooth|Adequate|Challenging",
             "mobile_experience": "Excellent|Good|Average|Poor|Not Available",
             "accessibility_features": ["string"],
             "user_feedback_themes": ["string"]
-          }},
-          "product_metrics": {{
-            "user_ratings": {{
+          },
+          "product_metrics": {
+            "user_ratings": {
               "app_store_rating": "string",
               "google_play_rating": "string",
               "web_reviews_rating": "string"
-            }},
-            "user_feedback": {{
+            },
+            "user_feedback": {
               "positive_feedback": ["string"],
               "negative_feedback": ["string"],
               "feature_requests": ["string"]
-            }},
+            },
             "adoption_indicators": ["string"]
-          }},
-          "technical_assessment": {{
+          },
+          "technical_assessment": {
             "scalability_readiness": "High|Medium|Low",
             "performance_quality": "Excellent|Good|Average|Poor",
             "security_posture": "Strong|Adequate|Concerning",
             "code_quality_indicators": ["string"],
             "technical_debt_level": "Low|Medium|High"
-          }},
-          "development_approach": {{
+          },
+          "development_approach": {
             "development_methodology": "Agile|Waterfall|Lean|Mixed",
             "release_frequency": "string",
             "testing_approach": ["string"],
             "ci_cd_maturity": "Advanced|Intermediate|Basic",
             "documentation_quality": "Excellent|Good|Adequate|Poor"
-          }},
-          "competitive_positioning": {{
+          },
+          "competitive_positioning": {
             "competitive_strengths": ["string"],
             "competitive_weaknesses": ["string"],
             "feature_gaps_vs_competitors": ["string"],
             "innovation_level": "High|Medium|Low",
             "market_differentiation": "Strong|Moderate|Weak"
-          }},
-          "product_roadmap": {{
+          },
+          "product_roadmap": {
             "planned_features": ["string"],
             "development_priorities": ["string"],
             "expansion_plans": ["string"],
             "timeline_estimates": ["string"]
-          }},
-          "risks_and_challenges": {{
+          },
+          "risks_and_challenges": {
             "technical_risks": ["string"],
             "product_risks": ["string"],
             "user_adoption_barriers": ["string"],
             "scalability_concerns": ["string"]
-          }},
-          "opportunities": {{
+          },
+          "opportunities": {
             "product_enhancements": ["string"],
             "new_features": ["string"],
             "market_expansion": ["string"],
             "partnership_opportunities": ["string"]
-          }}
-        }}
+          }
+        }
         ```
 
         **RESEARCH GUIDELINES:**
@@ -156,10 +156,23 @@ product_agent = LlmAgent(
         - Assess competitive positioning and differentiation
         - Identify key improvement areas and opportunities
 
-        Current date: {datetime.date.today().isoformat()}
         Provide comprehensive, research-backed product analysis in the specified JSON format.
     """,
+    instruction=prompts.current_date_instruction,
     tools=[google_search],
+    before_agent_callback=[
+        incremental.before_agent_callback("product"),
+        research_cache.before_agent_callback("product"),
+    ],
+    before_model_callback=scheduler.before_model_callback("gemini-2.0-flash-exp"),
+    after_model_callback=[
+        scheduler.after_model_callback("gemini-2.0-flash-exp"),
+        research_cache.after_model_callback("product"),
+        schemas.after_model_callback("product"),
+    ],
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.0-flash-exp"),
+    after_agent_callback=schemas.after_agent_callback("product"),
+    output_key=schemas.OUTPUT_KEYS["product"],
     generate_content_config=GenerateContentConfig(
         temperature=0.2,
         response_mime_type="application/json"
@@ -1,13 +1,13 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 from google.genai.types import GenerateContentConfig
-import datetime
+from .. import incremental, prompts, research_cache, scheduler, schemas
 
 team_agent = LlmAgent(
     name="team_research_agent",
     model="gemini-2.0-flash-exp",
     description="Research-enabled team analysis specialist that evaluates founding teams, leadership, and organizational capability through web research.",
-    instruction=f"""
+    static_instruction="""
         You are a team analysis expert with comprehensive web research capabilities. Your mission is to research and evaluate the founding team, leadership, and organizational structure of a given startup.
 
         **RESEARCH & ANALYSIS WORKFLOW:**
@@ -41,16 +41,16 @@ team_agent = LlmAgent(
         Always return your analysis in this exact JSON format:
 
         ```json
-        {{
-          "team_summary": {{
-            "analysis_date": "{datetime.date.today().isoformat()}",
+        {
+          "team_summary": {
+            "analysis_date": "YYYY-MM-DD (the current date)",
             "confidence_level": "High|Medium|Low",
             "data_sources_count": "number",
             "research_depth": "comprehensive|moderate|limited"
-          }},
-          "founding_team": {{
+          },
+          "founding_team": {
             "founders": [
-              {{
+              {
                 "name": "string",
                 "role": "string",
                 "background": "string",
@@ -58,26 +58,26 @@ team_agent = LlmAgent(
                 "education": "string",
                 "domain_expertise": "string",
                 "linkedin_url": "string"
-              }}
+              }
             ],
             "founding_date": "string",
             "team_size_at_founding": "number",
             "founder_commitment": "Full-time|Part-time|Mixed"
-          }},
-          "leadership_team": {{
+          },
+          "leadership_team": {
             "key_executives": [
-              {{
+              {
                 "name": "string",
                 "role": "string",
                 "join_date": "string",
                 "background": "string",
                 "previous_companies": ["string"]
-              }}
+              }
             ],
             "leadership_changes": ["string"],
             "management_experience": "Strong|Moderate|Limited"
-          }},
-          "team_analysis": {{
+          },
+          "team_analysis": {
             "total_team_size": "number",
             "technical_team_size": "number",
             "business_team_size": "number",
@@ -85,34 +85,34 @@ team_agent = LlmAgent(
             "identified_gaps": ["string"],
             "hiring_velocity": "string",
             "talent_quality": "High|Medium|Low"
-          }},
-          "governance_structure": {{
+          },
+          "governance_structure": {
             "board_composition": ["string"],
             "advisory_board": ["string"],
             "investor_board_seats": "number",
             "governance_maturity": "Strong|Developing|Weak"
-          }},
-          "team_assessment": {{
+          },
+          "team_assessment": {
             "founder_market_fit": "Strong|Good|Weak",
             "execution_capability": "High|Medium|Low",
             "technical_competency": "High|Medium|Low",
             "business_acumen": "High|Medium|Low",
             "team_cohesion": "Strong|Good|Concerning",
             "scaling_readiness": "Ready|Developing|Not Ready"
-          }},
-          "risk_factors": {{
+          },
+          "risk_factors": {
             "key_person_dependency": "High|Medium|Low",
             "leadership_stability": "Stable|Moderate|Unstable",
             "skill_gaps": ["string"],
             "hiring_challenges": ["string"]
-          }},
-          "strengths": {{
+          },
+          "strengths": {
             "competitive_advantages": ["string"],
             "unique_expertise": ["string"],
             "network_access": ["string"],
             "execution_track_record": ["string"]
-          }}
-        }}
+          }
+        }
         ```
 
         **RESEARCH GUIDELINES:**
@@ -130,10 +130,23 @@ team_agent = LlmAgent(
         - Assess scalability and growth readiness
         - Identify critical hiring needs and gaps
 
-        Current date: {datetime.date.today().isoformat()}
         Provide comprehensive, research-backed team analysis in the specified JSON format.
     """,
+    instruction=prompts.current_date_instruction,
     tools=[google_search],
+    before_agent_callback=[
+        incremental.before_agent_callback("team"),
+        research_cache.before_agent_callback("team"),
+    ],
+    before_model_callback=scheduler.before_model_callback("gemini-2.0-flash-exp"),
+    after_model_callback=[
+        scheduler.after_model_callback("gemini-2.0-flash-exp"),
+        research_cache.after_model_callback("team"),
+        schemas.after_model_callback("team"),
+    ],
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.0-flash-exp"),
+    after_agent_callback=schemas.after_agent_callback("team"),
+    output_key=schemas.OUTPUT_KEYS["team"],
     generate_content_config=GenerateContentConfig(
         temperature=0.2,
         response_mime_type="application/json"
@@ -1,13 +1,13 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 from google.genai.types import GenerateContentConfig
-import datetime
+from .. import incremental, prompts, research_cache, scheduler, schemas
 
 traction_agent = LlmAgent(
     name="traction_research_agent",
     model="gemini-2.0-flash-exp",
     description="Research-enabled traction analysis specialist that evaluates business growth, customer acquisition, market validation, and key performance metrics through web research.",
-    instruction=f"""
+    static_instruction="""
         You are a traction analysis expert with comprehensive web research capabilities. Your mission is to research and evaluate the business traction, growth metrics, customer acquisition, and market validation for a given startup.
 
         **RESEARCH & ANALYSIS WORKFLOW:**
@@ -41,118 +41,118 @@ traction_agent = LlmAgent(
         Always return your analysis in this exact JSON format:
 
         ```json
-        {{
-          "traction_summary": {{
-            "analysis_date": "{datetime.date.today().isoformat()}",
+        {
+          "traction_summary": {
+            "analysis_date": "YYYY-MM-DD (the current date)",
             "confidence_level": "High|Medium|Low",
             "data_sources_count": "number",
             "research_depth": "comprehensive|moderate|limited"
-          }},
-          "growth_metrics": {{
-            "user_growth": {{
+          },
+          "growth_metrics": {
+            "user_growth": {
               "total_users": "string",
               "growth_rate": "string",
               "growth_period": "string",
               "user_acquisition_trend": "Accelerating|Steady|Declining"
-            }},
-            "revenue_growth": {{
+            },
+            "revenue_growth": {
               "revenue_disclosed": "boolean",
               "revenue_estimate": "string",
               "revenue_growth_rate": "string",
               "revenue_model": "string",
               "monetization_stage": "Proven|Developing|Experimental"
-            }},
-            "engagement_metrics": {{
+            },
+            "engagement_metrics": {
               "user_retention_indicators": ["string"],
               "usage_frequency": "string",
               "customer_satisfaction": "High|Medium|Low",
               "net_promoter_score": "string"
-            }}
-          }},
-          "customer_acquisition": {{
+            }
+          },
+          "customer_acquisition": {
             "acquisition_channels": [
-              {{
+              {
                 "channel": "string",
                 "effectiveness": "High|Medium|Low",
                 "cost_efficiency": "High|Medium|Low"
-              }}
+              }
             ],
             "customer_acquisition_cost": "string",
             "customer_lifetime_value": "string",
             "payback_period": "string",
             "organic_growth_rate": "string"
-          }},
-          "market_validation": {{
+          },
+          "market_validation": {
             "customer_testimonials": ["string"],
             "case_studies": ["string"],
             "pilot_programs": ["string"],
             "enterprise_customers": ["string"],
             "market_penetration": "High|Medium|Low"
-          }},
-          "partnerships_ecosystem": {{
+          },
+          "partnerships_ecosystem": {
             "strategic_partnerships": [
-              {{
+              {
                 "partner": "string",
                 "partnership_type": "string",
                 "announced_date": "string",
                 "strategic_value": "High|Medium|Low"
-              }}
+              }
             ],
             "integration_partners": ["string"],
             "distribution_partnerships": ["string"],
             "ecosystem_development": "Strong|Moderate|Weak"
-          }},
-          "media_coverage": {{
+          },
+          "media_coverage": {
             "press_mentions": [
-              {{
+              {
                 "publication": "string",
                 "date": "string",
                 "coverage_type": "Feature|News|Review|Interview",
                 "sentiment": "Positive|Neutral|Negative"
-              }}
+              }
             ],
             "industry_recognition": ["string"],
             "awards_received": ["string"],
             "media_momentum": "High|Medium|Low"
-          }},
-          "competitive_position": {{
+          },
+          "competitive_position": {
             "market_share_indicators": ["string"],
             "competitive_wins": ["string"],
             "customer_migration": ["string"],
             "competitive_advantage_validation": "Strong|Moderate|Weak"
-          }},
-          "operational_indicators": {{
+          },
+          "operational_indicators": {
             "team_growth": "string",
             "hiring_velocity": "High|Medium|Low",
             "office_expansion": ["string"],
             "operational_scaling": "Advanced|Developing|Basic"
-          }},
-          "funding_traction": {{
+          },
+          "funding_traction": {
             "investor_interest": "High|Medium|Low",
             "fundraising_activity": ["string"],
             "valuation_trends": ["string"],
             "investor_quality": "Top Tier|Mid Tier|Early Stage"
-          }},
-          "traction_assessment": {{
+          },
+          "traction_assessment": {
             "overall_momentum": "Strong|Moderate|Weak",
             "growth_sustainability": "Sustainable|Uncertain|Concerning",
             "market_validation_strength": "Strong|Moderate|Weak",
             "scalability_evidence": "Strong|Moderate|Weak",
             "execution_capability": "Proven|Developing|Unproven"
-          }},
-          "risks_and_challenges": {{
+          },
+          "risks_and_challenges": {
             "growth_risks": ["string"],
             "market_risks": ["string"],
             "execution_risks": ["string"],
             "sustainability_concerns": ["string"]
-          }},
-          "opportunities": {{
+          },
+          "opportunities": {
             "growth_opportunities": ["string"],
             "market_expansion": ["string"],
             "partnership_opportunities": ["string"],
             "scaling_potential": ["string"]
-          }}
-        }}
+          }
+        }
         ```
 
         **RESEARCH GUIDELINES:**
@@ -170,10 +170,23 @@ traction_agent = LlmAgent(
         - Assess quality and consistency of traction metrics
         - Identify key growth drivers and potential challenges
 
-        Current date: {datetime.date.today().isoformat()}
         Provide comprehensive, research-backed traction analysis in the specified JSON format.
     """,
+    instruction=prompts.current_date_instruction,
     tools=[google_search],
+    before_agent_callback=[
+        incremental.before_agent_callback("traction"),
+        research_cache.before_agent_callback("traction"),
+    ],
+    before_model_callback=scheduler.before_model_callback("gemini-2.0-flash-exp"),
+    after_model_callback=[
+        scheduler.after_model_callback("gemini-2.0-flash-exp"),
+        research_cache.after_model_callback("traction"),
+        schemas.after_model_callback("traction"),
+    ],
+    on_model_error_callback=scheduler.on_model_error_callback("gemini-2.0-flash-exp"),
+    after_agent_callback=schemas.after_agent_callback("traction"),
+    output_key=schemas.OUTPUT_KEYS["traction"],
     generate_content_config=GenerateContentConfig(
         temperature=0.2,
         response_mime_type="application/json"
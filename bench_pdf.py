@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Rendering benchmark for the investment report PDF (ui/utils/pdf_generator.py)
+
+Renders small, typical and very large ADK outputs and reports wall time and
+peak Python memory, so rendering regressions show up before they ship.
+"""
+
+import sys
+import os
+import copy
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the utils directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ui', 'utils'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from test_pdf import test_analysis_data
+
+ROUNDS = 5
+THREADS = 4
+
+
+def small_report():
+    """Only the metadata and the investment summary, as from a failed run."""
+    return {
+        "analysis_metadata": test_analysis_data["analysis_metadata"],
+        "investment_summary": test_analysis_data["investment_summary"],
+    }
+
+
+def large_report(founders=40, competitors=150):
+    """Every section, with long prose and many founders and competitors."""
+    report = copy.deepcopy(test_analysis_data)
+    prose = "Detailed, research-backed findings with sources and caveats. " * 20
+    report["team_analysis"]["founding_team"]["founders"] = [
+        {
+            "name": f"Founder {i}",
+            "role": "Co-founder",
+            "background": prose,
+            "previous_experience": prose,
+        }
+        for i in range(founders)
+    ]
+    report["competitive_analysis"] = {
+        "company_name": "TestStartup Inc.",
+        "sector": "Enterprise AI",
+        "competitors": [
+            {
+                "company_name": f"Competitor {i}",
+                "founding_year": "2019",
+                "total_funding_raised": "$40M",
+                "business_model": prose,
+            }
+            for i in range(competitors)
+        ],
+        "competitive_summary": {
+            "positioning_vs_competition": prose,
+            "competitive_moat_assessment": prose,
+        },
+    }
+    for key in ("key_strengths", "key_risks"):
+        report["investment_summary"][key] = [prose[:300]] * 30
+    return report
+
+
+def rebuild_styles():
+    """Builds the style sheet, paragraph styles and table styles of one report."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    for name, parent in (("a", "Heading1"), ("b", "Heading2"), ("c", "Heading3"), ("d", "Normal"), ("e", "Normal")):
+        ParagraphStyle(name, parent=styles[parent], fontSize=11)
+    for _ in range(14):
+        TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 0), (-1, -1), 10)
+        ])
+
+
+def measure(render, data):
+    """Returns (best seconds, peak traced bytes, PDF bytes)."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        buffer = render(data)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    render(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(buffer.getvalue())
+
+
+def main():
+    from pdf_generator import generate_investment_report_pdf
+
+    def render_shared(data):
+        return generate_investment_report_pdf(data, "TestStartup Inc.")
+
+    cases = {
+        "small": small_report(),
+        "typical": test_analysis_data,
+        "very large": large_report(),
+    }
+
+    print("Investment report PDF rendering benchmark")
+    print(f"Best of {ROUNDS} rounds; peak memory from tracemalloc on one extra render")
+    print("=" * 72)
+    print(f"{'case':12} {'time':>10} {'peak memory':>13} {'PDF size':>11}")
+    for name, data in cases.items():
+        elapsed, peak, size = measure(render_shared, data)
+        print(f"{name:12} {elapsed * 1000:8.2f}ms {peak / 1024:10.0f} KB {size / 1024:8.1f} KB")
+    print("-" * 72)
+
+    # Setup every call used to repeat before styles moved to module level
+    best = float("inf")
+    for _ in range(ROUNDS * 20):
+        started = time.perf_counter()
+        rebuild_styles()
+        best = min(best, time.perf_counter() - started)
+    print(f"Per-call style setup avoided: {best * 1000:.2f}ms")
+
+    # The shared generator must render concurrent requests independently
+    data = cases["typical"]
+    expected = len(render_shared(data).getvalue())
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        sizes = list(executor.map(lambda _: len(render_shared(data).getvalue()), range(THREADS * ROUNDS)))
+    elapsed = time.perf_counter() - started
+    status = "OK" if all(size == expected for size in sizes) else "MISMATCH"
+    print(f"{THREADS} threads x {ROUNDS} typical reports on the shared generator: {elapsed * 1000:.0f}ms, sizes {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for ADK response JSON recovery (sanitize_adk_response)
+"""
+
+import re
+import sys
+import os
+import json
+import time
+
+# Add the utils directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ui', 'utils'))
+
+ROUNDS = 5
+CHUNK_SIZE = 4096
+
+
+def build_report(sections=40, items=60):
+    """Builds a deeply nested, synthesizer-shaped report of a few hundred KB."""
+    report = {"analysis_metadata": {"company_name": "BenchStartup Inc.", "analysis_date": "2025-09-21"}}
+    for s in range(sections):
+        report[f"section_{s}"] = {
+            "summary": {"analysis_date": "2025-09-21", "confidence_level": "High"},
+            "details": {
+                "entries": [
+                    {
+                        "name": f"Entry {i}",
+                        "notes": "Quoted \"figures\", braces {like these} and [brackets] in prose. " * 2,
+                        "metrics": {"growth": {"mom": "12%", "yoy": {"value": "140%", "source": "deck"}}},
+                        "tags": ["alpha", "beta", "gamma"],
+                    }
+                    for i in range(items)
+                ]
+            },
+        }
+    return report
+
+
+def legacy_sanitize(adk_response):
+    """The previous strip/find/regex implementation, kept for comparison."""
+    try:
+        if adk_response.strip().startswith('{') or adk_response.strip().startswith('['):
+            return json.loads(adk_response.strip())
+        if '```json' in adk_response:
+            start = adk_response.find('```json') + 7
+            end = adk_response.find('```', start)
+            if end != -1:
+                return json.loads(adk_response[start:end].strip())
+        if '```' in adk_response:
+            start = adk_response.find('```') + 3
+            end = adk_response.rfind('```')
+            if end != -1 and end > start:
+                return json.loads(adk_response[start:end].strip())
+        json_pattern = r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})'
+        matches = re.findall(json_pattern, adk_response, re.DOTALL)
+        if matches:
+            return json.loads(matches[0])
+        return {"analysis_text": adk_response.strip()}
+    except json.JSONDecodeError as e:
+        return {"error": f"JSON parsing failed: {str(e)}", "raw_response": adk_response}
+
+
+def time_call(fn, text):
+    best = float("inf")
+    result = None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def describe(result, expected):
+    if result == expected:
+        return "exact"
+    if isinstance(result, dict) and "error" in result:
+        return "LOST (parse error)"
+    if isinstance(result, dict) and set(result) <= set(expected):
+        return f"partial ({len(result)}/{len(expected)} top-level keys)"
+    return "wrong value"
+
+
+def main():
+    from json_recovery import extract_json, IncrementalJSONExtractor
+
+    def recover(text):
+        return extract_json(text)[0]
+
+    def recover_streamed(text):
+        extractor = IncrementalJSONExtractor()
+        for i in range(0, len(text), CHUNK_SIZE):
+            if extractor.feed(text[i:i + CHUNK_SIZE]):
+                break
+        return extractor.result()[0]
+
+    report = build_report()
+    body = json.dumps(report, indent=2)
+    cases = {
+        "plain JSON": body,
+        "fenced JSON": "```json\n" + body + "\n```",
+        "prose + fence + trailing prose": "Here is the final report:\n```json\n" + body + "\n```\nLet me know if you need more.",
+        "prose without fence": "Final report follows. " + body + " End of report.",
+        "truncated (85%)": "```json\n" + body[:int(len(body) * 0.85)],
+    }
+
+    print("ADK response JSON recovery benchmark")
+    print(f"Report size: {len(body) / 1024:.0f} KB, best of {ROUNDS} rounds")
+    print("=" * 78)
+    print(f"{'case':32} {'implementation':16} {'time':>10}  result")
+    for name, text in cases.items():
+        for label, fn in (("legacy", legacy_sanitize), ("extractor", recover), ("extractor/4KB", recover_streamed)):
+            elapsed, result = time_call(fn, text)
+            print(f"{name:32} {label:16} {elapsed * 1000:8.2f}ms  {describe(result, report)}")
+        print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -68,6 +68,7 @@ def create() -> None:
             "google-cloud-aiplatform[adk,agent_engines]",
             "pydantic",
             "python-dotenv",
+            "pymongo",
         ]
     if FLAGS.display_name:
         display_name = FLAGS.display_name
@@ -1,24 +1,45 @@
 import streamlit as st
 import json
-import base64
 from dotenv import load_dotenv
+
+# Load environment variables from .env file before the utils read their settings
+load_dotenv()
+
 from utils.vision_client import process_files
-from utils.gemini_client import get_gemini_analysis
-from utils.db import save_startup_data, save_adk_analysis
+from utils.gemini_client import get_gemini_analysis, WARM_UP_MODELS
+from utils.clients import warm_up
+from utils.db import save_startup_data
+from utils.adk_client import DOMAIN_SECTIONS
+from utils.adk_jobs import submit_adk_job, get_job, JOB_FAILED, JOB_SUCCEEDED, TERMINAL_STATUSES
 try:
     from utils.pdf_generator import generate_investment_report_pdf
+    from utils.report_view import show_pdf_report
     PDF_AVAILABLE = True
 except ImportError:
     from utils.simple_report import simple_pdf_fallback
     PDF_AVAILABLE = False
     print("⚠️  ReportLab not available. Using simple text reports.")
-import requests
 
-# Load environment variables from .env file
-load_dotenv()
+ADK_POLL_INTERVAL_SECONDS = 3
+
+SECTION_TITLES = {
+    "team_analysis": "Team Analysis",
+    "market_analysis": "Market Analysis",
+    "product_analysis": "Product Analysis",
+    "traction_analysis": "Traction Analysis",
+    "financial_analysis": "Financial Analysis",
+    "competitive_analysis": "Competitive Analysis",
+}
+
+@st.cache_resource
+def warm_up_clients():
+    """Starts creating the Google Cloud clients once per server process."""
+    warm_up(WARM_UP_MODELS)
+    return True
 
 def main():
     st.set_page_config(page_title="LetsVenture – Resolutes", layout="wide")
+    warm_up_clients()
     st.title("LetsVenture – Resolutes")
 
     st.write("Analyze startups quickly by processing pitch decks and founder checklists.")
@@ -75,135 +96,123 @@ def main():
         st.subheader("Generated Startup Analysis (JSON)")
         st.json(st.session_state.gemini_json)
 
+    force_refresh = st.checkbox(
+        "Force fresh research",
+        help="Re-run every specialist agent instead of reusing recent cached research for this startup."
+    )
+
+    refresh_domains = st.multiselect(
+        "Refresh only these domains",
+        options=list(DOMAIN_SECTIONS),
+        format_func=lambda domain: SECTION_TITLES[DOMAIN_SECTIONS[domain]],
+        help="Incremental re-analysis: re-run just these agents and reuse the startup's stored analysis for the rest. Leave empty for a full analysis."
+    )
+
     if st.button("Get ADK Analysis"):
         if not startup_name:
             st.warning("Please enter a startup name before requesting ADK analysis.")
         else:
-            with st.spinner("ADK Agent is analyzing the data..."):
-                try:
-                    prompt = f"Research and analyze startup: {startup_name}\n\nPlease conduct comprehensive research and provide detailed structured analysis covering:\n1. Team evaluation (founder background, completeness, commitment)\n2. Market analysis (TAM/SAM, competition, growth dynamics)\n3. Product assessment (MVP stage, differentiators, technical feasibility)\n4. Traction review (revenue metrics, engagement signals, hiring velocity)\n5. Financial analysis (funding status, unit economics, risk factors)\n6. Competitive landscape (key competitors, market positioning, benchmarks)\n7. Research insights and investment recommendations\n\nProvide structured JSON responses for each analysis domain."
-                    
-                    user_id = "test_user"
-                    session_id = "adk_session"
-                    base_url = "http://localhost:8000"
-                    agent_name = "adk" 
-
-                    session_url = f"{base_url}/apps/{agent_name}/users/{user_id}/sessions/{session_id}"
-                    run_url = f"{base_url}/run"
-
-                    # Step 1: Create session
-                    requests.post(session_url).raise_for_status()
-
-                    # Step 2: Send prompt to /run
-                    payload = {
-                        "appName": agent_name,
-                        "userId": user_id,
-                        "sessionId": session_id,
-                        "newMessage": {
-                            "parts": [{"text": prompt}],
-                            "role": "user"
-                        },
-                        "streaming": False
-                    }
-                    
-                    run_response = requests.post(run_url, json=payload)
-                    run_response.raise_for_status()
-                    
-                    # Step 3: Delete session
-                    requests.delete(session_url).raise_for_status()
+            st.session_state.adk_job_id = submit_adk_job(
+                startup_name,
+                force_refresh=force_refresh,
+                refresh_domains=refresh_domains or None,
+            )
+            st.session_state.adk_job_startup = startup_name
+            st.session_state.adk_job_notified = False
+
+    if 'adk_job_id' in st.session_state:
+        job = get_job(st.session_state.adk_job_id)
+        if job is None:
+            st.warning("The ADK analysis job could not be found. Please request the analysis again.")
+        elif job["status"] == JOB_FAILED:
+            st.error(job["error"])
+        elif job["status"] == JOB_SUCCEEDED:
+            show_adk_result(job)
+        else:
+            show_adk_job_progress(st.session_state.adk_job_id)
+
+@st.fragment(run_every=ADK_POLL_INTERVAL_SECONDS)
+def show_adk_job_progress(job_id):
+    """Polls a running ADK job and shows each specialist's output as soon as it finishes."""
+    job = get_job(job_id)
+    if job is None or job["status"] in TERMINAL_STATUSES:
+        st.rerun()
+    st.progress(job["progress"], text=f"ADK Agent is analyzing the data... {job['stage']}")
+
+    for section, output in (job.get("partial_results") or {}).items():
+        with st.expander(f"✅ {SECTION_TITLES.get(section, section)} ready"):
+            st.json(output)
+
+def show_adk_result(job):
+    """Renders a finished ADK job: save status, analysis JSON and the investment report."""
+    startup_name = job["startup_name"]
+    adk_response = job["result"] or ""
+
+    if job.get("events"):
+        with st.expander("Raw ADK Agent Response"):
+            st.json(job["events"])
+
+    save_result = job.get("save_result")
+    if save_result:
+        if save_result == "updated":
+            st.success("ADK analysis updated in existing startup record!")
+        else:
+            st.success(f"ADK analysis saved to database with ID: {save_result}")
+    else:
+        st.warning("ADK analysis completed but failed to save to database.")
+
+    if not st.session_state.get("adk_job_notified"):
+        st.toast("ADK Agent analysis complete!")
+        st.session_state.adk_job_notified = True
+    st.subheader("ADK Agent Analysis")
+
+    # Try to display as JSON if possible, otherwise as text
+    try:
+        if adk_response.strip().startswith('{') or adk_response.strip().startswith('['):
+            parsed_response = json.loads(adk_response)
+            missing_domains = parsed_response.get("analysis_metadata", {}).get("missing_domains") if isinstance(parsed_response, dict) else None
+            if missing_domains:
+                st.warning(f"Research did not complete in time for: {', '.join(missing_domains)}. These sections are marked unavailable.")
+            st.json(parsed_response)
+        else:
+            st.text(adk_response)
+    except json.JSONDecodeError:
+        st.text(adk_response)
 
-                    # Process the response
-                    response_data = run_response.json()
-                    
-                    st.write("Raw ADK Agent Response:")
-                    st.json(response_data)
-                    # Extract the text from the last part of the response
-                    last_block = response_data[-1]
-                    adk_response = last_block.get("content", {}).get("parts", [{}])[0].get("text", "")
-
-                    # Save ADK analysis to MongoDB
-                    st.write("Saving ADK analysis to database...")
-                    save_result = save_adk_analysis(startup_name, adk_response)
-                    
-                    if save_result:
-                        if save_result == "updated":
-                            st.success("ADK analysis updated in existing startup record!")
-                        else:
-                            st.success(f"ADK analysis saved to database with ID: {save_result}")
-                    else:
-                        st.warning("ADK analysis completed but failed to save to database.")
-
-                    st.toast("ADK Agent analysis complete!")
-                    st.subheader("ADK Agent Analysis")
-                    
-                    # Try to display as JSON if possible, otherwise as text
-                    try:
-                        if adk_response.strip().startswith('{') or adk_response.strip().startswith('['):
-                            import json
-                            parsed_response = json.loads(adk_response)
-                            st.json(parsed_response)
-                        else:
-                            st.text(adk_response)
-                    except json.JSONDecodeError:
-                        st.text(adk_response)
-                    
-                    # Generate PDF Report
-                    st.subheader("📄 Investment Report")
-                    
-                    try:
-                        # Generate the PDF or text report
-                        with st.spinner("Generating professional investment report..."):
-                            if PDF_AVAILABLE:
-                                pdf_buffer = generate_investment_report_pdf(adk_response, startup_name)
-                                file_extension = ".pdf"
-                                mime_type = "application/pdf"
-                                report_type = "PDF Report"
-                            else:
-                                pdf_buffer = simple_pdf_fallback(adk_response, startup_name)
-                                file_extension = ".txt"
-                                mime_type = "text/plain"
-                                report_type = "Text Report"
-                            
-                        # Create download button
-                        pdf_bytes = pdf_buffer.getvalue()
-                        
-                        st.download_button(
-                            label=f"📥 Download Investment Report ({report_type})",
-                            data=pdf_bytes,
-                            file_name=f"{startup_name}_Investment_Analysis_Report{file_extension}",
-                            mime=mime_type,
-                            key="download_report"
-                        )
-                        
-                        if PDF_AVAILABLE:
-                            # Display PDF in browser
-                            st.subheader("📊 Report Preview")
-                            b64_pdf = base64.b64encode(pdf_bytes).decode()
-                            
-                            # Create an iframe to display the PDF
-                            pdf_display = f'<iframe src="data:application/pdf;base64,{b64_pdf}" width="100%" height="800" type="application/pdf"></iframe>'
-                            st.markdown(pdf_display, unsafe_allow_html=True)
-                        else:
-                            # Display text report
-                            st.subheader("📊 Report Preview")
-                            st.text_area(
-                                "Report Content:",
-                                value=pdf_bytes.decode('utf-8'),
-                                height=400,
-                                disabled=True
-                            )
-                            st.info("💡 Install ReportLab (`pip install reportlab`) for professional PDF reports!")
-                        
-                        st.success(f"✅ Professional {report_type.lower()} generated successfully!")
-                        
-                    except Exception as pdf_error:
-                        st.error(f"Failed to generate report: {pdf_error}")
-                        st.info("The analysis was completed successfully, but report generation encountered an issue.")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"Failed to connect to the ADK Agent server. Please ensure it is running. Error: {e}")
-                except Exception as e:
-                    st.error(f"An error occurred with the ADK Agent: {e}")
+    # Generate PDF Report
+    st.subheader("📄 Investment Report")
 
+    try:
+        if PDF_AVAILABLE:
+            show_pdf_report(adk_response, startup_name, cache_key=job["_id"])
+            report_type = "PDF Report"
+        else:
+            with st.spinner("Generating professional investment report..."):
+                report_bytes = simple_pdf_fallback(adk_response, startup_name).getvalue()
+            report_type = "Text Report"
+            st.download_button(
+                label=f"📥 Download Investment Report ({report_type})",
+                data=report_bytes,
+                file_name=f"{startup_name}_Investment_Analysis_Report.txt",
+                mime="text/plain",
+                key="download_report"
+            )
+
+            # Display text report
+            st.subheader("📊 Report Preview")
+            st.text_area(
+                "Report Content:",
+                value=report_bytes.decode('utf-8'),
+                height=400,
+                disabled=True
+            )
+            st.info("💡 Install ReportLab (`pip install reportlab`) for professional PDF reports!")
+
+        st.success(f"✅ Professional {report_type.lower()} generated successfully!")
+
+    except Exception as pdf_error:
+        st.error(f"Failed to generate report: {pdf_error}")
+        st.info("The analysis was completed successfully, but report generation encountered an issue.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+Batch portfolio analysis.
+
+Runs the same pipeline as the Streamlit app (document extraction, the Gemini
+analysis and the ADK research pipeline) for every startup in a manifest, with
+bounded parallelism. Progress is checkpointed per startup in MongoDB, so
+re-running the same command after a crash skips finished startups and resumes
+the rest from their last completed step. A startup run with --skip-adk is
+checkpointed as extracted, so a later run without it adds the ADK analysis.
+
+Usage (from the ui/ directory):
+    python batch_analyze.py manifest.json --workers 4
+    python batch_analyze.py manifest.json --export-zip portfolio_reports.zip
+    python batch_analyze.py manifest.json --export-summary portfolio.csv
+
+The manifest is either a JSON list of objects
+    [{"startup_name": "Acme", "documents": ["decks/acme.pdf", "acme_checklist.docx"]}]
+or a CSV file with "startup_name" and "documents" columns, documents separated
+by ";". Relative document paths are resolved against the manifest's directory.
+"""
+import os
+import csv
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before the utils read their settings
+load_dotenv()
+
+from utils.vision_client import process_files
+from utils.gemini_client import get_gemini_analysis, WARM_UP_MODELS
+from utils.clients import warm_up
+from utils.db import save_startup_data, save_adk_analysis, register_batch_items, update_batch_item, get_latest_adk_analysis
+from utils.adk_client import run_adk_analysis
+
+ITEM_PENDING = "pending"
+ITEM_RUNNING = "running"
+# Extraction and the Gemini analysis are done; the ADK step was skipped
+ITEM_EXTRACTED = "extracted"
+ITEM_COMPLETED = "completed"
+ITEM_FAILED = "failed"
+
+class LocalFile:
+    """A document on disk with the interface of a Streamlit upload."""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+
+    def getvalue(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+def load_manifest(path):
+    """
+    Reads a JSON or CSV manifest.
+
+    Returns:
+        list[dict]: Entries with "startup_name" and absolute "documents" paths.
+
+    Raises:
+        ValueError: If an entry has no startup name or no documents.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = [
+                {"startup_name": row.get("startup_name", ""), "documents": (row.get("documents") or "").split(";")}
+                for row in csv.DictReader(f)
+            ]
+        else:
+            rows = json.load(f)
+            if isinstance(rows, dict):
+                rows = rows.get("startups", [])
+
+    entries = []
+    for row in rows:
+        startup_name = (row.get("startup_name") or "").strip()
+        documents = [doc.strip() for doc in row.get("documents") or [] if doc.strip()]
+        if not startup_name or not documents:
+            raise ValueError(f"Manifest entry needs a startup_name and at least one document: {row}")
+        entries.append({
+            "startup_name": startup_name,
+            "documents": [os.path.join(base_dir, os.path.expanduser(doc)) for doc in documents],
+        })
+    return entries
+
+def default_batch_id(manifest_path):
+    """Derives a stable batch ID from the manifest's location, so re-runs resume."""
+    path = os.path.abspath(manifest_path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{hashlib.sha256(path.encode('utf-8')).hexdigest()[:8]}"
+
+def process_item(item, skip_adk=False, force_refresh=False):
+    """
+    Runs the pipeline for one startup, checkpointing after each step.
+
+    A startup whose checkpoint already has a startup_id skips extraction and
+    the Gemini analysis and goes straight to the ADK pipeline.
+
+    Returns:
+        bool: True if every requested step completed.
+    """
+    item_id = item["_id"]
+    startup_name = item["startup_name"]
+    startup_id = item.get("startup_id")
+    update_batch_item(item_id, {"status": ITEM_RUNNING, "attempts": item.get("attempts", 0) + 1})
+
+    try:
+        if startup_id is None:
+            extracted_text = process_files([LocalFile(path) for path in item["documents"]])
+            if not extracted_text.strip():
+                raise ValueError("Could not extract any text from the documents")
+
+            gemini_json = get_gemini_analysis(startup_name, extracted_text)
+            if gemini_json is None:
+                raise RuntimeError("Failed to get analysis from Gemini after multiple retries")
+
+            startup_id = save_startup_data(startup_name, extracted_text, gemini_json)
+            if startup_id is None:
+                raise RuntimeError("Failed to save startup data to the database")
+            update_batch_item(item_id, {"startup_id": startup_id})
+
+        if skip_adk:
+            # The ADK step gets its own attempts when a later run requests it
+            update_batch_item(item_id, {"status": ITEM_EXTRACTED, "attempts": 0, "error": None})
+            return True
+
+        _, adk_response = run_adk_analysis(startup_name, force_refresh=force_refresh, priority="batch")
+        if save_adk_analysis(startup_name, adk_response) is None:
+            raise RuntimeError("Failed to save ADK analysis to the database")
+
+        update_batch_item(item_id, {"status": ITEM_COMPLETED, "error": None})
+        return True
+    except Exception as e:
+        update_batch_item(item_id, {"status": ITEM_FAILED, "error": str(e)})
+        print(f"{startup_name}: {e}")
+        return False
+
+def export_batch_reports(startup_names, output_dir=None, zip_path=None):
+    """
+    Renders the investment reports of finished startups in parallel.
+
+    Returns:
+        int: The number of reports that could not be exported.
+    """
+    from utils.report_renderer import export_reports
+
+    reports = []
+    missing = 0
+    for startup_name in startup_names:
+        analysis = get_latest_adk_analysis(startup_name)
+        if analysis is None:
+            print(f"{startup_name}: no stored ADK analysis to export")
+            missing += 1
+            continue
+        reports.append((startup_name, analysis))
+
+    failures = export_reports(reports, output_dir=output_dir, zip_path=zip_path)
+    print(f"Exported {len(reports) - len(failures)} of {len(startup_names)} reports")
+    return missing + len(failures)
+
+def export_batch_summary(startup_names, path):
+    """
+    Streams the analyses of finished startups into one CSV, Markdown or text
+    file, chosen by the file extension. Analyses are loaded one at a time.
+
+    Returns:
+        int: The number of startups without a stored analysis.
+    """
+    from utils.simple_report import write_portfolio, format_for_path
+
+    missing = []
+
+    def reports():
+        for startup_name in startup_names:
+            analysis = get_latest_adk_analysis(startup_name)
+            if analysis is None:
+                missing.append(startup_name)
+                continue
+            yield startup_name, analysis
+
+    with open(path, "wb") as f:
+        written = write_portfolio(reports(), f, format_for_path(path))
+    for startup_name in missing:
+        print(f"{startup_name}: no stored ADK analysis to export")
+    print(f"Wrote {written} bytes for {len(startup_names) - len(missing)} startups to {path}")
+    return len(missing)
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a portfolio of startups from a manifest.")
+    parser.add_argument("manifest", help="JSON or CSV manifest of startups and document paths")
+    parser.add_argument("--batch-id", help="Checkpoint ID; defaults to one derived from the manifest path")
+    parser.add_argument("--workers", type=int, default=4, help="Startups processed in parallel")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per startup across resumed runs")
+    parser.add_argument("--skip-adk", action="store_true", help="Run extraction and the Gemini analysis only")
+    parser.add_argument("--force-refresh", action="store_true", help="Ignore cached ADK research results")
+    parser.add_argument("--export-dir", help="Write the PDF report of every completed startup to this directory")
+    parser.add_argument("--export-zip", help="Write the PDF report of every completed startup to this zip archive")
+    parser.add_argument("--export-summary", help="Write every completed startup's analysis to one .csv, .md or .txt file")
+    args = parser.parse_args()
+
+    entries = load_manifest(args.manifest)
+    warm_up(WARM_UP_MODELS)
+    batch_id = args.batch_id or default_batch_id(args.manifest)
+
+    try:
+        items = register_batch_items(batch_id, entries)
+    except ValueError as e:
+        print(e)
+        return 1
+    if items is None:
+        print("MongoDB is required to checkpoint a batch run; check MONGODB_URI.")
+        return 1
+
+    done_statuses = (ITEM_COMPLETED, ITEM_EXTRACTED) if args.skip_adk else (ITEM_COMPLETED,)
+    todo = [
+        item for item in items
+        if item["status"] not in done_statuses and item.get("attempts", 0) < args.max_attempts
+    ]
+    print(f"Batch {batch_id}: {len(items)} startups, {len(items) - len(todo)} done or out of attempts, {len(todo)} to process")
+
+    completed = 0
+    finished = [item["startup_name"] for item in items if item["status"] == ITEM_COMPLETED]
+    with ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="batch") as executor:
+        futures = {
+            executor.submit(process_item, item, args.skip_adk, args.force_refresh): item
+            for item in todo
+        }
+        for index, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            ok = future.result()
+            completed += ok
+            if ok:
+                finished.append(item["startup_name"])
+            print(f"[{index}/{len(todo)}] {item['startup_name']}: {'completed' if ok else 'failed'}")
+
+    print(f"Batch {batch_id}: {completed} of {len(todo)} startups completed in this run")
+    export_failures = 0
+    if (args.export_dir or args.export_zip) and not args.skip_adk:
+        export_failures += export_batch_reports(finished, output_dir=args.export_dir, zip_path=args.export_zip)
+    if args.export_summary and not args.skip_adk:
+        export_failures += export_batch_summary(finished, args.export_summary)
+    return 0 if completed == len(todo) and not export_failures else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import datetime
+import streamlit as st
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before the utils read their settings
+load_dotenv()
+
+from utils.db import list_analyses, get_history_facets, get_analysis_record, backfill_analysis_summaries
+try:
+    from utils.pdf_generator import generate_investment_report_pdf
+    from utils.report_view import show_pdf_report
+    PDF_AVAILABLE = True
+except ImportError:
+    from utils.simple_report import simple_pdf_fallback
+    PDF_AVAILABLE = False
+
+FACETS_TTL_SECONDS = 300
+
+@st.cache_data(ttl=FACETS_TTL_SECONDS)
+def load_facets():
+    """Recommendations and sectors to filter by; cached because distinct scans the index."""
+    return get_history_facets()
+
+def read_filters():
+    """Renders the filter controls and returns the filters for list_analyses."""
+    facets = load_facets()
+    col1, col2, col3 = st.columns(3)
+    name_prefix = col1.text_input("Startup name starts with")
+    recommendation = col2.selectbox("Recommendation", ["Any"] + facets["recommendations"])
+    sector = col3.selectbox("Sector", ["Any"] + facets["sectors"])
+
+    col4, col5 = st.columns(2)
+    min_score, max_score = col4.slider("Overall score", 0.0, 10.0, (0.0, 10.0), step=0.5)
+    dates = col5.date_input("Analyzed between", value=(), help="Leave empty for any date.")
+
+    filters = {
+        "name_prefix": name_prefix.strip() or None,
+        "recommendation": None if recommendation == "Any" else recommendation,
+        "sector": None if sector == "Any" else sector,
+        # A score filter excludes analyses without a score, so only apply a narrowed range
+        "min_score": min_score if (min_score, max_score) != (0.0, 10.0) else None,
+        "max_score": max_score if (min_score, max_score) != (0.0, 10.0) else None,
+    }
+    if len(dates) == 2:
+        filters["date_from"] = datetime.datetime.combine(dates[0], datetime.time.min)
+        filters["date_to"] = datetime.datetime.combine(dates[1] + datetime.timedelta(days=1), datetime.time.min)
+    return filters
+
+def show_record(row):
+    """Shows one stored analysis and its report, without re-running the pipeline."""
+    record = get_analysis_record(row["source"], row["_id"])
+    if record is None:
+        st.warning("This analysis could not be loaded.")
+        return
+
+    st.subheader(record["startup_name"])
+    analysis = record.get("adk_analysis")
+    if analysis is None:
+        st.info("Only the document analysis is stored for this startup; run the ADK analysis for a full report.")
+        st.json(record.get("gemini_analysis") or {})
+        return
+
+    try:
+        if PDF_AVAILABLE:
+            show_pdf_report(analysis, record["startup_name"], cache_key=f"{row['source']}:{row['_id']}")
+        else:
+            report_bytes = simple_pdf_fallback(analysis, record["startup_name"]).getvalue()
+            st.download_button(
+                label="📥 Download Investment Report (Text Report)",
+                data=report_bytes,
+                file_name=f"{record['startup_name']}_Investment_Analysis_Report.txt",
+                mime="text/plain",
+                key=f"download_report_{row['_id']}"
+            )
+    except Exception as report_error:
+        st.error(f"Failed to generate report: {report_error}")
+    with st.expander("ADK Agent Analysis (JSON)"):
+        st.json(analysis)
+
+def main():
+    st.set_page_config(page_title="Analysis History – Resolutes", layout="wide")
+    st.title("Analysis History")
+    st.write("Find earlier analyses without re-running the pipeline.")
+
+    filters = read_filters()
+
+    # Pages are fetched with keyset cursors; the stack allows going back
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+
+    rows, next_cursor = list_analyses(filters, cursor=cursors[-1])
+    if not rows:
+        st.info("No analyses match these filters.")
+    else:
+        table = [
+            {
+                "Startup": row["startup_name"],
+                "Recommendation": row.get("summary", {}).get("recommendation") or "",
+                "Score": row.get("summary", {}).get("overall_score"),
+                "Sector": row.get("summary", {}).get("sector") or "",
+                "Analyzed": row["analyzed_at"],
+            }
+            for row in rows
+        ]
+        selection = st.dataframe(
+            table,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+        )
+
+    col1, col2, col3 = st.columns([1, 1, 6])
+    if col1.button("← Previous", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if col2.button("Next →", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+    col3.caption(f"Page {len(cursors)}")
+
+    if rows and selection.selection.rows:
+        show_record(rows[selection.selection.rows[0]])
+
+    with st.expander("Maintenance"):
+        st.write("Analyses saved before the history view existed are indexed in the background when the app connects to the database; this runs it again now.")
+        if st.button("Index older analyses"):
+            with st.spinner("Indexing..."):
+                updated = backfill_analysis_summaries()
+            load_facets.clear()
+            st.success(f"Indexed {updated} analyses.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import os
+import json
+import uuid
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+ADK_BASE_URL = os.getenv("ADK_BASE_URL", "http://localhost:8000")
+ADK_APP_NAME = os.getenv("ADK_APP_NAME", "adk")
+ADK_USER_ID = os.getenv("ADK_USER_ID", "resolutes_ui")
+ADK_REQUEST_TIMEOUT_SECONDS = float(os.getenv("ADK_REQUEST_TIMEOUT_SECONDS", "1800"))
+ADK_SESSION_POOL_SIZE = int(os.getenv("ADK_SESSION_POOL_SIZE", "4"))
+ADK_STREAMING = os.getenv("ADK_STREAMING", "1") != "0"
+
+# Specialist domain -> section of the final report it produces
+DOMAIN_SECTIONS = {
+    "team": "team_analysis",
+    "market": "market_analysis",
+    "product": "product_analysis",
+    "traction": "traction_analysis",
+    "finance": "financial_analysis",
+    "competitor": "competitive_analysis",
+}
+
+# Specialist agent name -> section of the final report it produces
+AGENT_SECTIONS = {
+    "team_research_agent": "team_analysis",
+    "market_research_agent": "market_analysis",
+    "product_research_agent": "product_analysis",
+    "traction_research_agent": "traction_analysis",
+    "finance_research_agent": "financial_analysis",
+    "competitor_agent": "competitive_analysis",
+}
+
+def build_analysis_prompt(startup_name):
+    """Builds the research prompt sent to the ADK pipeline."""
+    return f"Research and analyze startup: {startup_name}\n\nPlease conduct comprehensive research and provide detailed structured analysis covering:\n1. Team evaluation (founder background, completeness, commitment)\n2. Market analysis (TAM/SAM, competition, growth dynamics)\n3. Product assessment (MVP stage, differentiators, technical feasibility)\n4. Traction review (revenue metrics, engagement signals, hiring velocity)\n5. Financial analysis (funding status, unit economics, risk factors)\n6. Competitive landscape (key competitors, market positioning, benchmarks)\n7. Research insights and investment recommendations\n\nProvide structured JSON responses for each analysis domain."
+
+def extract_final_text(events):
+    """
+    Extracts the text from the last part of an ADK event list.
+    """
+    last_block = events[-1]
+    return last_block.get("content", {}).get("parts", [{}])[0].get("text", "")
+
+def event_text(event):
+    """Returns the concatenated text parts of an ADK event."""
+    parts = (event.get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts if isinstance(part, dict))
+
+def _session_url(session_id):
+    return f"{ADK_BASE_URL}/apps/{ADK_APP_NAME}/users/{ADK_USER_ID}/sessions/{session_id}"
+
+def _create_session():
+    session_id = f"run-{uuid.uuid4().hex}"
+    requests.post(_session_url(session_id), timeout=30).raise_for_status()
+    return session_id
+
+def _delete_session(session_id):
+    try:
+        requests.delete(_session_url(session_id), timeout=30).raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to delete ADK session {session_id}: {e}")
+
+class SessionPool:
+    """
+    Hands out a fresh, uniquely named ADK session per run.
+
+    A few empty sessions are created ahead of time so a run does not wait on
+    session creation, and used sessions are deleted in the background. Sessions
+    hold the run's state, so they are never handed out twice.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._idle = queue.Queue()
+        self._refill_lock = threading.Lock()
+        self._maintenance = ThreadPoolExecutor(max_workers=2, thread_name_prefix="adk-sessions")
+
+    def acquire(self):
+        """Returns a session ID that no other run is using."""
+        try:
+            session_id = self._idle.get_nowait()
+        except queue.Empty:
+            session_id = _create_session()
+        self._maintenance.submit(self.refill)
+        return session_id
+
+    def release(self, session_id):
+        """Schedules deletion of a used session without blocking the caller."""
+        self._maintenance.submit(_delete_session, session_id)
+
+    def discard_idle(self):
+        """Drops warm sessions, e.g. after the ADK server restarted and lost them."""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                return
+
+    def refill(self):
+        """Tops the pool of warm sessions back up to its target size."""
+        if not self._refill_lock.acquire(blocking=False):
+            return
+        try:
+            while self._idle.qsize() < self.size:
+                self._idle.put(_create_session())
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to pre-create ADK session: {e}")
+        finally:
+            self._refill_lock.release()
+
+session_pool = SessionPool(ADK_SESSION_POOL_SIZE)
+
+def run_adk_analysis(startup_name, on_event=None, force_refresh=False, refresh_domains=None, stored_analysis=None, priority="interactive"):
+    """
+    Runs the ADK research pipeline for a startup against the ADK API server.
+
+    Every run gets its own session, so concurrent analyses never share state.
+    With ADK_STREAMING enabled the run goes through /run_sse and events are
+    handed to on_event as soon as the server emits them, so each specialist's
+    output is available before the synthesizer finishes.
+
+    Args:
+        startup_name (str): The name of the startup.
+        on_event (callable): Optional callback invoked with each event dict.
+        force_refresh (bool): Re-run every specialist even if the ADK research
+            cache holds a fresh result.
+        refresh_domains (list[str]): For an incremental run, the domains (keys
+            of DOMAIN_SECTIONS) to research again.
+        stored_analysis (dict): For an incremental run, the previous analysis
+            whose sections are reused for every other domain.
+        priority (str): "interactive" or "batch"; the ADK server's model call
+            scheduler serves interactive runs first.
+
+    Returns:
+        A tuple of (list of raw ADK events, final response text).
+
+    Raises:
+        requests.exceptions.RequestException: If the ADK server call fails.
+    """
+    state_delta = {
+        "startup_name": startup_name,
+        "force_refresh": force_refresh,
+        "priority": priority,
+    }
+    if refresh_domains is not None:
+        state_delta["refresh_domains"] = list(refresh_domains)
+        state_delta["stored_analysis"] = {
+            section: stored_analysis[section]
+            for section in DOMAIN_SECTIONS.values()
+            # Sections a run could not produce are placeholders; research them again
+            if isinstance(stored_analysis.get(section), dict)
+            and stored_analysis[section].get("status") != "unavailable"
+        }
+
+    session_id = session_pool.acquire()
+    try:
+        run_response = _post_run(session_id, startup_name, state_delta)
+        if run_response.status_code == 404:
+            # A warm session was lost (ADK server restart); start over with a new one
+            run_response.close()
+            session_pool.discard_idle()
+            session_pool.release(session_id)
+            session_id = _create_session()
+            run_response = _post_run(session_id, startup_name, state_delta)
+        run_response.raise_for_status()
+
+        if ADK_STREAMING:
+            events = []
+            for event in _iter_sse_events(run_response):
+                events.append(event)
+                if on_event is not None:
+                    on_event(event)
+        else:
+            events = run_response.json()
+            if on_event is not None:
+                for event in events:
+                    on_event(event)
+    finally:
+        session_pool.release(session_id)
+
+    return events, extract_final_text(events)
+
+def _post_run(session_id, startup_name, state_delta):
+    payload = {
+        "appName": ADK_APP_NAME,
+        "userId": ADK_USER_ID,
+        "sessionId": session_id,
+        "newMessage": {
+            "parts": [{"text": build_analysis_prompt(startup_name)}],
+            "role": "user"
+        },
+        # Read by the agents' research cache, incremental and scheduling callbacks
+        "stateDelta": state_delta,
+        # Whole events only; /run_sse still delivers each one as it is produced
+        "streaming": False
+    }
+    endpoint = "/run_sse" if ADK_STREAMING else "/run"
+    return requests.post(
+        f"{ADK_BASE_URL}{endpoint}",
+        json=payload,
+        stream=ADK_STREAMING,
+        timeout=ADK_REQUEST_TIMEOUT_SECONDS,
+    )
+
+def _iter_sse_events(response):
+    """Parses the server-sent events of a /run_sse response into event dicts."""
+    with response:
+        for line in _iter_stream_lines(response):
+            if not line.startswith(b"data:"):
+                continue
+            event = json.loads(line[len(b"data:"):].strip())
+            if "error" in event and "content" not in event:
+                raise RuntimeError(f"ADK run failed: {event['error']}")
+            yield event
+
+def _iter_stream_lines(response):
+    """
+    Yields lines as soon as they arrive. iter_lines() waits for a full read
+    buffer, which would hold back short events until later ones fill it.
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:
+        # urllib3 1.x has no read1; byte-sized reads still return immediately
+        yield from response.iter_lines(chunk_size=1)
+        return
+
+    pending = bytearray()
+    while True:
+        chunk = read1(65536, decode_content=True)
+        if not chunk:
+            break
+        pending += chunk
+        *lines, rest = pending.split(b"\n")
+        pending = bytearray(rest)
+        for line in lines:
+            yield bytes(line).rstrip(b"\r")
+    if pending:
+        yield bytes(pending)
@@ -0,0 +1,240 @@
+"""
+Background job queue for ADK analyses.
+
+The ADK pipeline takes several minutes, so the Streamlit script thread only
+submits a job and polls its status. Jobs run on a bounded worker pool owned by
+the Streamlit server process, and their status, progress and result are kept
+in memory and mirrored to the 'adk_jobs' collection so they survive a page
+reload and can be read from other processes.
+
+Finished jobs are dropped from memory after JOB_RETENTION_SECONDS and are
+then read back from MongoDB. While a process has unfinished jobs it stamps
+them with a heartbeat; a persisted job whose heartbeat is older than
+JOB_STALE_SECONDS lost its worker (for example in a restart) and is marked
+as failed when it is next read, so the UI stops polling it.
+"""
+import os
+import time
+import uuid
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from .adk_client import run_adk_analysis, event_text, AGENT_SECTIONS
+from .db import (
+    save_adk_analysis,
+    save_adk_job,
+    update_adk_job,
+    get_adk_job,
+    touch_adk_jobs,
+    fail_stale_adk_job,
+    get_latest_adk_analysis,
+    sanitize_adk_response,
+)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+MAX_CONCURRENT_JOBS = int(os.getenv("ADK_MAX_CONCURRENT_JOBS", "4"))
+JOB_RETENTION_SECONDS = int(os.getenv("ADK_JOB_RETENTION_SECONDS", "3600"))
+HEARTBEAT_INTERVAL_SECONDS = int(os.getenv("ADK_JOB_HEARTBEAT_SECONDS", "30"))
+JOB_STALE_SECONDS = int(os.getenv("ADK_JOB_STALE_SECONDS", str(4 * HEARTBEAT_INTERVAL_SECONDS)))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="adk-jobs")
+_jobs = {}
+_jobs_lock = threading.Lock()
+_heartbeat_thread = None
+
+# Raw ADK events can be large, so they are kept in memory for debugging only
+_IN_MEMORY_ONLY_FIELDS = ("events",)
+
+def submit_adk_job(startup_name, force_refresh=False, refresh_domains=None):
+    """
+    Queues an ADK analysis and returns immediately.
+
+    Args:
+        startup_name (str): The name of the startup to analyze.
+        force_refresh (bool): Ignore cached specialist research results.
+        refresh_domains (list[str]): Re-run only these domains and reuse the
+            startup's stored analysis for the rest. None runs every domain.
+
+    Returns:
+        str: The job ID to poll with get_job.
+    """
+    now = datetime.datetime.utcnow()
+    job = {
+        "_id": uuid.uuid4().hex,
+        "startup_name": startup_name,
+        "force_refresh": force_refresh,
+        "refresh_domains": list(refresh_domains) if refresh_domains is not None else None,
+        "status": JOB_QUEUED,
+        "progress": 0.0,
+        "stage": "Waiting for a free worker",
+        "partial_results": {},
+        "result": None,
+        "save_result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "heartbeat_at": now,
+    }
+
+    with _jobs_lock:
+        _jobs[job["_id"]] = job
+    _persist(save_adk_job, dict(job))
+    _start_heartbeat()
+
+    _executor.submit(_run_job, job["_id"])
+    return job["_id"]
+
+def get_job(job_id):
+    """
+    Returns a snapshot of a job's status, progress and result.
+
+    Jobs started by this process are served from memory until they have been
+    finished for JOB_RETENTION_SECONDS; others (for example after a server
+    restart) are loaded from MongoDB. An unfinished persisted job whose
+    heartbeat has stopped is marked as failed.
+
+    Returns:
+        dict, or None if the job is unknown.
+    """
+    with _jobs_lock:
+        _evict_finished_jobs()
+        job = _jobs.get(job_id)
+        if job is not None:
+            snapshot = dict(job)
+            snapshot["partial_results"] = dict(job["partial_results"])
+            return snapshot
+
+    job = _persist(get_adk_job, job_id)
+    if job is not None and job["status"] not in TERMINAL_STATUSES:
+        # Jobs saved before heartbeats were recorded only have updated_at
+        last_seen = job.get("heartbeat_at") or job["updated_at"]
+        if (datetime.datetime.utcnow() - last_seen).total_seconds() > JOB_STALE_SECONDS:
+            fields = {
+                "status": JOB_FAILED,
+                "stage": "Failed",
+                "error": "The ADK analysis was interrupted, probably by a server restart. Please request it again.",
+                "updated_at": datetime.datetime.utcnow(),
+            }
+            if fail_stale_adk_job(job, fields):
+                job.update(fields)
+            else:
+                # The owner updated the job in the meantime
+                job = _persist(get_adk_job, job_id)
+    return job
+
+def _evict_finished_jobs():
+    """Drops jobs that finished more than JOB_RETENTION_SECONDS ago; call with _jobs_lock held."""
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(seconds=JOB_RETENTION_SECONDS)
+    for job_id in [job_id for job_id, job in _jobs.items()
+                   if job["status"] in TERMINAL_STATUSES and job["updated_at"] < cutoff]:
+        del _jobs[job_id]
+
+def _start_heartbeat():
+    """Starts the heartbeat thread once per process."""
+    global _heartbeat_thread
+    with _jobs_lock:
+        if _heartbeat_thread is not None:
+            return
+        _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="adk-jobs-heartbeat", daemon=True)
+    _heartbeat_thread.start()
+
+def _heartbeat_loop():
+    """Stamps this process's unfinished jobs so readers can tell they are still alive."""
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL_SECONDS)
+        now = datetime.datetime.utcnow()
+        with _jobs_lock:
+            _evict_finished_jobs()
+            active = [job_id for job_id, job in _jobs.items() if job["status"] not in TERMINAL_STATUSES]
+            for job_id in active:
+                _jobs[job_id]["heartbeat_at"] = now
+        if active:
+            _persist(touch_adk_jobs, active, now)
+
+def _update_job(job_id, **fields):
+    fields["updated_at"] = datetime.datetime.utcnow()
+    with _jobs_lock:
+        _jobs[job_id].update(fields)
+
+    persisted = {key: value for key, value in fields.items() if key not in _IN_MEMORY_ONLY_FIELDS}
+    _persist(update_adk_job, job_id, persisted)
+
+def _record_agent_output(job_id, section, output):
+    """Stores one specialist's finished output on the job as soon as it arrives."""
+    now = datetime.datetime.utcnow()
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job["partial_results"][section] = output
+        completed = len(job["partial_results"])
+        fields = {
+            "progress": 0.1 + 0.7 * completed / len(AGENT_SECTIONS),
+            "stage": f"{completed}/{len(AGENT_SECTIONS)} specialist analyses complete, synthesizing when all finish",
+            "updated_at": now,
+        }
+        job.update(fields)
+
+    fields[f"partial_results.{section}"] = output
+    _persist(update_adk_job, job_id, fields)
+
+def _persist(func, *args):
+    """Calls a db helper, treating a missing MongoDB configuration as in-memory only."""
+    try:
+        return func(*args)
+    except ValueError:
+        return None
+
+def _run_job(job_id):
+    startup_name = _jobs[job_id]["startup_name"]
+    force_refresh = _jobs[job_id]["force_refresh"]
+    refresh_domains = _jobs[job_id]["refresh_domains"]
+    try:
+        stored_analysis = None
+        if refresh_domains is not None:
+            stored_analysis = _persist(get_latest_adk_analysis, startup_name)
+            if not stored_analysis:
+                # Nothing to build on, so every domain has to be researched
+                refresh_domains = None
+                _update_job(job_id, refresh_domains=None)
+
+        _update_job(job_id, status=JOB_RUNNING, progress=0.1, stage="ADK agents are researching and analyzing")
+
+        def on_event(event):
+            section = AGENT_SECTIONS.get(event.get("author"))
+            text = event_text(event)
+            if section and text and not event.get("partial"):
+                _record_agent_output(job_id, section, sanitize_adk_response(text))
+
+        events, adk_response = run_adk_analysis(
+            startup_name,
+            on_event=on_event,
+            force_refresh=force_refresh,
+            refresh_domains=refresh_domains,
+            stored_analysis=stored_analysis,
+        )
+
+        _update_job(job_id, progress=0.9, stage="Saving ADK analysis to database", events=events)
+        save_result = _persist(save_adk_analysis, startup_name, adk_response)
+
+        _update_job(
+            job_id,
+            status=JOB_SUCCEEDED,
+            progress=1.0,
+            stage="Complete",
+            result=adk_response,
+            save_result=str(save_result) if save_result else None,
+        )
+    except requests.exceptions.RequestException as e:
+        _update_job(
+            job_id,
+            status=JOB_FAILED,
+            stage="Failed",
+            error=f"Failed to connect to the ADK Agent server. Please ensure it is running. Error: {e}",
+        )
+    except Exception as e:
+        _update_job(job_id, status=JOB_FAILED, stage="Failed", error=f"An error occurred with the ADK Agent: {e}")
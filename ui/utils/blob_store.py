@@ -0,0 +1,95 @@
+"""
+Compressed side storage for large text in MongoDB.
+
+Extracted document text and raw model responses are the bulk of a startup's
+data but are rarely read, so they are stored here and referenced by ID from
+the documents that own them. That keeps those documents far below the 16 MB
+limit and out of the working set of the hot reads.
+
+Text is zlib-compressed and content-addressed by SHA-256, so storing the same
+text twice (re-analysing a deck) reuses the existing blob. Compressed blobs
+up to INLINE_MAX_BYTES go into one document in the 'blobs' collection;
+larger ones go into the 'blobs' GridFS bucket, which splits them into chunks.
+"""
+import os
+import zlib
+import hashlib
+import datetime
+import gridfs
+from bson.binary import Binary
+
+# Text shorter than this stays inline in the owning document
+OFFLOAD_MIN_BYTES = int(os.getenv("BLOB_OFFLOAD_MIN_BYTES", "16384"))
+# Compressed blobs up to this size are stored as a single document
+INLINE_MAX_BYTES = int(os.getenv("BLOB_INLINE_MAX_BYTES", str(8 * 1024 * 1024)))
+COMPRESSION_LEVEL = 6
+
+_COLLECTION = "blobs"
+_BUCKET = "blobs"
+STORE_DOCUMENT = "document"
+STORE_GRIDFS = "gridfs"
+
+
+def should_offload(text):
+    """Returns True if text is large enough to be worth moving into a blob."""
+    return isinstance(text, str) and len(text) >= OFFLOAD_MIN_BYTES
+
+
+def put_text(db, text, kind):
+    """
+    Stores text as a compressed blob.
+
+    Args:
+        db: The MongoDB database.
+        text (str): The text to store.
+        kind (str): What the text is, e.g. "extracted_text"; kept for maintenance.
+
+    Returns:
+        dict: A reference to store in the owning document and pass to get_text.
+    """
+    raw = text.encode("utf-8")
+    blob_id = hashlib.sha256(raw).hexdigest()
+    data = zlib.compress(raw, COMPRESSION_LEVEL)
+    store = STORE_DOCUMENT if len(data) <= INLINE_MAX_BYTES else STORE_GRIDFS
+
+    if store == STORE_DOCUMENT:
+        db[_COLLECTION].update_one(
+            {"_id": blob_id},
+            {"$setOnInsert": {
+                "kind": kind,
+                "encoding": "zlib",
+                "data": Binary(data),
+                "size": len(raw),
+                "created_at": datetime.datetime.utcnow(),
+            }},
+            upsert=True,
+        )
+    else:
+        bucket = gridfs.GridFSBucket(db, bucket_name=_BUCKET)
+        if db[f"{_BUCKET}.files"].count_documents({"_id": blob_id}, limit=1) == 0:
+            bucket.upload_from_stream_with_id(
+                blob_id, kind, data, metadata={"kind": kind, "encoding": "zlib", "size": len(raw)}
+            )
+
+    return {"blob_id": blob_id, "store": store, "size": len(raw), "compressed_size": len(data)}
+
+
+def get_text(db, ref):
+    """
+    Loads text stored with put_text.
+
+    Returns:
+        str: The text, or None if the blob does not exist.
+    """
+    if ref.get("store") == STORE_GRIDFS:
+        bucket = gridfs.GridFSBucket(db, bucket_name=_BUCKET)
+        try:
+            data = bucket.open_download_stream(ref["blob_id"]).read()
+        except gridfs.errors.NoFile:
+            return None
+    else:
+        blob = db[_COLLECTION].find_one({"_id": ref["blob_id"]}, {"data": 1})
+        if blob is None:
+            return None
+        data = blob["data"]
+    return zlib.decompress(data).decode("utf-8")
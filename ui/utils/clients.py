@@ -0,0 +1,127 @@
+import os
+import time
+import datetime
+import threading
+import vertexai
+from vertexai.generative_models import GenerativeModel
+from google.cloud import vision
+try:
+    from vertexai.preview import caching
+    from vertexai.preview.generative_models import GenerativeModel as PreviewGenerativeModel
+    CONTEXT_CACHE_AVAILABLE = True
+except ImportError:
+    CONTEXT_CACHE_AVAILABLE = False
+
+# Shared, lazily created Google Cloud clients. Each one is created once per
+# process and reused by every call, so requests after the first skip client
+# construction, credential loading and channel setup.
+
+# Static system instructions at least this long are registered once with
+# Vertex context caching and referenced by every call; Vertex rejects cached
+# contents below the model's minimum (2,048 tokens for Gemini 2.5).
+CONTEXT_CACHE_ENABLED = os.getenv("GEMINI_CONTEXT_CACHE", "1") != "0"
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "2048"))
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+# Recreate the cache this long before it expires so calls never hit a stale one
+CONTEXT_CACHE_REFRESH_MARGIN_SECONDS = 300
+
+_lock = threading.Lock()
+_vertexai_initialized = False
+_generative_models = {}
+_vision_client = None
+
+def init_vertexai():
+    """
+    Initializes the Vertex AI SDK once per process.
+
+    Raises:
+        ValueError: If GOOGLE_CLOUD_PROJECT or GOOGLE_CLOUD_LOCATION is not set.
+    """
+    global _vertexai_initialized
+    if _vertexai_initialized:
+        return
+    with _lock:
+        if _vertexai_initialized:
+            return
+        project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+        location = os.getenv("GOOGLE_CLOUD_LOCATION")
+        if not project_id or not location:
+            raise ValueError("GOOGLE_CLOUD_PROJECT and GOOGLE_CLOUD_LOCATION environment variables must be set.")
+        vertexai.init(project=project_id, location=location)
+        _vertexai_initialized = True
+
+def get_generative_model(model_name, system_instruction=None):
+    """
+    Returns the process-wide GenerativeModel for a model name and static
+    system instruction.
+
+    Long system instructions are served from a Vertex context cache when
+    possible; short ones, or a failed cache creation, fall back to a plain
+    model that sends the instruction with each request.
+    """
+    key = (model_name, system_instruction)
+    entry = _generative_models.get(key)
+    if entry is None or entry[1] < time.monotonic():
+        init_vertexai()
+        with _lock:
+            entry = _generative_models.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                entry = _create_generative_model(model_name, system_instruction)
+                _generative_models[key] = entry
+    return entry[0]
+
+def _create_generative_model(model_name, system_instruction):
+    """Returns (model, monotonic time after which it must be recreated)."""
+    never = float("inf")
+    if system_instruction is None:
+        return GenerativeModel(model_name), never
+
+    # Same rough estimate gemini_client uses, to skip a count_tokens round trip
+    if CONTEXT_CACHE_ENABLED and CONTEXT_CACHE_AVAILABLE and len(system_instruction) // 4 >= CONTEXT_CACHE_MIN_TOKENS:
+        try:
+            cached_content = caching.CachedContent.create(
+                model_name=model_name,
+                system_instruction=system_instruction,
+                ttl=datetime.timedelta(seconds=CONTEXT_CACHE_TTL_SECONDS),
+            )
+            print(f"Created context cache {cached_content.name} for {model_name}")
+            refresh_at = time.monotonic() + CONTEXT_CACHE_TTL_SECONDS - CONTEXT_CACHE_REFRESH_MARGIN_SECONDS
+            return PreviewGenerativeModel.from_cached_content(cached_content=cached_content), refresh_at
+        except Exception as e:
+            print(f"Context cache creation failed; sending the instruction with each request: {e}")
+
+    return GenerativeModel(model_name, system_instruction=system_instruction), never
+
+def get_vision_client():
+    """Returns a process-wide Vision client; the underlying channel is thread-safe."""
+    global _vision_client
+    if _vision_client is None:
+        with _lock:
+            if _vision_client is None:
+                _vision_client = vision.ImageAnnotatorClient()
+    return _vision_client
+
+def warm_up(models, background=True):
+    """
+    Creates the shared clients ahead of the first request.
+
+    A count_tokens call opens each model's connection without generating
+    anything. Failures are only logged; the first real call retries lazily.
+
+    Args:
+        models (list[tuple]): (model name, system instruction) pairs to prepare.
+        background (bool): Run on a daemon thread instead of blocking.
+    """
+    def run():
+        try:
+            get_vision_client()
+            for model_name, system_instruction in models:
+                get_generative_model(model_name, system_instruction).count_tokens("warm-up")
+            print("Google Cloud clients warmed up.")
+        except Exception as e:
+            print(f"Client warm-up failed: {e}")
+
+    if background:
+        threading.Thread(target=run, name="client-warm-up", daemon=True).start()
+    else:
+        run()
@@ -1,32 +1,112 @@
 import os
-import json
-from pymongo import MongoClient
+import re
+import time
+import threading
+from bson import ObjectId
+from pymongo import MongoClient, ASCENDING, DESCENDING
 from pymongo.server_api import ServerApi
 import datetime
+from .json_recovery import extract_json, RECOVERY_REPAIRED
+from .blob_store import should_offload, put_text, get_text
+
+DB_NAME = "resolutes"
+HISTORY_PAGE_SIZE = 25
+MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("MONGODB_HEALTH_CHECK_INTERVAL_SECONDS", "60"))
+
+_client = None
+_db = None
+_client_lock = threading.Lock()
+_last_health_check = 0.0
+
+def get_client():
+    """
+    Returns the process-wide MongoClient, creating it on first use.
+
+    MongoClient is thread-safe and keeps its own connection pool, so every
+    caller shares one set of TLS connections and one topology monitor.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                uri = os.getenv("MONGODB_URI")
+                if not uri:
+                    raise ValueError("MONGODB_URI environment variable not set.")
+
+                _client = MongoClient(
+                    uri,
+                    server_api=ServerApi('1'),
+                    maxPoolSize=MAX_POOL_SIZE,
+                    minPoolSize=MIN_POOL_SIZE,
+                    maxIdleTimeMS=MAX_IDLE_TIME_MS,
+                    serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                )
+    return _client
 
 def get_db():
     """
-    Connects to MongoDB and returns the database object.
+    Returns the cached database object.
+
+    Until the first successful ping every call connects and pings; after that
+    the deployment is pinged at most once per health check interval rather
+    than on every call. Indexes are created after the first successful ping,
+    and analyses saved before the history view existed are backfilled.
+    Returns None if MongoDB cannot be reached.
+    """
+    global _db, _last_health_check
+    client = get_client()
+
+    if _db is None or time.monotonic() - _last_health_check > HEALTH_CHECK_INTERVAL_SECONDS:
+        try:
+            client.admin.command('ping')
+        except Exception as e:
+            print(e)
+            return None
+
+        with _client_lock:
+            if _db is None:
+                print("Pinged your deployment. You successfully connected to MongoDB!")
+                _db = client[DB_NAME]
+                ensure_indexes(_db)
+                # Index older analyses for the history view without blocking this call
+                threading.Thread(target=backfill_analysis_summaries, name="history-backfill", daemon=True).start()
+            _last_health_check = time.monotonic()
+
+    return _db
+
+def ensure_indexes(db):
+    """
+    Creates the indexes used by the startup and ADK analysis queries.
+    create_index is a no-op for indexes that already exist.
     """
-    uri = os.getenv("MONGODB_URI")
-    if not uri:
-        raise ValueError("MONGODB_URI environment variable not set.")
-    
-    client = MongoClient(uri, server_api=ServerApi('1'))
-    
     try:
-        client.admin.command('ping')
-        print("Pinged your deployment. You successfully connected to MongoDB!")
+        db.startups.create_index([("startup_name", ASCENDING)])
+        db.startups.create_index([("timestamp", DESCENDING)])
+        db.startups.create_index([("adk_timestamp", DESCENDING)])
+        db.adk_analyses.create_index([("startup_name", ASCENDING)])
+        db.adk_analyses.create_index([("analysis_timestamp", DESCENDING)])
+        db.adk_jobs.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
+        db.batch_items.create_index([("batch_id", ASCENDING), ("status", ASCENDING)])
+        # Analysis history: newest first, optionally narrowed by one equality filter
+        for collection in (db.startups, db.adk_analyses):
+            collection.create_index([("analyzed_at", DESCENDING), ("_id", DESCENDING)])
+            collection.create_index([("summary.recommendation", ASCENDING), ("analyzed_at", DESCENDING), ("_id", DESCENDING)])
+            collection.create_index([("summary.sector", ASCENDING), ("analyzed_at", DESCENDING), ("_id", DESCENDING)])
+            collection.create_index([("name_key", ASCENDING)])
     except Exception as e:
-        print(e)
-        return None
-
-    return client['resolutes']
+        print(f"Error creating MongoDB indexes: {e}")
 
 def save_startup_data(startup_name, extracted_text, gemini_json):
     """
     Saves startup data to the 'startups' collection in MongoDB.
 
+    Large extracted text is stored as a compressed blob and referenced from
+    the startup document; load it with get_startup_extracted_text.
+
     Args:
         startup_name (str): The name of the startup.
         team_name (str): The name of the team.
@@ -40,19 +120,75 @@ def save_startup_data(startup_name, extracted_text, gemini_json):
     if db is None:
         return None
         
+    now = datetime.datetime.utcnow()
     startup_document = {
         "startup_name": startup_name,
+        "name_key": name_key(startup_name),
         "original_extracted_text": extracted_text,
+        "extracted_text_chars": len(extracted_text),
         "gemini_analysis": gemini_json,
-        "timestamp": datetime.datetime.utcnow()
+        "summary": analysis_summary(gemini_analysis=gemini_json),
+        "timestamp": now,
+        "analyzed_at": now
     }
+    offload_text_field(db, startup_document, "original_extracted_text", "extracted_text")
     
     result = db.startups.insert_one(startup_document)
     return result.inserted_id
 
+def get_startup_extracted_text(startup_id):
+    """
+    Loads the text extracted from a startup's documents.
+
+    Args:
+        startup_id: The ID of the startup document.
+
+    Returns:
+        str: The extracted text, or None if the startup is not found.
+    """
+    db = get_db()
+    if db is None:
+        return None
+
+    try:
+        startup = db.startups.find_one(
+            {"_id": startup_id},
+            {"original_extracted_text": 1, "original_extracted_text_blob": 1},
+        )
+        if startup is None:
+            return None
+        return load_text_field(db, startup, "original_extracted_text")
+    except Exception as e:
+        print(f"Error loading extracted text for {startup_id}: {e}")
+        return None
+
+def offload_text_field(db, document, field, kind):
+    """
+    Moves a large text field of a document into blob storage, in place.
+
+    The text is replaced by a "<field>_blob" reference; short text is left inline.
+
+    Returns:
+        dict: The same document.
+    """
+    if should_offload(document.get(field)):
+        document[f"{field}_blob"] = put_text(db, document.pop(field), kind)
+    return document
+
+def load_text_field(db, document, field):
+    """Returns a text field stored inline or offloaded with offload_text_field."""
+    ref = document.get(f"{field}_blob")
+    if ref is not None:
+        return get_text(db, ref)
+    return document.get(field)
+
 def sanitize_adk_response(adk_response):
     """
     Sanitizes ADK response by parsing JSON and handling potential formatting issues.
+
+    The JSON value is found in a single pass whatever surrounds it (markdown
+    fences, prose), at any nesting depth; truncated output is closed and
+    parsed rather than discarded.
     
     Args:
         adk_response (str): Raw ADK response string
@@ -62,41 +198,20 @@ def sanitize_adk_response(adk_response):
     """
     if not adk_response or not isinstance(adk_response, str):
         return {"error": "Invalid ADK response format"}
-    
+
     try:
-        # Try to parse as JSON
-        if adk_response.strip().startswith('{') or adk_response.strip().startswith('['):
-            return json.loads(adk_response.strip())
-        
-        # If it's wrapped in markdown code blocks, extract the JSON
-        if '```json' in adk_response:
-            start = adk_response.find('```json') + 7
-            end = adk_response.find('```', start)
-            if end != -1:
-                json_content = adk_response[start:end].strip()
-                return json.loads(json_content)
-        
-        # If it's wrapped in regular code blocks, extract the JSON
-        if '```' in adk_response:
-            start = adk_response.find('```') + 3
-            end = adk_response.rfind('```')
-            if end != -1 and end > start:
-                json_content = adk_response[start:end].strip()
-                return json.loads(json_content)
-        
-        # Try to find JSON-like content within the response
-        import re
-        json_pattern = r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})'
-        matches = re.findall(json_pattern, adk_response, re.DOTALL)
-        if matches:
-            return json.loads(matches[0])
-        
-        # If all else fails, return as text content
-        return {"analysis_text": adk_response.strip()}
-        
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing error: {e}")
-        return {"error": f"JSON parsing failed: {str(e)}", "raw_response": adk_response}
+        value, status = extract_json(adk_response)
+        if status == RECOVERY_REPAIRED:
+            print("Recovered malformed or truncated JSON from the ADK response")
+        if status is not None:
+            return value
+
+        if not any(char in adk_response for char in "{["):
+            # No JSON at all; keep the text
+            return {"analysis_text": adk_response.strip()}
+
+        print("JSON parsing error: no recoverable JSON value in the ADK response")
+        return {"error": "JSON parsing failed: no recoverable JSON value", "raw_response": adk_response}
     except Exception as e:
         print(f"Unexpected error during ADK response sanitization: {e}")
         return {"error": f"Sanitization failed: {str(e)}", "raw_response": adk_response}
@@ -104,6 +219,9 @@ def sanitize_adk_response(adk_response):
 def save_adk_analysis(startup_name, adk_response):
     """
     Saves ADK analysis to MongoDB after sanitization.
+
+    If the response could not be parsed, the raw response kept with the
+    error is stored as a blob rather than inline.
     
     Args:
         startup_name (str): The name of the startup
@@ -119,12 +237,21 @@ def save_adk_analysis(startup_name, adk_response):
     try:
         # Sanitize the ADK response
         sanitized_response = sanitize_adk_response(adk_response)
+        if isinstance(sanitized_response, dict):
+            # Only error results carry the raw response; a JSON list is stored as is
+            sanitized_response = offload_text_field(db, dict(sanitized_response), "raw_response", "adk_raw_response")
         
+        now = datetime.datetime.utcnow()
+        summary = analysis_summary(adk_analysis=sanitized_response)
+
         # Create document structure
         adk_document = {
             "startup_name": startup_name,
+            "name_key": name_key(startup_name),
             "adk_analysis": sanitized_response,
-            "analysis_timestamp": datetime.datetime.utcnow(),
+            "summary": summary,
+            "analysis_timestamp": now,
+            "analyzed_at": now,
             "analysis_type": "adk_comprehensive"
         }
         
@@ -133,7 +260,9 @@ def save_adk_analysis(startup_name, adk_response):
             {"startup_name": startup_name},
             {"$set": {
                 "adk_analysis": sanitized_response,
-                "adk_timestamp": datetime.datetime.utcnow()
+                "summary": summary,
+                "adk_timestamp": now,
+                "analyzed_at": now
             }}
         )
         
@@ -149,3 +278,402 @@ def save_adk_analysis(startup_name, adk_response):
     except Exception as e:
         print(f"Error saving ADK analysis: {e}")
         return None
+
+def get_latest_adk_analysis(startup_name):
+    """
+    Loads the most recent stored ADK analysis for a startup.
+
+    Args:
+        startup_name (str): The name of the startup.
+
+    Returns:
+        dict: The sanitized ADK analysis, or None if none is stored.
+    """
+    db = get_db()
+    if db is None:
+        return None
+
+    try:
+        startup = db.startups.find_one(
+            {"startup_name": startup_name, "adk_analysis": {"$exists": True}},
+            {"adk_analysis": 1},
+            sort=[("adk_timestamp", DESCENDING)],
+        )
+        if startup:
+            return startup["adk_analysis"]
+
+        analysis = db.adk_analyses.find_one(
+            {"startup_name": startup_name},
+            {"adk_analysis": 1},
+            sort=[("analysis_timestamp", DESCENDING)],
+        )
+        return analysis["adk_analysis"] if analysis else None
+    except Exception as e:
+        print(f"Error loading ADK analysis for {startup_name}: {e}")
+        return None
+
+def save_adk_job(job):
+    """
+    Persists a newly submitted ADK analysis job to the 'adk_jobs' collection.
+
+    Args:
+        job (dict): The job document; its "_id" is the job ID.
+
+    Returns:
+        The job ID, or None if the job could not be saved.
+    """
+    db = get_db()
+    if db is None:
+        return None
+
+    try:
+        result = db.adk_jobs.insert_one(job)
+        return result.inserted_id
+    except Exception as e:
+        print(f"Error saving ADK job: {e}")
+        return None
+
+def update_adk_job(job_id, fields):
+    """
+    Updates status, progress or result fields of an ADK analysis job.
+
+    A large raw result is stored as a blob; get_adk_job loads it back.
+
+    Args:
+        job_id (str): The job ID.
+        fields (dict): Fields to set on the job document.
+    """
+    db = get_db()
+    if db is None:
+        return
+
+    try:
+        fields = offload_text_field(db, dict(fields), "result", "adk_raw_response")
+        db.adk_jobs.update_one({"_id": job_id}, {"$set": fields})
+    except Exception as e:
+        print(f"Error updating ADK job {job_id}: {e}")
+
+def get_adk_job(job_id):
+    """
+    Loads an ADK analysis job by ID.
+
+    Returns:
+        The job document, or None if it does not exist or MongoDB is unavailable.
+    """
+    db = get_db()
+    if db is None:
+        return None
+
+    try:
+        job = db.adk_jobs.find_one({"_id": job_id})
+        if job is not None and "result_blob" in job:
+            job["result"] = load_text_field(db, job, "result")
+            del job["result_blob"]
+        return job
+    except Exception as e:
+        print(f"Error loading ADK job {job_id}: {e}")
+        return None
+
+def touch_adk_jobs(job_ids, heartbeat_at):
+    """
+    Records that the process running these ADK jobs is still alive.
+
+    Args:
+        job_ids (list[str]): IDs of the unfinished jobs the process owns.
+        heartbeat_at (datetime): The heartbeat time to store.
+    """
+    db = get_db()
+    if db is None:
+        return
+
+    try:
+        db.adk_jobs.update_many({"_id": {"$in": list(job_ids)}}, {"$set": {"heartbeat_at": heartbeat_at}})
+    except Exception as e:
+        print(f"Error updating ADK job heartbeats: {e}")
+
+def fail_stale_adk_job(job, fields):
+    """
+    Marks an unfinished ADK job as failed unless its owner has since updated it.
+
+    The update only matches if the job's status and heartbeat are unchanged
+    from the given snapshot, so a live worker is never overwritten.
+
+    Args:
+        job (dict): The job document as loaded by get_adk_job.
+        fields (dict): Failure fields to set on the job.
+
+    Returns:
+        bool: True if the job was marked as failed.
+    """
+    db = get_db()
+    if db is None:
+        return False
+
+    try:
+        result = db.adk_jobs.update_one(
+            {"_id": job["_id"], "status": job["status"], "heartbeat_at": job.get("heartbeat_at")},
+            {"$set": fields},
+        )
+        return result.modified_count == 1
+    except Exception as e:
+        print(f"Error failing ADK job {job['_id']}: {e}")
+        return False
+
+def register_batch_items(batch_id, items):
+    """
+    Records the startups of a batch run in the 'batch_items' collection.
+
+    Items that are already recorded keep their progress, so re-registering a
+    manifest after a crash resumes it instead of starting over.
+
+    Args:
+        batch_id (str): The batch run ID.
+        items (list[dict]): Manifest entries with "startup_name" and "documents".
+
+    Returns:
+        list[dict]: The checkpoint documents of the batch, or None if MongoDB
+        is unavailable.
+    """
+    db = get_db()
+    if db is None:
+        return None
+
+    try:
+        now = datetime.datetime.utcnow()
+        for item in items:
+            db.batch_items.update_one(
+                {"_id": batch_item_id(batch_id, item["startup_name"])},
+                {"$setOnInsert": {
+                    "batch_id": batch_id,
+                    "startup_name": item["startup_name"],
+                    "documents": item["documents"],
+                    "status": "pending",
+                    "attempts": 0,
+                    "error": None,
+                    "created_at": now,
+                    "updated_at": now,
+                }},
+                upsert=True,
+            )
+        return list(db.batch_items.find({"batch_id": batch_id}).sort("created_at", ASCENDING))
+    except Exception as e:
+        print(f"Error registering batch {batch_id}: {e}")
+        return None
+
+def batch_item_id(batch_id, startup_name):
+    """Returns the checkpoint document ID of a startup within a batch."""
+    return f"{batch_id}:{' '.join(startup_name.lower().split())}"
+
+def update_batch_item(item_id, fields):
+    """
+    Checkpoints the progress of one startup in a batch run.
+
+    Args:
+        item_id (str): The checkpoint document ID.
+        fields (dict): Fields to set, e.g. status, startup_id or error.
+    """
+    db = get_db()
+    if db is None:
+        return
+
+    try:
+        fields = dict(fields, updated_at=datetime.datetime.utcnow())
+        db.batch_items.update_one({"_id": item_id}, {"$set": fields})
+    except Exception as e:
+        print(f"Error updating batch item {item_id}: {e}")
+
+def name_key(startup_name):
+    """Normalizes a startup name for indexed, case-insensitive prefix search."""
+    return " ".join(startup_name.lower().split())
+
+def analysis_summary(adk_analysis=None, gemini_analysis=None):
+    """
+    Builds the small summary stored next to an analysis for history queries.
+
+    The ADK analysis is preferred; the Gemini analysis only provides a
+    recommendation until the ADK analysis exists.
+
+    Returns:
+        dict: recommendation, overall_score (float or None) and sector.
+    """
+    summary = {"recommendation": None, "overall_score": None, "sector": None}
+    if isinstance(gemini_analysis, dict):
+        summary["recommendation"] = gemini_analysis.get("overall_investment_recommendation") or None
+
+    if isinstance(adk_analysis, dict):
+        investment_summary = adk_analysis.get("investment_summary") or {}
+        if isinstance(investment_summary, dict):
+            summary["recommendation"] = investment_summary.get("investment_recommendation") or summary["recommendation"]
+            try:
+                summary["overall_score"] = float(investment_summary.get("overall_score"))
+            except (TypeError, ValueError):
+                pass
+        competitive = adk_analysis.get("competitive_analysis") or {}
+        if isinstance(competitive, dict):
+            sector = competitive.get("sector")
+            summary["sector"] = sector if sector and sector not in ("string", "Not Available") else None
+    return summary
+
+def _history_query(filters, cursor):
+    query = {}
+    if filters.get("recommendation"):
+        query["summary.recommendation"] = filters["recommendation"]
+    if filters.get("sector"):
+        query["summary.sector"] = filters["sector"]
+    score = {}
+    if filters.get("min_score") is not None:
+        score["$gte"] = filters["min_score"]
+    if filters.get("max_score") is not None:
+        score["$lte"] = filters["max_score"]
+    if score:
+        query["summary.overall_score"] = score
+    analyzed_at = {}
+    if filters.get("date_from"):
+        analyzed_at["$gte"] = filters["date_from"]
+    if filters.get("date_to"):
+        analyzed_at["$lt"] = filters["date_to"]
+    # Analyses saved before the history fields existed are listed once backfilled
+    query["analyzed_at"] = analyzed_at or {"$exists": True}
+    if filters.get("name_prefix"):
+        # An anchored, case-sensitive regex on the normalized key uses the index
+        query["name_key"] = {"$regex": "^" + re.escape(name_key(filters["name_prefix"]))}
+
+    if cursor is not None:
+        # Keyset pagination: everything after the last row of the previous page
+        last_at, last_id = cursor
+        after = {"$or": [
+            {"analyzed_at": {"$lt": last_at}},
+            {"analyzed_at": last_at, "_id": {"$lt": last_id}},
+        ]}
+        query = {"$and": [query, after]}
+    return query
+
+def encode_history_cursor(row):
+    """Returns the opaque cursor for the page that follows a history row."""
+    return f"{row['analyzed_at'].isoformat()}|{row['_id']}"
+
+def decode_history_cursor(cursor):
+    last_at, last_id = cursor.split("|", 1)
+    return datetime.datetime.fromisoformat(last_at), ObjectId(last_id)
+
+def list_analyses(filters=None, cursor=None, page_size=HISTORY_PAGE_SIZE):
+    """
+    Lists stored analyses, newest first, from 'startups' and 'adk_analyses'.
+
+    Only the summary fields are read, so a page costs a few KB however large
+    the analyses are.
+
+    Args:
+        filters (dict): Any of recommendation, sector, min_score, max_score,
+            date_from, date_to (datetimes, date_to exclusive) and name_prefix.
+        cursor (str): next_cursor of the previous page; None for the first page.
+        page_size (int): Rows per page.
+
+    Returns:
+        tuple: (rows, next_cursor). Each row has _id, source ("startups" or
+        "adk_analyses"), startup_name, summary and analyzed_at; next_cursor is
+        None on the last page. Returns ([], None) if MongoDB is unavailable.
+    """
+    db = get_db()
+    if db is None:
+        return [], None
+
+    try:
+        query = _history_query(filters or {}, decode_history_cursor(cursor) if cursor else None)
+        projection = {"startup_name": 1, "summary": 1, "analyzed_at": 1}
+        sort = [("analyzed_at", DESCENDING), ("_id", DESCENDING)]
+        rows = []
+        for collection in (db.startups, db.adk_analyses):
+            for row in collection.find(query, projection).sort(sort).limit(page_size + 1):
+                row["source"] = collection.name
+                rows.append(row)
+
+        rows.sort(key=lambda row: (row["analyzed_at"], row["_id"]), reverse=True)
+        next_cursor = encode_history_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size], next_cursor
+    except Exception as e:
+        print(f"Error listing analyses: {e}")
+        return [], None
+
+def get_history_facets():
+    """
+    Returns the recommendations and sectors present in stored analyses.
+
+    Returns:
+        dict: "recommendations" and "sectors" as sorted lists.
+    """
+    db = get_db()
+    if db is None:
+        return {"recommendations": [], "sectors": []}
+
+    try:
+        facets = {}
+        for name, field in (("recommendations", "summary.recommendation"), ("sectors", "summary.sector")):
+            values = set(db.startups.distinct(field)) | set(db.adk_analyses.distinct(field))
+            facets[name] = sorted(value for value in values if value)
+        return facets
+    except Exception as e:
+        print(f"Error loading analysis facets: {e}")
+        return {"recommendations": [], "sectors": []}
+
+def get_analysis_record(source, record_id):
+    """
+    Loads one stored analysis for display, without the extracted text.
+
+    Args:
+        source (str): "startups" or "adk_analyses", as returned by list_analyses.
+        record_id: The document ID.
+
+    Returns:
+        dict, or None if it is not found.
+    """
+    if source not in ("startups", "adk_analyses"):
+        return None
+    db = get_db()
+    if db is None:
+        return None
+
+    try:
+        return db[source].find_one(
+            {"_id": record_id},
+            {"original_extracted_text": 0, "original_extracted_text_blob": 0},
+        )
+    except Exception as e:
+        print(f"Error loading analysis {record_id}: {e}")
+        return None
+
+def backfill_analysis_summaries():
+    """
+    Adds the history fields (analyzed_at, name_key, summary) to analyses
+    saved before they existed.
+
+    Returns:
+        int: The number of documents updated.
+    """
+    db = get_db()
+    if db is None:
+        return 0
+
+    updated = 0
+    projection = {
+        "startup_name": 1,
+        "timestamp": 1,
+        "adk_timestamp": 1,
+        "analysis_timestamp": 1,
+        "gemini_analysis.overall_investment_recommendation": 1,
+        "adk_analysis.investment_summary": 1,
+        "adk_analysis.competitive_analysis.sector": 1,
+    }
+    try:
+        for collection in (db.startups, db.adk_analyses):
+            for doc in collection.find({"analyzed_at": {"$exists": False}}, projection):
+                analyzed_at = doc.get("adk_timestamp") or doc.get("analysis_timestamp") or doc.get("timestamp") or doc["_id"].generation_time.replace(tzinfo=None)
+                collection.update_one({"_id": doc["_id"]}, {"$set": {
+                    "analyzed_at": analyzed_at,
+                    "name_key": name_key(doc.get("startup_name") or ""),
+                    "summary": analysis_summary(doc.get("adk_analysis"), doc.get("gemini_analysis")),
+                }})
+                updated += 1
+    except Exception as e:
+        print(f"Error backfilling analysis summaries: {e}")
+    return updated
@@ -0,0 +1,209 @@
+"""
+Content-addressed cache for text extracted from uploaded documents.
+
+Entries are keyed by the SHA-256 of the file bytes plus the extractor version,
+so re-uploading the same pitch deck skips OCR entirely. Lookups go to a local
+disk tier first and then to a shared MongoDB tier; hits in MongoDB are copied
+back to disk. Both tiers expire an entry once it has gone unused for
+CACHE_TTL_SECONDS (an idle TTL), so a deck that keeps being re-uploaded stays
+cached.
+"""
+import os
+import json
+import time
+import hashlib
+import datetime
+import threading
+from .db import get_db
+
+CACHE_DIR = os.path.expanduser(
+    os.getenv("EXTRACTION_CACHE_DIR", os.path.join("~", ".cache", "resolutes", "extraction"))
+)
+CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+DISK_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+MONGO_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MONGO_MAX_ENTRIES", "5000"))
+MONGO_ENABLED = os.getenv("EXTRACTION_CACHE_MONGO", "1") != "0"
+
+_COLLECTION = "extraction_cache"
+_disk_lock = threading.Lock()
+_indexes_ready = False
+
+
+def cache_key(file_bytes, extractor_version):
+    """
+    Builds the cache key for a file.
+
+    Args:
+        file_bytes (bytes): Raw bytes of the uploaded file.
+        extractor_version (str): Version of the extraction pipeline.
+
+    Returns:
+        str: Hex digest identifying the file contents and extractor.
+    """
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{extractor_version}-{digest}"
+
+
+def get_cached_text(key):
+    """
+    Looks up previously extracted text, trying disk first and then MongoDB.
+
+    Returns:
+        The cached text, or None on a miss.
+    """
+    text = _disk_get(key)
+    if text is not None:
+        return text
+
+    text = _mongo_get(key)
+    if text is not None:
+        _disk_put(key, text)
+    return text
+
+
+def put_cached_text(key, text):
+    """
+    Stores extracted text in both cache tiers.
+    """
+    _disk_put(key, text)
+    _mongo_put(key, text)
+
+
+# ---------------------------------------------------------------------------
+# Disk tier: one JSON file per entry, file mtime tracks last access for the
+# idle TTL and LRU eviction.
+# ---------------------------------------------------------------------------
+
+def _disk_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def _disk_get(key):
+    path = _disk_path(key)
+    try:
+        if time.time() - os.stat(path).st_mtime > CACHE_TTL_SECONDS:
+            _remove_quietly(path)
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return entry.get("text")
+
+
+def _disk_put(key, text):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "text": text}, f)
+        os.replace(tmp_path, path)
+        _disk_evict()
+    except OSError as e:
+        print(f"Extraction cache disk write failed: {e}")
+
+
+def _disk_evict():
+    """Removes expired entries, then least recently used ones over the size cap."""
+    with _disk_lock:
+        now = time.time()
+        entries = []
+        total = 0
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > CACHE_TTL_SECONDS:
+                _remove_quietly(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= DISK_MAX_BYTES:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            _remove_quietly(path)
+            total -= size
+            if total <= DISK_MAX_BYTES * 0.9:
+                break
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# MongoDB tier: shared across instances, a TTL index on last_accessed expires
+# idle entries and a size cap trims the least recently used ones.
+# ---------------------------------------------------------------------------
+
+def _mongo_collection():
+    global _indexes_ready
+    if not MONGO_ENABLED:
+        return None
+    try:
+        db = get_db()
+    except ValueError:
+        return None
+    if db is None:
+        return None
+
+    collection = db[_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index("last_accessed", expireAfterSeconds=CACHE_TTL_SECONDS)
+        _indexes_ready = True
+    return collection
+
+
+def _mongo_get(key):
+    try:
+        collection = _mongo_collection()
+        if collection is None:
+            return None
+        entry = collection.find_one_and_update(
+            {"_id": key},
+            {"$set": {"last_accessed": datetime.datetime.utcnow()}},
+            projection={"text": 1},
+        )
+        return entry["text"] if entry else None
+    except Exception as e:
+        print(f"Extraction cache lookup failed: {e}")
+        return None
+
+
+def _mongo_put(key, text):
+    try:
+        collection = _mongo_collection()
+        if collection is None:
+            return
+        now = datetime.datetime.utcnow()
+        collection.update_one(
+            {"_id": key},
+            {
+                "$set": {"text": text, "size": len(text), "last_accessed": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+
+        overflow = collection.estimated_document_count() - MONGO_MAX_ENTRIES
+        if overflow > 0:
+            stale = collection.find({}, {"_id": 1}).sort("last_accessed", 1).limit(overflow)
+            collection.delete_many({"_id": {"$in": [doc["_id"] for doc in stale]}})
+    except Exception as e:
+        print(f"Extraction cache write failed: {e}")
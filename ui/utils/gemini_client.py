@@ -1,93 +1,350 @@
 import os
 import json
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core import exceptions as google_exceptions
+from vertexai.generative_models import GenerationConfig
+from .clients import get_generative_model
+from .json_recovery import extract_json, RECOVERY_REPAIRED
 
-def get_gemini_analysis(startup_name, extracted_text):
+GEMINI_MODEL = "gemini-2.5-flash"
+
+MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+BACKOFF_BASE_SECONDS = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", "30"))
+# Quota errors clear more slowly than dropped connections
+QUOTA_BACKOFF_MULTIPLIER = 4
+
+# Texts estimated above MAX_SINGLE_PASS_TOKENS are split into chunks of at most
+# CHUNK_TOKENS, analyzed in parallel and merged by a final reduce call.
+MAX_SINGLE_PASS_TOKENS = int(os.getenv("GEMINI_MAX_SINGLE_PASS_TOKENS", "30000"))
+CHUNK_TOKENS = int(os.getenv("GEMINI_CHUNK_TOKENS", "12000"))
+MAP_WORKERS = int(os.getenv("GEMINI_MAP_WORKERS", "4"))
+# Rough characters-per-token ratio for English prose; avoids a count_tokens round trip
+CHARS_PER_TOKEN = 4
+
+FAILURE_QUOTA = "quota"
+FAILURE_TRANSIENT = "transient"
+FAILURE_MALFORMED = "malformed"
+FAILURE_FATAL = "fatal"
+
+_QUOTA_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)
+_TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.Aborted,
+    ConnectionError,
+    TimeoutError,
+)
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "calls": 0,
+    "model_requests": 0,
+    "succeeded": 0,
+    "failed": 0,
+    "repaired_locally": 0,
+    "retries": {FAILURE_QUOTA: 0, FAILURE_TRANSIENT: 0, FAILURE_MALFORMED: 0},
+    "fatal_errors": 0,
+    "backoff_seconds": 0.0,
+}
+
+class MalformedOutputError(ValueError):
+    """Raised when a model response is not JSON and cannot be repaired."""
+
+def get_retry_metrics():
+    """Returns a snapshot of the Gemini call and retry counters for this process."""
+    with _metrics_lock:
+        return dict(_metrics, retries=dict(_metrics["retries"]))
+
+def _count(name, amount=1):
+    with _metrics_lock:
+        _metrics[name] += amount
+
+def _count_retry(failure):
+    with _metrics_lock:
+        _metrics["retries"][failure] += 1
+
+def classify_failure(error):
     """
-    Analyzes startup text with Gemini Pro and returns a structured JSON object.
+    Sorts a failed Gemini call into quota, transient, malformed or fatal.
 
-    Args:
-        startup_name (str): The name of the startup.
-        team_name (str): The name of the team.
-        extracted_text (str): The combined text from uploaded documents.
+    Quota and transient failures are retried after a backoff; malformed output
+    is regenerated immediately; fatal errors (bad request, auth, config) are
+    not retried.
+    """
+    if isinstance(error, MalformedOutputError):
+        return FAILURE_MALFORMED
+    if isinstance(error, _QUOTA_ERRORS):
+        return FAILURE_QUOTA
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return FAILURE_TRANSIENT
+    return FAILURE_FATAL
+
+def backoff_seconds(attempt, failure):
+    """Exponential backoff with full jitter for the given (1-based) attempt."""
+    ceiling = BACKOFF_BASE_SECONDS * (2 ** (attempt - 1))
+    if failure == FAILURE_QUOTA:
+        ceiling *= QUOTA_BACKOFF_MULTIPLIER
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, ceiling))
+
+def parse_json_response(text):
+    """
+    Parses a model's JSON answer, repairing it locally if needed.
 
     Returns:
-        A dictionary with the startup analysis, or None if an error occurs.
+        tuple: (parsed JSON value, True if it had to be repaired).
+
+    Raises:
+        MalformedOutputError: If the text is not JSON and cannot be repaired.
     """
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-    location = os.getenv("GOOGLE_CLOUD_LOCATION")
+    value, status = extract_json(text)
+    if status is None:
+        raise MalformedOutputError(f"Unparseable model output: {text.strip()[:200]!r}")
+    return value, status == RECOVERY_REPAIRED
 
-    if not project_id or not location:
-        raise ValueError("GOOGLE_CLOUD_PROJECT and GOOGLE_CLOUD_LOCATION environment variables must be set.")
+def generate_json(model, prompt, generation_config):
+    """
+    Calls Gemini and returns its parsed JSON answer under the retry policy.
 
-    vertexai.init(project=project_id, location=location)
+    Quota and transient errors are retried with exponential backoff and
+    jitter, malformed output is repaired locally and only regenerated when
+    repair fails, and fatal errors are not retried.
 
-    model = GenerativeModel("gemini-2.5-flash")
+    Returns:
+        The parsed JSON value, or None if every attempt failed.
+    """
+    _count("calls")
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            _count("model_requests")
+            response = model.generate_content(prompt, generation_config=generation_config)
+            try:
+                text = response.text
+            except ValueError as e:
+                # No text candidate (blocked or empty); asking again may succeed
+                raise MalformedOutputError(str(e))
 
-    prompt = f"""
-    Analyze the following information about a startup and generate a JSON object with the specified schema.
-    The output MUST be a valid JSON object, without any markdown code fences or other text.
+            result, repaired = parse_json_response(text)
+            if repaired:
+                _count("repaired_locally")
+                print("Repaired malformed Gemini JSON locally")
+            _count("succeeded")
+            return result
+        except Exception as e:
+            failure = classify_failure(e)
+            if failure == FAILURE_FATAL:
+                _count("fatal_errors")
+                print(f"Gemini call failed with a non-retryable error: {e}")
+                break
+            if attempt == MAX_ATTEMPTS:
+                print(f"Gemini call failed after {attempt} attempts: {e}")
+                break
 
-    Startup Name: {startup_name}
-    
-    Extracted Text from documents:
-    ---
-    {extracted_text}
-    ---
+            _count_retry(failure)
+            delay = 0 if failure == FAILURE_MALFORMED else backoff_seconds(attempt, failure)
+            print(f"Gemini {failure} failure: {e}. Retrying in {delay:.1f}s...")
+            if delay:
+                _count("backoff_seconds", delay)
+                time.sleep(delay)
 
-    JSON Schema to follow:
-    {{
-      "startup_name": "{startup_name}",
+    _count("failed")
+    return None
+
+def estimate_tokens(text):
+    """Estimates the token count of a text without calling the API."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def chunk_text(text, max_tokens=CHUNK_TOKENS):
+    """
+    Splits text into chunks of at most max_tokens (estimated).
+
+    Chunks break at paragraph boundaries where possible, then at line
+    boundaries, and only split inside a line that is itself over budget.
+
+    Returns:
+        list[str]: The chunks, in document order.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for paragraph in text.split("\n\n"):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.split("\n"):
+            pieces.extend(line[i:i + max_chars] for i in range(0, max(len(line), 1), max_chars))
+
+    chunks = []
+    current = []
+    current_chars = 0
+    for piece in pieces:
+        if current and current_chars + len(piece) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_chars = 0
+        current.append(piece)
+        current_chars += len(piece) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+ANALYSIS_SCHEMA = """{
+      "startup_name": "The startup name given with the documents.",
       "summary": "A concise summary of the startup.",
-      "founder_profile": {{
+      "founder_profile": {
         "founders": [
-          {{
+          {
             "name": "Founder's Name",
             "background": "Founder's relevant background and experience.",
             "commitment_level": "e.g., Full-time, Part-time",
             "capital_invested": "Amount of capital invested by the founder."
-          }}
+          }
         ],
         "team_strengths": "Strengths of the founding team.",
         "red_flags": "Any red flags regarding the team."
-      }},
-      "problem_and_market": {{
+      },
+      "problem_and_market": {
         "problem_statement": "The problem the startup is solving.",
         "market_size": "The size of the target market.",
         "competitors": ["List of competitors"],
         "differentiator": "What makes the startup unique."
-      }},
-      "traction_and_financials": {{
+      },
+      "traction_and_financials": {
         "revenue": "Current revenue figures.",
         "growth_rate": "Growth rate of the startup.",
         "key_metrics": ["Key performance indicators"],
         "funding_history": "History of funding rounds."
-      }},
+      },
       "risk_factors": ["Potential risks for the startup"],
       "overall_investment_recommendation": "A recommendation for investment (e.g., 'High Potential', 'Needs More Data', 'Risky').",
       "confidence_score": 0.0
-    }}
+    }"""
+
+# Static instructions go in the system instruction, ahead of the per-startup
+# text, so the identical prefix can be served from the context cache.
+ANALYSIS_INSTRUCTION = f"""
+    Analyze the information about a startup provided in the request and generate a JSON object with the specified schema.
+    The output MUST be a valid JSON object, without any markdown code fences or other text.
+
+    JSON Schema to follow:
+    {ANALYSIS_SCHEMA}
     """
 
+MAP_INSTRUCTION = f"""
+    You receive one excerpt of the documents about a startup.
+    Extract ONLY the facts stated in this excerpt into a JSON object with the schema below.
+    Leave string fields empty and lists empty when the excerpt does not cover them; do not guess.
+    Skip "summary", "overall_investment_recommendation" and "confidence_score"; they are written later from all excerpts.
+    The output MUST be a valid JSON object, without any markdown code fences or other text.
+
+    JSON Schema to follow:
+    {ANALYSIS_SCHEMA}
+    """
+
+REDUCE_INSTRUCTION = f"""
+    You receive JSON objects extracted from consecutive excerpts of the documents about a startup.
+    Merge them into ONE JSON object following the schema: combine founders, competitors, metrics and risks without duplicates,
+    and prefer the most specific figure when excerpts disagree. Then write the summary, the overall investment recommendation
+    and the confidence score from the combined facts.
+    The output MUST be a valid JSON object, without any markdown code fences or other text.
+
+    JSON Schema to follow:
+    {ANALYSIS_SCHEMA}
+    """
+
+# Models created by clients.warm_up before the first analysis
+WARM_UP_MODELS = [(GEMINI_MODEL, ANALYSIS_INSTRUCTION)]
+
+def get_gemini_analysis(startup_name, extracted_text):
+    """
+    Analyzes startup text with Gemini Pro and returns a structured JSON object.
+
+    Texts too long for a single useful prompt are analyzed with
+    map_reduce_analysis instead.
+
+    Args:
+        startup_name (str): The name of the startup.
+        team_name (str): The name of the team.
+        extracted_text (str): The combined text from uploaded documents.
+
+    Returns:
+        A dictionary with the startup analysis, or None if an error occurs.
+    """
     generation_config = GenerationConfig(
         response_mime_type="application/json",
     )
 
-    for _ in range(3):  # Retry up to 3 times
-        try:
-            response = model.generate_content(prompt, generation_config=generation_config)
-            
-            # Clean up the response text before parsing
-            cleaned_response_text = response.text.strip()
-            if cleaned_response_text.startswith("```json"):
-                cleaned_response_text = cleaned_response_text[7:-3].strip()
-
-            gemini_json = json.loads(cleaned_response_text)
-            return gemini_json
-        except (json.JSONDecodeError, Exception) as e:
-            print(f"Error parsing Gemini response: {e}")
-            print("Retrying...")
-            continue
+    if estimate_tokens(extracted_text) > MAX_SINGLE_PASS_TOKENS:
+        return map_reduce_analysis(startup_name, extracted_text, generation_config)
+    return single_pass_analysis(startup_name, extracted_text, generation_config)
+
+def single_pass_analysis(startup_name, extracted_text, generation_config):
+    """
+    Analyzes the whole text in one call.
+
+    Returns:
+        A dictionary with the startup analysis, or None if an error occurs.
+    """
+    # Initialized once per process; raises ValueError if the project is not configured
+    model = get_generative_model(GEMINI_MODEL, ANALYSIS_INSTRUCTION)
+
+    prompt = f"""
+    Startup Name: {startup_name}
     
-    return None
+    Extracted Text from documents:
+    ---
+    {extracted_text}
+    ---
+    """
+
+    return generate_json(model, prompt, generation_config)
+
+def map_reduce_analysis(startup_name, extracted_text, generation_config):
+    """
+    Analyzes a long text in two steps: each chunk is mined for the schema's
+    facts in parallel (map), then one call merges the partial results into the
+    full startup schema (reduce). The reduce prompt only carries the compact
+    partial results, so its size no longer grows with the documents.
+
+    Returns:
+        A dictionary with the startup analysis, or None if an error occurs.
+    """
+    chunks = chunk_text(extracted_text)
+    if not chunks:
+        # Nothing but whitespace to split; there is nothing to map over
+        return single_pass_analysis(startup_name, extracted_text.strip(), generation_config)
+    map_model = get_generative_model(GEMINI_MODEL, MAP_INSTRUCTION)
+    print(f"Analyzing {len(chunks)} chunks of ~{CHUNK_TOKENS} tokens for {startup_name}")
+
+    def map_chunk(indexed_chunk):
+        index, chunk = indexed_chunk
+        prompt = f"""
+    Startup Name: {startup_name}
+
+    Excerpt {index} of {len(chunks)}:
+    ---
+    {chunk}
+    ---
+    """
+        return generate_json(map_model, prompt, generation_config)
+
+    with ThreadPoolExecutor(max_workers=min(MAP_WORKERS, len(chunks)), thread_name_prefix="gemini-map") as executor:
+        partials = [partial for partial in executor.map(map_chunk, enumerate(chunks, start=1)) if partial]
+
+    if not partials:
+        return None
+    if len(partials) < len(chunks):
+        print(f"{len(chunks) - len(partials)} of {len(chunks)} chunks failed; merging the rest")
+
+    prompt = f"""
+    Startup Name: {startup_name}
+
+    Partial extractions:
+    {json.dumps(partials, separators=(",", ":"))}
+    """
+    return generate_json(get_generative_model(GEMINI_MODEL, REDUCE_INSTRUCTION), prompt, generation_config)
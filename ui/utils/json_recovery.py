@@ -0,0 +1,301 @@
+import re
+import json
+
+# Recovers the JSON value embedded in model output: markdown fences, prose
+# before or after the value, trailing commas and output cut off mid-value.
+# The scanner jumps between structural characters with compiled regexes, so
+# long string values are skipped at C speed, and it accepts the text in
+# chunks so a streamed response can be scanned as it arrives.
+
+RECOVERY_COMPLETE = "complete"
+RECOVERY_REPAIRED = "repaired"
+
+# Prose may contain stray brackets before the real value; give up after this many restarts
+MAX_START_CANDIDATES = 5
+
+# A complete string literal in one match, or a single structural character
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_VALUE_START = re.compile(r'[{\[]')
+_OBJECT_START = re.compile(r'\{')
+_decoder = json.JSONDecoder()
+
+class IncrementalJSONExtractor:
+    """
+    Finds the first top-level JSON object or array in text fed in chunks.
+
+    Usage:
+        extractor = IncrementalJSONExtractor()
+        for chunk in stream:
+            if extractor.feed(chunk):
+                break  # the value is complete
+        value, status = extractor.result()
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._length = 0
+        self._start = None
+        self._end = None
+        self._stack = ""
+        self._in_string = False
+        self._escape_pending = False
+        # (offset, open brackets) at the last comma, to cut a truncated tail back to
+        self._last_comma = None
+        self._value_end = None
+
+    @property
+    def complete(self):
+        """True once the top-level value has been closed."""
+        return self._end is not None
+
+    def feed(self, chunk):
+        """
+        Scans the next chunk of text.
+
+        Returns:
+            bool: True if the top-level value is complete.
+        """
+        base = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._end is None:
+            self._scan(chunk, base)
+        return self._end is not None
+
+    @property
+    def value_end(self):
+        """Offset just past the value last returned by result(), or None if it was truncated."""
+        return self._value_end
+
+    def text(self):
+        """Returns all text fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def result(self):
+        """
+        Parses the value found so far, repairing it if it is malformed or
+        truncated.
+
+        Returns:
+            tuple: (value, RECOVERY_COMPLETE or RECOVERY_REPAIRED), or
+            (None, None) if the text holds no recoverable JSON value.
+        """
+        value, status = self._parse()
+        if status is not None or self._start is None:
+            self._value_end = self._end
+            return value, status
+
+        # The bracket we started at may have been prose, e.g. "[1]"; try the next ones
+        text = self.text()
+        for index, match in enumerate(_VALUE_START.finditer(text, self._start + 1)):
+            if index == MAX_START_CANDIDATES:
+                break
+            extractor = IncrementalJSONExtractor()
+            extractor.feed(text[match.start():])
+            value, status = extractor._parse()
+            if status is not None:
+                self._value_end = match.start() + extractor._end if extractor._end is not None else None
+                return value, status
+        return None, None
+
+    def _parse(self):
+        if self._start is None:
+            return None, None
+        text = self.text()
+        if self._end is not None:
+            try:
+                return json.loads(text[self._start:self._end]), RECOVERY_COMPLETE
+            except json.JSONDecodeError:
+                return _repaired(repair_json(text[self._start:self._end]))
+
+        # Truncated: close what the scan left open, or cut back to the last member
+        body = text[self._start:]
+        candidates = [(body + '"') if self._in_string else body.rstrip().rstrip(",")]
+        closers = [_closers(self._stack)]
+        if self._last_comma is not None:
+            offset, stack = self._last_comma
+            candidates.append(text[self._start:offset])
+            closers.append(_closers(stack))
+        for candidate, closer in zip(candidates, closers):
+            try:
+                return json.loads(candidate + closer), RECOVERY_REPAIRED
+            except json.JSONDecodeError:
+                continue
+        return _repaired(repair_json(body))
+
+    def _scan(self, chunk, base):
+        pos = 0
+        if self._escape_pending:
+            self._escape_pending = False
+            pos = 1
+        if self._in_string:
+            pos = self._skip_string(chunk, pos)
+            if pos is None:
+                return
+
+        if self._start is None:
+            match = _VALUE_START.search(chunk, pos)
+            if match is None:
+                return
+            self._start = base + match.start()
+            self._stack = chunk[match.start()]
+            pos = match.end()
+
+        for match in _TOKEN.finditer(chunk, pos):
+            char = match.group()
+            if len(char) > 1:
+                continue  # a complete string literal
+            if char == '"':
+                # A string that continues into the next chunk
+                self._in_string = True
+                self._skip_string(chunk, match.end())
+                return
+            if char == ",":
+                self._last_comma = (base + match.start(), self._stack)
+            elif char in "{[":
+                self._stack += char
+            else:
+                self._stack = self._stack[:-1]
+                if not self._stack:
+                    self._end = base + match.end()
+                    return
+
+    def _skip_string(self, chunk, pos):
+        """Moves past the end of the open string; returns None if it runs past the chunk."""
+        length = len(chunk)
+        while True:
+            match = _STRING_SPECIAL.search(chunk, pos)
+            if match is None:
+                return None
+            if match.group() == "\\":
+                if match.end() >= length:
+                    self._escape_pending = True
+                    return None
+                pos = match.end() + 1
+                continue
+            self._in_string = False
+            return match.end()
+
+
+def _closers(stack):
+    return "".join("}" if char == "{" else "]" for char in reversed(stack))
+
+def _repaired(value):
+    return (value, RECOVERY_REPAIRED) if value is not None else (None, None)
+
+def repair_json(text):
+    """
+    Repairs a malformed or truncated JSON value without another model call:
+    drops trailing commas and closes strings and brackets left open, falling
+    back to the last complete member when the tail is cut mid-member.
+
+    Args:
+        text (str): Text starting at the value's opening bracket.
+
+    Returns:
+        The parsed JSON value, or None if it cannot be repaired.
+    """
+    out = []
+    stack = []
+    in_string = escaped = False
+    # (output length, open brackets) after the last complete member
+    last_member_end = None
+    for char in text:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if not stack:
+                break
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            stack.pop()
+            out.append(char)
+            if not stack:
+                break
+            last_member_end = (len(out), list(stack))
+            continue
+        elif char == ",":
+            last_member_end = (len(out), list(stack))
+        out.append(char)
+
+    candidates = []
+    if in_string:
+        candidates.append("".join(out) + '"' + "".join(reversed(stack)))
+    else:
+        candidates.append("".join(out).rstrip().rstrip(",") + "".join(reversed(stack)))
+    if last_member_end is not None:
+        length, open_brackets = last_member_end
+        candidates.append("".join(out[:length]).rstrip().rstrip(",") + "".join(reversed(open_brackets)))
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def extract_json(text):
+    """
+    Extracts the first JSON object or array from model output.
+
+    Well-formed values are decoded directly by the C decoder; the scanner and
+    repair only run when that fails. A list followed by an object, as in
+    "see [1] below: {...}", is treated as prose and the object is returned.
+
+    Returns:
+        tuple: (value, RECOVERY_COMPLETE or RECOVERY_REPAIRED), or (None, None)
+        if the text holds no recoverable JSON value.
+    """
+    match = _VALUE_START.search(text)
+    if match is None:
+        return None, None
+    try:
+        value, end = _decoder.raw_decode(text, match.start())
+        status = RECOVERY_COMPLETE
+    except json.JSONDecodeError:
+        extractor = IncrementalJSONExtractor()
+        extractor.feed(text)
+        value, status = extractor.result()
+        end = extractor.value_end
+
+    if isinstance(value, list) and end is not None:
+        following = _object_after(text, end)
+        if following[1] is not None:
+            return following
+    return value, status
+
+def _object_after(text, pos):
+    """Returns the first JSON object starting at or after pos, repaired if truncated."""
+    for index, match in enumerate(_OBJECT_START.finditer(text, pos)):
+        if index == MAX_START_CANDIDATES:
+            break
+        try:
+            value = _decoder.raw_decode(text, match.start())[0]
+        except json.JSONDecodeError:
+            if index == 0:
+                # Possibly an object cut off at the end of the output
+                extractor = IncrementalJSONExtractor()
+                extractor.feed(text[match.start():])
+                value, status = extractor.result()
+                if isinstance(value, dict):
+                    return value, status
+            continue
+        return value, RECOVERY_COMPLETE
+    return None, None
@@ -9,63 +9,103 @@ from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 
+# Paragraph and table styles are built once at import and shared by every
+# render. reportlab only reads them while building a document, so one
+# generator can serve concurrent requests.
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    textColor=colors.darkblue
+)
+
+SECTION_STYLE = ParagraphStyle(
+    'SectionHeader',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=16,
+    spaceAfter=12,
+    spaceBefore=20,
+    textColor=colors.darkblue,
+    borderWidth=1,
+    borderColor=colors.darkblue,
+    borderPadding=5
+)
+
+SUBSECTION_STYLE = ParagraphStyle(
+    'SubsectionHeader',
+    parent=_SAMPLE_STYLES['Heading3'],
+    fontSize=14,
+    spaceAfter=8,
+    spaceBefore=12,
+    textColor=colors.blue
+)
+
+BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=11,
+    spaceAfter=6,
+    alignment=TA_JUSTIFY
+)
+
+METRICS_STYLE = ParagraphStyle(
+    'Metrics',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=10,
+    leftIndent=20,
+    spaceAfter=4
+)
+
+METADATA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+KEY_METRICS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+def _label_table_style(label_color):
+    """Two-column label/value table with a shaded label column."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), label_color),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTSIZE', (0, 0), (-1, -1), 10)
+    ])
+
+GREY_LABEL_TABLE_STYLE = _label_table_style(colors.lightgrey)
+BLUE_LABEL_TABLE_STYLE = _label_table_style(colors.lightblue)
+GREEN_LABEL_TABLE_STYLE = _label_table_style(colors.lightgreen)
+YELLOW_LABEL_TABLE_STYLE = _label_table_style(colors.lightyellow)
+CYAN_LABEL_TABLE_STYLE = _label_table_style(colors.lightcyan)
+
 class InvestmentReportGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
+        self.styles = _SAMPLE_STYLES
         self.setup_custom_styles()
     
     def setup_custom_styles(self):
         """Setup custom styles for the report"""
-        # Title style
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        )
-        
-        # Section header style
-        self.section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.darkblue,
-            borderWidth=1,
-            borderColor=colors.darkblue,
-            borderPadding=5
-        )
-        
-        # Subsection style
-        self.subsection_style = ParagraphStyle(
-            'SubsectionHeader',
-            parent=self.styles['Heading3'],
-            fontSize=14,
-            spaceAfter=8,
-            spaceBefore=12,
-            textColor=colors.blue
-        )
-        
-        # Body text style
-        self.body_style = ParagraphStyle(
-            'CustomBody',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            alignment=TA_JUSTIFY
-        )
-        
-        # Metrics style
-        self.metrics_style = ParagraphStyle(
-            'Metrics',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            leftIndent=20,
-            spaceAfter=4
-        )
+        self.title_style = TITLE_STYLE
+        self.section_style = SECTION_STYLE
+        self.subsection_style = SUBSECTION_STYLE
+        self.body_style = BODY_STYLE
+        self.metrics_style = METRICS_STYLE
 
     def safe_get(self, data, key, default="Not Available"):
         """Safely get data from nested dictionaries"""
@@ -107,15 +147,7 @@ class InvestmentReportGenerator:
         ]
         
         table = Table(metadata_table, colWidths=[2*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(METADATA_TABLE_STYLE)
         story.append(table)
         story.append(Spacer(1, 20))
         
@@ -132,15 +164,7 @@ class InvestmentReportGenerator:
             ]
             
             metrics_table = Table(key_metrics, colWidths=[2*inch, 4*inch])
-            metrics_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            metrics_table.setStyle(KEY_METRICS_TABLE_STYLE)
             story.append(metrics_table)
             story.append(Spacer(1, 15))
             
@@ -196,11 +220,7 @@ class InvestmentReportGenerator:
             ]
             
             table = Table(summary_data, colWidths=[2*inch, 4*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 0), (-1, -1), 10)
-            ]))
+            table.setStyle(GREY_LABEL_TABLE_STYLE)
             story.append(table)
             story.append(Spacer(1, 15))
         
@@ -248,11 +268,7 @@ class InvestmentReportGenerator:
             
             if assessment_data:
                 assessment_table = Table(assessment_data, colWidths=[2.5*inch, 1.5*inch])
-                assessment_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                assessment_table.setStyle(BLUE_LABEL_TABLE_STYLE)
                 story.append(assessment_table)
         
         story.append(PageBreak())
@@ -286,11 +302,7 @@ class InvestmentReportGenerator:
             
             if market_data_table:
                 table = Table(market_data_table, colWidths=[2.5*inch, 3.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                table.setStyle(GREY_LABEL_TABLE_STYLE)
                 story.append(table)
                 story.append(Spacer(1, 15))
         
@@ -331,11 +343,7 @@ class InvestmentReportGenerator:
             
             if opp_data:
                 opp_table = Table(opp_data, colWidths=[2.5*inch, 1.5*inch])
-                opp_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgreen),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                opp_table.setStyle(GREEN_LABEL_TABLE_STYLE)
                 story.append(opp_table)
         
         story.append(PageBreak())
@@ -371,11 +379,7 @@ class InvestmentReportGenerator:
             
             if funding_data:
                 table = Table(funding_data, colWidths=[2*inch, 4*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                table.setStyle(GREY_LABEL_TABLE_STYLE)
                 story.append(table)
                 story.append(Spacer(1, 15))
         
@@ -409,11 +413,7 @@ class InvestmentReportGenerator:
                 
                 if unit_data:
                     unit_table = Table(unit_data, colWidths=[2.5*inch, 2*inch])
-                    unit_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (0, -1), colors.lightyellow),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('FONTSIZE', (0, 0), (-1, -1), 10)
-                    ]))
+                    unit_table.setStyle(YELLOW_LABEL_TABLE_STYLE)
                     story.append(unit_table)
         
         story.append(PageBreak())
@@ -447,11 +447,7 @@ class InvestmentReportGenerator:
             
             if overview_data:
                 table = Table(overview_data, colWidths=[2*inch, 4*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                table.setStyle(GREY_LABEL_TABLE_STYLE)
                 story.append(table)
                 story.append(Spacer(1, 15))
         
@@ -473,11 +469,7 @@ class InvestmentReportGenerator:
             
             if feature_data:
                 feature_table = Table(feature_data, colWidths=[2*inch, 4*inch])
-                feature_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightcyan),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                feature_table.setStyle(CYAN_LABEL_TABLE_STYLE)
                 story.append(feature_table)
         
         story.append(PageBreak())
@@ -513,11 +505,7 @@ class InvestmentReportGenerator:
                 
                 if user_data:
                     user_table = Table(user_data, colWidths=[2*inch, 3*inch])
-                    user_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (0, -1), colors.lightgreen),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('FONTSIZE', (0, 0), (-1, -1), 10)
-                    ]))
+                    user_table.setStyle(GREEN_LABEL_TABLE_STYLE)
                     story.append(user_table)
                     story.append(Spacer(1, 10))
         
@@ -539,11 +527,7 @@ class InvestmentReportGenerator:
             
             if assessment_data:
                 assessment_table = Table(assessment_data, colWidths=[2.5*inch, 1.5*inch])
-                assessment_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightyellow),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10)
-                ]))
+                assessment_table.setStyle(YELLOW_LABEL_TABLE_STYLE)
                 story.append(assessment_table)
         
         story.append(PageBreak())
@@ -644,7 +628,13 @@ class InvestmentReportGenerator:
         buffer.seek(0)
         return buffer
 
+# Holds no per-report state, so one instance is shared by every caller
+_generator = InvestmentReportGenerator()
+
+def get_report_generator():
+    """Returns the shared, thread-safe report generator."""
+    return _generator
+
 def generate_investment_report_pdf(analysis_data, startup_name):
     """Main function to generate investment report PDF"""
-    generator = InvestmentReportGenerator()
-    return generator.generate_pdf(analysis_data, startup_name)
\ No newline at end of file
+    return _generator.generate_pdf(analysis_data, startup_name)
\ No newline at end of file
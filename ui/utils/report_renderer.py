@@ -0,0 +1,285 @@
+"""
+Process-pool rendering service for investment report PDFs.
+
+reportlab's doc.build is pure Python and holds the GIL, so rendering on the
+Streamlit thread blocks every session and a portfolio export uses one core.
+This module renders on a pool of worker processes instead. Finished PDFs are
+written to a disk cache keyed by the SHA-256 of the canonical analysis JSON,
+so an unchanged analysis is never rendered twice. Callers get file paths
+back and can stream them to disk or into a zip archive as they complete.
+The cache is pruned like the extraction cache: file mtime tracks last use,
+idle reports expire and the least recently used ones go over the size cap.
+
+By default the cache lives in the app's static folder, so Streamlit's static
+file serving (enabled in .streamlit/config.toml) serves the PDFs from the app
+origin with byte ranges. Streamlit disables static serving when the folder
+grows past 1 GB, which is why the default size cap stays below that.
+"""
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+APP_STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+CACHE_DIR = os.path.expanduser(os.getenv("REPORT_CACHE_DIR", os.path.join(APP_STATIC_DIR, "reports")))
+CACHE_TTL_SECONDS = int(os.getenv("REPORT_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(900 * 1024 * 1024)))
+MAX_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", str(os.cpu_count() or 2)))
+# Bump when the report layout changes so cached PDFs are re-rendered
+RENDERER_VERSION = "1"
+
+_executor = None
+_executor_lock = threading.Lock()
+_prune_lock = threading.Lock()
+
+
+def analysis_hash(analysis_data):
+    """
+    Returns the content hash that identifies a rendered report.
+
+    Args:
+        analysis_data (dict or str): The ADK analysis, parsed or as JSON text.
+
+    Returns:
+        str: Hex digest of the canonical JSON plus the renderer version.
+    """
+    if isinstance(analysis_data, str):
+        try:
+            analysis_data = json.loads(analysis_data)
+        except json.JSONDecodeError:
+            pass  # Hash the raw text; it renders as an error report
+    if isinstance(analysis_data, str):
+        canonical = analysis_data
+    else:
+        canonical = json.dumps(analysis_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"v{RENDERER_VERSION}-{digest}"
+
+
+def cached_report_path(report_hash):
+    """Returns where the PDF for a content hash is cached."""
+    return os.path.join(CACHE_DIR, f"{report_hash}.pdf")
+
+
+def _use_cached(path):
+    """Returns True if the report is cached, marking it as recently used."""
+    try:
+        os.utime(path, None)
+        return True
+    except OSError:
+        return False
+
+
+def prune_cache(keep=()):
+    """
+    Removes expired reports, then least recently used ones over the size cap.
+
+    Args:
+        keep (tuple): Paths that were just rendered and are about to be served.
+    """
+    with _prune_lock:
+        try:
+            names = os.listdir(CACHE_DIR)
+        except OSError:
+            return
+        now = time.time()
+        entries = []
+        total = 0
+        for name in names:
+            if not name.endswith(".pdf"):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > CACHE_TTL_SECONDS:
+                _remove_quietly(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= CACHE_MAX_BYTES:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if path in keep:
+                continue
+            _remove_quietly(path)
+            total -= size
+            if total <= CACHE_MAX_BYTES * 0.9:
+                break
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def get_executor():
+    """Returns the process-wide rendering pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn, not fork: the parent runs Streamlit, MongoDB and gRPC threads
+                _executor = ProcessPoolExecutor(
+                    max_workers=max(1, MAX_WORKERS),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _discard_executor(executor):
+    """Drops a pool whose worker died so the next call starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(analysis_data, startup_name, path):
+    executor = get_executor()
+    try:
+        return executor, executor.submit(_render_to_file, analysis_data, startup_name, path)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        executor = get_executor()
+        return executor, executor.submit(_render_to_file, analysis_data, startup_name, path)
+
+
+def _result(executor, future):
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise
+
+
+def _render_to_file(analysis_data, startup_name, path):
+    """Worker entry point: renders one report and writes it atomically."""
+    from .pdf_generator import generate_investment_report_pdf
+
+    buffer = generate_investment_report_pdf(analysis_data, startup_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer.getbuffer())
+    os.replace(tmp_path, path)
+    return path
+
+
+def render_report(analysis_data, startup_name):
+    """
+    Renders one report on the pool, or returns it from the cache.
+
+    Returns:
+        str: Path of the cached PDF.
+    """
+    return cached_report_path(render_report_id(analysis_data, startup_name))
+
+
+def render_report_id(analysis_data, startup_name):
+    """
+    Like render_report, but returns the report ID (its content hash), which
+    report_server serves at a stable URL.
+    """
+    report_id = analysis_hash(analysis_data)
+    path = cached_report_path(report_id)
+    if not _use_cached(path):
+        _result(*_submit(analysis_data, startup_name, path))
+        prune_cache(keep=(path,))
+    return report_id
+
+
+def render_reports(reports):
+    """
+    Renders many reports concurrently across the pool.
+
+    Args:
+        reports (list[tuple]): (startup_name, analysis_data) pairs.
+
+    Yields:
+        tuple: (index into reports, PDF path, error or None) as each report
+        finishes, cached ones first.
+    """
+    futures = {}
+    rendered = set()
+    for index, (startup_name, analysis_data) in enumerate(reports):
+        path = cached_report_path(analysis_hash(analysis_data))
+        if _use_cached(path):
+            yield index, path, None
+            continue
+        executor, future = _submit(analysis_data, startup_name, path)
+        futures[future] = (index, executor)
+
+    for future in as_completed(futures):
+        index, executor = futures[future]
+        try:
+            path = _result(executor, future)
+        except Exception as e:
+            yield index, None, e
+            continue
+        rendered.add(path)
+        yield index, path, None
+    if rendered:
+        prune_cache(keep=rendered)
+
+
+def report_filename(startup_name):
+    """Returns a filesystem-safe PDF file name for a startup."""
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", startup_name).strip("._") or "startup"
+    return f"{stem}_Investment_Analysis_Report.pdf"
+
+
+def export_reports(reports, output_dir=None, zip_path=None):
+    """
+    Renders reports and writes each to a directory and/or a zip archive as
+    soon as it is finished.
+
+    Args:
+        reports (list[tuple]): (startup_name, analysis_data) pairs.
+        output_dir (str): Directory to copy the PDFs into.
+        zip_path (str): Zip archive to write the PDFs into.
+
+    Returns:
+        dict: startup_name -> error message for reports that failed.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    archive = zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) if zip_path else None
+    used_names = set()
+    failures = {}
+    try:
+        for index, path, error in render_reports(reports):
+            startup_name = reports[index][0]
+            if error is not None:
+                failures[startup_name] = str(error)
+                print(f"Report for {startup_name} failed: {error}")
+                continue
+
+            name = report_filename(startup_name)
+            if name in used_names:
+                name = f"{os.path.splitext(name)[0]}_{index}.pdf"
+            used_names.add(name)
+
+            if output_dir:
+                shutil.copyfile(path, os.path.join(output_dir, name))
+            if archive is not None:
+                archive.write(path, arcname=name)
+            print(f"Report for {startup_name}: {name}")
+    finally:
+        if archive is not None:
+            archive.close()
+    return failures
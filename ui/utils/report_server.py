@@ -0,0 +1,185 @@
+"""
+Lightweight HTTP endpoint that serves cached report PDFs by ID.
+
+The app used to inline every PDF into the page as a base64 data URL, about
+1.33x the file size held in server and browser memory on every rerun. The
+report is now stored once in the report cache (see report_renderer) and the
+page only references its URL. The browser's PDF viewer fetches it lazily and
+can request byte ranges, so large reports open on the first page without
+downloading the whole file.
+
+Run inside the Streamlit server process on a daemon thread; IDs are content
+hashes, so responses are immutable and cacheable.
+
+The endpoint is off unless REPORT_SERVER_PUBLIC_URL is set, because the
+browser must be able to reach it: Cloud Run routes only the Streamlit port,
+so a deployment has to put both behind a proxy (for example /reports/ to
+this server) before enabling it. It binds to localhost by default and has no
+authentication of its own; report IDs are unguessable SHA-256 hashes, but
+anything that exposes the port should sit behind the app's access control.
+"""
+import os
+import re
+import threading
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from .report_renderer import cached_report_path
+
+HOST = os.getenv("REPORT_SERVER_HOST", "127.0.0.1")
+PORT = int(os.getenv("REPORT_SERVER_PORT", "8502"))
+# Address the browser uses to reach the server, e.g. behind a reverse proxy;
+# unset disables the endpoint
+PUBLIC_URL = (os.getenv("REPORT_SERVER_PUBLIC_URL") or "").rstrip("/")
+
+CHUNK_SIZE = 64 * 1024
+
+_REPORT_PATH = re.compile(r"^/reports/(v\d+-[0-9a-f]{64})\.pdf$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def parse_range(header, size):
+    """
+    Parses a single-range Range header.
+
+    Returns:
+        tuple: (start, end) inclusive, None to serve the whole file (no or
+        multi-range header), or False if the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None:
+        return None  # Multiple or non-byte ranges; a full response is valid
+    first, last = match.groups()
+    if not first and not last:
+        return False
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET and HEAD for /reports/<report id>.pdf with byte ranges."""
+
+    server_version = "ResolutesReports/1.0"
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        url = urlsplit(self.path)
+        match = _REPORT_PATH.match(url.path)
+        if match is None:
+            self.send_error(404)
+            return
+        report_id = match.group(1)
+        path = cached_report_path(report_id)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(404)
+            return
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            etag = f'"{report_id}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            byte_range = parse_range(self.headers.get("Range"), size)
+            if byte_range is False:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            start, end = byte_range or (0, size - 1)
+            self.send_response(206 if byte_range else 200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(end - start + 1))
+            if byte_range:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "private, max-age=31536000, immutable")
+            filename = parse_qs(url.query).get("download", [None])[0]
+            disposition = "attachment" if filename else "inline"
+            filename = filename or f"{report_id}.pdf"
+            self.send_header("Content-Disposition", f"{disposition}; filename*=UTF-8''{quote(filename)}")
+            self.end_headers()
+            if not send_body:
+                return
+
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def log_message(self, format, *args):
+        pass  # Range requests are chatty; errors still surface through send_error
+
+
+def endpoint_configured():
+    """Returns True if REPORT_SERVER_PUBLIC_URL tells the browser where to find the server."""
+    return bool(PUBLIC_URL)
+
+
+def start_report_server():
+    """
+    Starts the report server once per process.
+
+    Returns:
+        bool: True if the server is running, False if the endpoint is not
+        configured or could not bind.
+    """
+    global _server
+    if not endpoint_configured():
+        return False
+    with _server_lock:
+        if _server is not None:
+            return True
+        try:
+            _server = ThreadingHTTPServer((HOST, PORT), ReportRequestHandler)
+        except OSError as e:
+            print(f"Report server could not listen on {HOST}:{PORT}: {e}")
+            return False
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="report-server", daemon=True).start()
+        print(f"Report server listening on {HOST}:{PORT}")
+        return True
+
+
+def report_url(report_id, download_name=None):
+    """
+    Returns the browser-facing URL of a cached report.
+
+    Args:
+        report_id (str): The report's content hash from render_report_id.
+        download_name (str): Serve as an attachment with this file name.
+    """
+    url = f"{PUBLIC_URL}/reports/{report_id}.pdf"
+    if download_name:
+        url += f"?download={quote(download_name)}"
+    return url
@@ -0,0 +1,92 @@
+"""
+Streamlit rendering of an investment report PDF, shared by the analysis page
+and the history page.
+
+The PDF is rendered once per analysis into the report cache (see
+report_renderer), and the page only ever holds its URL:
+
+- With static file serving enabled (the default, see .streamlit/config.toml)
+  the cache is served from the Streamlit origin at app/static/reports/, so
+  the preview loads lazily with byte ranges.
+- When REPORT_SERVER_PUBLIC_URL is configured, the report endpoint serves it
+  instead (see report_server).
+
+The download button reads the file only when it is clicked. Without either
+URL the preview is inlined, and only when the user asks for it.
+"""
+import os
+import base64
+import streamlit as st
+from .report_renderer import render_report_id, cached_report_path, APP_STATIC_DIR
+from .report_server import start_report_server, report_url
+
+@st.cache_resource
+def report_server_running():
+    """Starts the report PDF endpoint once per server process, if it is configured."""
+    return start_report_server()
+
+def static_report_url(report_id):
+    """
+    Returns the report's URL under Streamlit's static file serving.
+
+    Returns:
+        str: A URL relative to the page, or None if static serving is off or
+        the report cache is outside the app's static folder.
+    """
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    root = os.path.realpath(APP_STATIC_DIR)
+    path = os.path.realpath(cached_report_path(report_id))
+    if os.path.commonpath([root, path]) != root:
+        return None
+    return "app/static/" + os.path.relpath(path, root).replace(os.sep, "/")
+
+def _read_report(analysis_data, startup_name):
+    """Returns the PDF bytes, re-rendering if the report was pruned from the cache."""
+    with open(cached_report_path(render_report_id(analysis_data, startup_name)), "rb") as f:
+        return f.read()
+
+def show_pdf_report(analysis_data, startup_name, cache_key):
+    """
+    Renders (or reuses) a report and shows its download and preview.
+
+    Args:
+        analysis_data (dict or str): The ADK analysis.
+        startup_name (str): The name of the startup.
+        cache_key (str): Stable key of the analysis in this session, e.g. a
+            job or record ID; reruns reuse the report ID stored under it.
+    """
+    report_ids = st.session_state.setdefault("report_ids", {})
+    report_id = report_ids.get(cache_key)
+    if report_id is None or not os.path.exists(cached_report_path(report_id)):
+        with st.spinner("Generating professional investment report..."):
+            report_id = render_report_id(analysis_data, startup_name)
+        report_ids[cache_key] = report_id
+
+    label = "📥 Download Investment Report (PDF Report)"
+    file_name = f"{startup_name}_Investment_Analysis_Report.pdf"
+
+    if report_server_running():
+        st.link_button(label, report_url(report_id, download_name=file_name))
+        preview_url = report_url(report_id)
+    else:
+        # A callable is only called on click, so reruns never load the PDF
+        st.download_button(
+            label=label,
+            data=lambda: _read_report(analysis_data, startup_name),
+            file_name=file_name,
+            mime="application/pdf",
+            key=f"download_report_{cache_key}"
+        )
+        preview_url = static_report_url(report_id)
+
+    st.subheader("📊 Report Preview")
+    if preview_url:
+        st.markdown(
+            f'<iframe src="{preview_url}" loading="lazy" width="100%" height="800" type="application/pdf"></iframe>',
+            unsafe_allow_html=True,
+        )
+    elif st.toggle("Show preview", key=f"show_preview_{cache_key}"):
+        b64_pdf = base64.b64encode(_read_report(analysis_data, startup_name)).decode()
+        pdf_display = f'<iframe src="data:application/pdf;base64,{b64_pdf}" width="100%" height="800" type="application/pdf"></iframe>'
+        st.markdown(pdf_display, unsafe_allow_html=True)
@@ -1,100 +1,404 @@
 """
 Simplified PDF Generator with fallback text output for testing
+
+Reports are produced by generators that yield encoded chunks, so a report
+(or a whole portfolio) can be streamed to a file or an HTTP response without
+ever being held in memory as one string. Plain text, Markdown and CSV output
+are built from the same section layout, which covers all seven analysis
+sections of the PDF report.
 """
+import csv
 import json
 import io
 
-def simple_pdf_fallback(analysis_data, startup_name):
+FORMAT_TEXT = "text"
+FORMAT_MARKDOWN = "markdown"
+FORMAT_CSV = "csv"
+FORMATS = (FORMAT_TEXT, FORMAT_MARKDOWN, FORMAT_CSV)
+
+# Encoded output is buffered into chunks of about this size before it is yielded
+CHUNK_SIZE = 64 * 1024
+
+CSV_HEADER = ["startup_name", "section", "group", "item", "field", "value"]
+
+# Placeholder values the agents emit when they found nothing
+_EMPTY_VALUES = (None, "", "string", "Not Available", "N/A", [], {})
+
+# (section title, top-level key, groups). A group is (title, path, fields,
+# item title key): path leads from the section to a dict, or to a list of
+# dicts when an item title key is given. Fields are (label, key) or
+# (label, key, format).
+REPORT_SECTIONS = [
+    ("Investment Summary", None, [
+        (None, ("investment_summary",), [
+            ("Overall Score", "overall_score", "{}/10"),
+            ("Recommendation", "investment_recommendation"),
+            ("Investment Thesis", "investment_thesis"),
+            ("Key Strengths", "key_strengths"),
+            ("Key Risks", "key_risks"),
+        ], None),
+        ("Executive Summary", ("executive_summary",), [
+            ("Business Model", "business_model_summary"),
+            ("Market Opportunity", "market_opportunity"),
+            ("Competitive Position", "competitive_position"),
+            ("Financial Outlook", "financial_outlook"),
+            ("Team Assessment", "team_assessment"),
+        ], None),
+    ]),
+    ("Team Analysis", "team_analysis", [
+        ("Founding Team", ("founding_team", "founders"), [
+            ("Role", "role"),
+            ("Background", "background"),
+            ("Experience", "previous_experience"),
+        ], "name"),
+        ("Team Assessment", ("team_assessment",), [
+            ("Founder-Market Fit", "founder_market_fit"),
+            ("Execution Capability", "execution_capability"),
+            ("Technical Competency", "technical_competency"),
+            ("Business Acumen", "business_acumen"),
+            ("Scaling Readiness", "scaling_readiness"),
+        ], None),
+    ]),
+    ("Market Analysis", "market_analysis", [
+        ("Market Sizing", ("market_size",), [
+            ("TAM", "total_addressable_market"),
+            ("SAM", "serviceable_addressable_market"),
+            ("Growth Rate", "market_growth_rate"),
+            ("Maturity", "market_maturity"),
+        ], None),
+        ("Direct Competitors", ("competitive_landscape", "direct_competitors"), [
+            ("Market Share", "market_share"),
+        ], "name"),
+        ("Market Opportunity", ("market_opportunity",), [
+            ("Market Timing", "market_timing"),
+            ("Growth Potential", "growth_potential"),
+            ("Competitive Advantage Potential", "competitive_advantage_potential"),
+            ("Market Accessibility", "market_accessibility"),
+        ], None),
+    ]),
+    ("Product Analysis", "product_analysis", [
+        ("Product Overview", ("product_overview",), [
+            ("Product Name", "product_name"),
+            ("Category", "product_category"),
+            ("Value Proposition", "primary_value_proposition"),
+            ("Launch Date", "launch_date"),
+        ], None),
+        ("Core Features", ("core_features",), [
+            ("Feature Completeness", "feature_completeness"),
+            ("Unique Differentiators", "unique_differentiators"),
+        ], None),
+    ]),
+    ("Traction Analysis", "traction_analysis", [
+        ("User Growth", ("growth_metrics", "user_growth"), [
+            ("Total Users", "total_users"),
+            ("Growth Rate", "growth_rate"),
+            ("Acquisition Trend", "user_acquisition_trend"),
+        ], None),
+        ("Traction Assessment", ("traction_assessment",), [
+            ("Overall Momentum", "overall_momentum"),
+            ("Growth Sustainability", "growth_sustainability"),
+            ("Market Validation", "market_validation_strength"),
+            ("Execution Capability", "execution_capability"),
+        ], None),
+    ]),
+    ("Financial Analysis", "financial_analysis", [
+        ("Funding History", ("funding_history",), [
+            ("Total Funding", "total_funding_raised"),
+            ("Number of Rounds", "number_of_rounds"),
+            ("Latest Valuation", "latest_valuation"),
+            ("Trajectory", "funding_trajectory"),
+        ], None),
+        ("Business Model", ("business_model",), [
+            ("Revenue Model", "revenue_model"),
+            ("Pricing Model", "pricing_model"),
+        ], None),
+        ("Unit Economics", ("business_model", "unit_economics"), [
+            ("Customer Acquisition Cost", "customer_acquisition_cost"),
+            ("Customer Lifetime Value", "customer_lifetime_value"),
+            ("Gross Margin", "gross_margin"),
+            ("Payback Period", "payback_period"),
+        ], None),
+    ]),
+    ("Competitive Analysis", "competitive_analysis", [
+        (None, (), [
+            ("Target Company", "company_name"),
+            ("Sector", "sector"),
+        ], None),
+        ("Key Competitors", ("competitors",), [
+            ("Founded", "founding_year"),
+            ("Funding", "total_funding_raised"),
+            ("Business Model", "business_model"),
+        ], "company_name"),
+        ("Competitive Summary", ("competitive_summary",), [
+            ("Market Positioning", "positioning_vs_competition"),
+            ("Competitive Moat", "competitive_moat_assessment"),
+        ], None),
+    ]),
+]
+
+def _is_empty(value):
+    return value in _EMPTY_VALUES
+
+def _format_value(value, fmt=None):
+    """Returns a display string, or a list of strings for list values."""
+    if isinstance(value, list):
+        items = [str(item) for item in value if not _is_empty(item)]
+        return items or None
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return fmt.format(value) if fmt else str(value)
+
+def _field_rows(data, fields):
+    for field in fields:
+        label, key = field[0], field[1]
+        value = data.get(key) if isinstance(data, dict) else None
+        if _is_empty(value):
+            continue
+        value = _format_value(value, field[2] if len(field) > 2 else None)
+        if value:
+            yield label, value
+
+def iter_rows(analysis_data):
     """
-    Creates a simple text-based report when reportlab is not available
+    Walks an analysis in report order.
+
+    Yields:
+        tuple: (section, group, item, field, value); group and item may be
+        None, and value is a string or a list of strings.
     """
-    buffer = io.StringIO()
-    
-    # Parse JSON if it's a string
+    for section_title, section_key, groups in REPORT_SECTIONS:
+        section = analysis_data.get(section_key) if section_key else analysis_data
+        if not isinstance(section, dict) or not section:
+            continue
+        if section.get("status") == "unavailable":
+            yield section_title, None, None, "Status", f"Unavailable: {section.get('reason', 'no data')}"
+            continue
+
+        for group_title, path, fields, item_title_key in groups:
+            data = section
+            for key in path:
+                data = data.get(key) if isinstance(data, dict) else None
+            if item_title_key is None:
+                for label, value in _field_rows(data, fields):
+                    yield section_title, group_title, None, label, value
+                continue
+
+            for item in data if isinstance(data, list) else []:
+                if not isinstance(item, dict) or _is_empty(item.get(item_title_key)):
+                    continue
+                item_title = str(item[item_title_key])
+                rows = list(_field_rows(item, fields))
+                if not rows:
+                    yield section_title, group_title, item_title, None, None
+                for label, value in rows:
+                    yield section_title, group_title, item_title, label, value
+
+def _parse(analysis_data):
+    """Returns (analysis dict, None), or (None, raw text) if it is not JSON."""
     if isinstance(analysis_data, str):
         try:
             analysis_data = json.loads(analysis_data)
         except json.JSONDecodeError:
-            buffer.write("Error: Unable to parse analysis data\n")
-            buffer.write(f"Raw data: {analysis_data}")
-            return buffer
-    
-    # Generate text report
-    buffer.write(f"INVESTMENT ANALYSIS REPORT\n")
-    buffer.write(f"{'=' * 50}\n")
-    buffer.write(f"Company: {startup_name}\n")
-    buffer.write(f"Generated: {analysis_data.get('analysis_metadata', {}).get('analysis_date', 'Unknown')}\n\n")
-    
-    # Investment Summary
-    inv_summary = analysis_data.get('investment_summary', {})
-    if inv_summary:
-        buffer.write("INVESTMENT SUMMARY\n")
-        buffer.write("-" * 20 + "\n")
-        buffer.write(f"Overall Score: {inv_summary.get('overall_score', 'N/A')}/10\n")
-        buffer.write(f"Recommendation: {inv_summary.get('investment_recommendation', 'N/A')}\n")
-        buffer.write(f"Thesis: {inv_summary.get('investment_thesis', 'N/A')}\n\n")
-        
-        # Key strengths
-        strengths = inv_summary.get('key_strengths', [])
-        if strengths:
-            buffer.write("Key Strengths:\n")
-            for strength in strengths:
-                if strength and strength != "string":
-                    buffer.write(f"• {strength}\n")
-            buffer.write("\n")
-        
-        # Key risks
-        risks = inv_summary.get('key_risks', [])
-        if risks:
-            buffer.write("Key Risks:\n")
-            for risk in risks:
-                if risk and risk != "string":
-                    buffer.write(f"• {risk}\n")
-            buffer.write("\n")
-    
-    # Team Analysis
-    team_data = analysis_data.get('team_analysis', {})
-    if team_data:
-        buffer.write("TEAM ANALYSIS\n")
-        buffer.write("-" * 15 + "\n")
-        
-        assessment = team_data.get('team_assessment', {})
-        if assessment:
-            buffer.write(f"Founder-Market Fit: {assessment.get('founder_market_fit', 'N/A')}\n")
-            buffer.write(f"Execution Capability: {assessment.get('execution_capability', 'N/A')}\n")
-            buffer.write(f"Technical Competency: {assessment.get('technical_competency', 'N/A')}\n\n")
-    
-    # Market Analysis
-    market_data = analysis_data.get('market_analysis', {})
-    if market_data:
-        buffer.write("MARKET ANALYSIS\n")
-        buffer.write("-" * 16 + "\n")
-        
-        market_size = market_data.get('market_size', {})
-        if market_size:
-            buffer.write(f"TAM: {market_size.get('total_addressable_market', 'N/A')}\n")
-            buffer.write(f"Growth Rate: {market_size.get('market_growth_rate', 'N/A')}\n")
-            buffer.write(f"Maturity: {market_size.get('market_maturity', 'N/A')}\n\n")
-    
-    # Financial Analysis
-    financial_data = analysis_data.get('financial_analysis', {})
-    if financial_data:
-        buffer.write("FINANCIAL ANALYSIS\n")
-        buffer.write("-" * 19 + "\n")
-        
-        funding = financial_data.get('funding_history', {})
-        if funding:
-            buffer.write(f"Total Funding: {funding.get('total_funding_raised', 'N/A')}\n")
-            buffer.write(f"Latest Valuation: {funding.get('latest_valuation', 'N/A')}\n")
-            buffer.write(f"Trajectory: {funding.get('funding_trajectory', 'N/A')}\n\n")
-    
-    buffer.write("Report generated by Resolutes ADK Analysis System\n")
-    
-    text_content = buffer.getvalue()
-    buffer.close()
-    
+            return None, analysis_data
+    if not isinstance(analysis_data, dict):
+        return None, str(analysis_data)
+    return analysis_data, None
+
+def iter_report(analysis_data, startup_name, fmt=FORMAT_TEXT, csv_header=True):
+    """
+    Generates one report as text pieces.
+
+    Args:
+        analysis_data (dict or str): The ADK analysis, parsed or as JSON text.
+        startup_name (str): The name of the startup.
+        fmt (str): FORMAT_TEXT, FORMAT_MARKDOWN or FORMAT_CSV.
+        csv_header (bool): Start CSV output with the header row.
+
+    Yields:
+        str: Consecutive pieces of the report.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    analysis_data, raw_text = _parse(analysis_data)
+    if fmt == FORMAT_CSV:
+        yield from _iter_csv(analysis_data, raw_text, startup_name, csv_header)
+    elif fmt == FORMAT_MARKDOWN:
+        yield from _iter_markdown(analysis_data, raw_text, startup_name)
+    else:
+        yield from _iter_text(analysis_data, raw_text, startup_name)
+
+def _iter_text(analysis_data, raw_text, startup_name):
+    if analysis_data is None:
+        yield "Error: Unable to parse analysis data\n"
+        yield f"Raw data: {raw_text}\n"
+        return
+
+    yield "INVESTMENT ANALYSIS REPORT\n"
+    yield f"{'=' * 50}\n"
+    yield f"Company: {startup_name}\n"
+    yield f"Generated: {analysis_data.get('analysis_metadata', {}).get('analysis_date', 'Unknown')}\n"
+
+    current_section = current_group = current_item = None
+    for section, group, item, field, value in iter_rows(analysis_data):
+        if section != current_section:
+            yield f"\n{section.upper()}\n{'-' * len(section)}\n"
+            current_section, current_group, current_item = section, None, None
+        if group != current_group:
+            if group:
+                yield f"\n{group}:\n"
+            current_group, current_item = group, None
+        indent = "  " if group else ""
+        if item != current_item:
+            yield f"{indent}• {item}\n"
+            current_item = item
+        if item:
+            indent += "    "
+        if field is None:
+            continue
+        if isinstance(value, list):
+            yield f"{indent}{field}:\n"
+            for entry in value:
+                yield f"{indent}  • {entry}\n"
+        else:
+            yield f"{indent}{field}: {value}\n"
+
+    yield "\nReport generated by Resolutes ADK Analysis System\n"
+
+def _iter_markdown(analysis_data, raw_text, startup_name):
+    if analysis_data is None:
+        yield "# Error: Unable to parse analysis data\n\n"
+        yield f"```\n{raw_text}\n```\n"
+        return
+
+    yield f"# Investment Analysis Report: {startup_name}\n\n"
+    yield f"_Generated: {analysis_data.get('analysis_metadata', {}).get('analysis_date', 'Unknown')}_\n"
+
+    current_section = current_group = current_item = None
+    for section, group, item, field, value in iter_rows(analysis_data):
+        if section != current_section:
+            yield f"\n## {section}\n\n"
+            current_section, current_group, current_item = section, None, None
+        if group != current_group:
+            if group:
+                yield f"\n### {group}\n\n"
+            current_group, current_item = group, None
+        if item != current_item:
+            yield f"\n#### {item}\n\n"
+            current_item = item
+        if field is None:
+            continue
+        if isinstance(value, list):
+            yield f"- **{field}:**\n"
+            for entry in value:
+                yield f"  - {entry}\n"
+        else:
+            yield f"- **{field}:** {value}\n"
+
+    yield "\n---\n_Report generated by Resolutes ADK Analysis System_\n"
+
+def _iter_csv(analysis_data, raw_text, startup_name, csv_header):
+    # csv.writer needs a file; reuse one small buffer per row
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def row(values):
+        line.seek(0)
+        line.truncate()
+        writer.writerow(values)
+        return line.getvalue()
+
+    if csv_header:
+        yield row(CSV_HEADER)
+    if analysis_data is None:
+        yield row([startup_name, "Error", "", "", "Raw data", raw_text])
+        return
+    for section, group, item, field, value in iter_rows(analysis_data):
+        if isinstance(value, list):
+            value = "; ".join(value)
+        yield row([startup_name, section, group or "", item or "", field or "", value or ""])
+
+def iter_encoded(pieces, encoding="utf-8"):
+    """
+    Encodes text pieces and batches them into chunks of about CHUNK_SIZE bytes.
+
+    Yields:
+        bytes: Chunks ready to write to a file or an HTTP response.
+    """
+    batch = []
+    size = 0
+    for piece in pieces:
+        data = piece.encode(encoding)
+        batch.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            yield b"".join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield b"".join(batch)
+
+def iter_portfolio(reports, fmt=FORMAT_TEXT):
+    """
+    Generates one document for many startups.
+
+    Args:
+        reports (iterable): (startup_name, analysis_data) pairs; a generator
+            keeps only one analysis in memory at a time.
+        fmt (str): FORMAT_TEXT, FORMAT_MARKDOWN or FORMAT_CSV.
+
+    Yields:
+        str: Consecutive pieces of the document.
+    """
+    for index, (startup_name, analysis_data) in enumerate(reports):
+        if index and fmt == FORMAT_MARKDOWN:
+            yield "\n\n---\n\n"
+        elif index and fmt == FORMAT_TEXT:
+            yield "\n\n"
+        yield from iter_report(analysis_data, startup_name, fmt, csv_header=(index == 0))
+
+def write_report(analysis_data, startup_name, fp, fmt=FORMAT_TEXT):
+    """
+    Streams one report into a binary file-like object.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    written = 0
+    for chunk in iter_encoded(iter_report(analysis_data, startup_name, fmt)):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
+
+def write_portfolio(reports, fp, fmt=FORMAT_TEXT):
+    """
+    Streams a portfolio document (see iter_portfolio) into a binary file-like object.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    written = 0
+    for chunk in iter_encoded(iter_portfolio(reports, fmt)):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
+
+def format_for_path(path):
+    """Picks the report format from a file extension (.csv, .md, anything else is text)."""
+    extension = path.lower().rsplit(".", 1)[-1]
+    if extension == "csv":
+        return FORMAT_CSV
+    if extension in ("md", "markdown"):
+        return FORMAT_MARKDOWN
+    return FORMAT_TEXT
+
+def simple_pdf_fallback(analysis_data, startup_name):
+    """
+    Creates a simple text-based report when reportlab is not available
+    """
     # Return as bytes buffer for consistency with PDF interface
-    bytes_buffer = io.BytesIO(text_content.encode('utf-8'))
+    bytes_buffer = io.BytesIO()
+    write_report(analysis_data, startup_name, bytes_buffer)
+    bytes_buffer.seek(0)
     return bytes_buffer
 
 # Test function
@@ -109,8 +413,8 @@ if __name__ == "__main__":
             "key_risks": ["Competition", "Market timing"]
         }
     }
-    
+
     result = simple_pdf_fallback(test_data, "Test Corp")
     print("Text Report Generated:")
     print("=" * 30)
-    print(result.getvalue().decode('utf-8'))
\ No newline at end of file
+    print(result.getvalue().decode('utf-8'))
@@ -1,8 +1,37 @@
 import os
 import io
+from concurrent.futures import ThreadPoolExecutor
 import filetype
 import docx2txt
 from google.cloud import vision
+from . import extraction_cache
+from .clients import get_vision_client
+try:
+    from pypdf import PdfReader
+    TEXT_LAYER_AVAILABLE = True
+except ImportError:
+    TEXT_LAYER_AVAILABLE = False
+    print("⚠️  pypdf not available. Every PDF page will be sent to Cloud Vision.")
+
+# Bump whenever extraction output changes so cached text is not reused.
+EXTRACTOR_VERSION = "vision-v3"
+
+# Synchronous batch_annotate_files OCRs at most 5 pages per file request
+VISION_PAGES_PER_REQUEST = 5
+MAX_FILE_WORKERS = int(os.getenv("EXTRACTION_MAX_FILE_WORKERS", "5"))
+MAX_PAGE_WORKERS = int(os.getenv("EXTRACTION_MAX_PAGE_WORKERS", "8"))
+
+# Pages whose embedded text layer is shorter than this, or mostly non-word
+# characters (broken font encodings), are OCR'd instead.
+MIN_TEXT_LAYER_CHARS = int(os.getenv("EXTRACTION_MIN_TEXT_LAYER_CHARS", "80"))
+MIN_TEXT_LAYER_ALNUM_RATIO = 0.6
+
+PAGE_SOURCE_TEXT_LAYER = "text_layer"
+PAGE_SOURCE_VISION = "vision"
+
+# Shared across files so the number of in-flight Vision requests (each one
+# carrying the PDF bytes) stays bounded no matter how many files are uploaded.
+_page_executor = ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS, thread_name_prefix="vision-pages")
 
 def get_mime_type(file_bytes):
     """Detects the mime type of a file."""
@@ -25,21 +54,38 @@ def extract_text_from_file(file):
     mime_type = get_mime_type(file_bytes)
 
     if mime_type == 'application/pdf':
-        return extract_text_from_pdf(file_bytes)
+        extractor = extract_text_from_pdf
     elif mime_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
-        return extract_text_from_docx(file_bytes)
+        extractor = extract_text_from_docx
     else:
         return f"Unsupported file type: {mime_type}"
 
-def extract_text_from_pdf(file_bytes):
+    # Identical uploads hit the cache and skip OCR entirely
+    key = extraction_cache.cache_key(file_bytes, EXTRACTOR_VERSION)
+    cached_text = extraction_cache.get_cached_text(key)
+    if cached_text is not None:
+        return cached_text
+
+    text = extractor(file_bytes)
+    if text.strip() and not text.startswith("Error processing"):
+        extraction_cache.put_cached_text(key, text)
+    return text
+
+def _annotate_pdf_pages(file_bytes, pages=None):
     """
-    Extracts text from a PDF file using Google Cloud Vision API.
+    OCRs a range of PDF pages with a single batch_annotate_files call.
+
+    Args:
+        file_bytes (bytes): The PDF contents.
+        pages (list[int]): 1-based page numbers, at most VISION_PAGES_PER_REQUEST.
+            Defaults to the first pages of the document.
+
+    Returns:
+        A tuple of (list of page texts in order, total pages in the document).
     """
-    client = vision.ImageAnnotatorClient()
-    content = file_bytes
     input_config = vision.InputConfig(
         gcs_source=None,
-        content=content,
+        content=file_bytes,
         mime_type='application/pdf'
     )
     features = [vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)]
@@ -47,15 +93,101 @@ def extract_text_from_pdf(file_bytes):
     request = vision.AnnotateFileRequest(
         input_config=input_config,
         features=features,
+        pages=pages or [],
     )
 
-    response = client.batch_annotate_files(requests=[request])
-    
-    text = ""
-    for image_response in response.responses[0].responses:
-        text += image_response.full_text_annotation.text
-    
-    return text
+    response = get_vision_client().batch_annotate_files(requests=[request])
+    file_response = response.responses[0]
+    page_texts = [page.full_text_annotation.text for page in file_response.responses]
+    return page_texts, file_response.total_pages
+
+def _read_text_layer(file_bytes):
+    """
+    Reads the embedded text of every PDF page locally.
+
+    Returns:
+        A list of page texts, or None if the PDF cannot be parsed locally.
+    """
+    if not TEXT_LAYER_AVAILABLE:
+        return None
+    try:
+        reader = PdfReader(io.BytesIO(file_bytes))
+        return [page.extract_text() or "" for page in reader.pages]
+    except Exception as e:
+        print(f"Could not read PDF text layer, falling back to OCR: {e}")
+        return None
+
+def has_usable_text_layer(text):
+    """Decides whether a page's embedded text is good enough to skip OCR."""
+    visible = "".join(text.split())
+    if len(visible) < MIN_TEXT_LAYER_CHARS:
+        return False
+    alnum = sum(1 for char in visible if char.isalnum())
+    return alnum / len(visible) >= MIN_TEXT_LAYER_ALNUM_RATIO
+
+def _ocr_pages(file_bytes, page_numbers):
+    """OCRs the given pages in parallel ranges and returns their texts in order."""
+    page_ranges = [
+        page_numbers[i:i + VISION_PAGES_PER_REQUEST]
+        for i in range(0, len(page_numbers), VISION_PAGES_PER_REQUEST)
+    ]
+    futures = [_page_executor.submit(_annotate_pdf_pages, file_bytes, pages) for pages in page_ranges]
+    page_texts = []
+    for future in futures:
+        page_texts.extend(future.result()[0])
+    return page_texts
+
+def extract_pdf_pages(file_bytes):
+    """
+    Extracts text page by page, using the embedded text layer where possible.
+
+    Born-digital pages are read locally; only image-only pages or pages with
+    too little text are sent to Cloud Vision.
+
+    Returns:
+        A list of dicts with the 1-based "page" number, the "source" that
+        produced its text ("text_layer" or "vision") and the "text" itself.
+    """
+    local_texts = _read_text_layer(file_bytes)
+
+    if local_texts is None:
+        # No local parse: the first request also reports the page count
+        page_texts, total_pages = _annotate_pdf_pages(file_bytes)
+        page_texts += _ocr_pages(file_bytes, list(range(len(page_texts) + 1, total_pages + 1)))
+        return [
+            {"page": number, "source": PAGE_SOURCE_VISION, "text": text}
+            for number, text in enumerate(page_texts, start=1)
+        ]
+
+    pages = []
+    for number, text in enumerate(local_texts, start=1):
+        if has_usable_text_layer(text):
+            pages.append({"page": number, "source": PAGE_SOURCE_TEXT_LAYER, "text": text})
+        else:
+            pages.append({"page": number, "source": PAGE_SOURCE_VISION, "text": None})
+
+    ocr_pages = [page for page in pages if page["source"] == PAGE_SOURCE_VISION]
+    if ocr_pages:
+        ocr_texts = _ocr_pages(file_bytes, [page["page"] for page in ocr_pages])
+        for page, text in zip(ocr_pages, ocr_texts):
+            page["text"] = text
+
+    return pages
+
+def extract_text_from_pdf(file_bytes):
+    """
+    Extracts text from a PDF file, falling back to Google Cloud Vision OCR
+    for pages without a usable text layer.
+    """
+    pages = extract_pdf_pages(file_bytes)
+
+    ocr_count = sum(1 for page in pages if page["source"] == PAGE_SOURCE_VISION)
+    print(f"PDF extraction: {len(pages) - ocr_count} page(s) from text layer, {ocr_count} via Vision OCR")
+
+    return "".join(
+        page["text"] if page["text"].endswith("\n") else page["text"] + "\n"
+        for page in pages
+    )
 
 def extract_text_from_docx(file_bytes):
     """
@@ -70,9 +202,15 @@ def extract_text_from_docx(file_bytes):
 def process_files(uploaded_files):
     """
     Processes a list of uploaded files and extracts text from them.
+
+    Files are extracted concurrently on a bounded thread pool; the combined
+    text keeps upload order and is joined once at the end.
     """
-    combined_text = ""
-    for uploaded_file in uploaded_files:
-        text = extract_text_from_file(uploaded_file)
-        combined_text += text + "\n\n"
-    return combined_text
+    if not uploaded_files:
+        return ""
+
+    workers = min(MAX_FILE_WORKERS, len(uploaded_files))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision-files") as executor:
+        texts = list(executor.map(extract_text_from_file, uploaded_files))
+
+    return "".join(text + "\n\n" for text in texts)